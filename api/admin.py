@@ -1,49 +1,111 @@
 from django.contrib import admin
-from .models import Project, Issue, Comment
+from .admin_utils import AutocompleteFilter, LargeTableAdminMixin
+from .models import Project, Issue, Comment, Webhook, OutboxEvent, DeadLetter, Job
 from users.models import Contributor
 
 
 @admin.register(Project)
-class ProjectAdmin(admin.ModelAdmin):
+class ProjectAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     """
     Configuration de l'interface d'administration pour les projets.
     """
     list_display = ('title', 'creator', 'type', 'created_time')
+    list_select_related = ('creator',)
     list_filter = ('type', 'created_time')
-    search_fields = ('title', 'description', 'creator__username')
+    search_fields = ('title',)
+    autocomplete_fields = ('creator',)
     ordering = ('-created_time',)
 
     def get_contributors(self, obj):
         contributors = [
             contributor.contributor.username
-            for contributor in obj.contributors.all()
+            for contributor in obj.contributor_set.all()
         ]
         return ", ".join(contributors)
     get_contributors.short_description = "Contributeurs"
 
 
 @admin.register(Issue)
-class IssueAdmin(admin.ModelAdmin):
+class IssueAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     """
     Configuration de l'interface d'administration pour les issues.
     """
     list_display = (
         'title', 'project', 'creator', 'assignee', 'priority', 'status', 'created_time'
     )
-    list_filter = ('priority', 'status', 'created_time', 'project')
-    search_fields = (
-        'title', 'description', 'creator__username',
-        'assignee__username', 'project__title'
+    list_select_related = ('project', 'creator', 'assignee')
+    list_filter = (
+        'priority', 'status', 'created_time', ('project', AutocompleteFilter)
     )
+    search_fields = ('title',)
+    autocomplete_fields = ('project', 'creator', 'assignee')
     ordering = ('-created_time',)
 
 
 @admin.register(Comment)
-class CommentAdmin(admin.ModelAdmin):
+class CommentAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     """
     Configuration de l'interface d'administration pour les commentaires.
     """
     list_display = ('content', 'creator', 'issue', 'created_time')
-    list_filter = ('created_time', 'issue')
-    search_fields = ('content', 'creator__username', 'issue__title')
+    list_select_related = ('creator', 'issue')
+    list_filter = ('created_time', ('issue', AutocompleteFilter))
+    search_fields = ('issue__title',)
+    autocomplete_fields = ('issue', 'creator')
     ordering = ('-created_time',)
+
+
+@admin.register(Webhook)
+class WebhookAdmin(admin.ModelAdmin):
+    """
+    Configuration de l'interface d'administration pour les webhooks.
+    """
+    list_display = (
+        'url', 'project', 'is_active', 'last_event_id', 'attempts', 'created_time'
+    )
+    list_select_related = ('project',)
+    autocomplete_fields = ('project',)
+    list_filter = ('is_active',)
+    search_fields = ('url',)
+    # État tenu par le dispatcher
+    readonly_fields = ('last_event_id', 'attempts', 'available_time', 'last_error')
+
+
+@admin.register(OutboxEvent)
+class OutboxEventAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    """
+    Consultation des événements en attente ou publiés par le dispatcher.
+    """
+    list_display = (
+        'id', 'model', 'object_id', 'action', 'project_id',
+        'created_time', 'dispatched_time'
+    )
+    list_filter = ('model', 'action')
+    ordering = ('-id',)
+
+
+@admin.register(DeadLetter)
+class DeadLetterAdmin(admin.ModelAdmin):
+    """
+    Consultation des lots abandonnés par le dispatcher après trop d'échecs.
+    """
+    list_display = (
+        'id', 'webhook', 'first_event_id', 'last_event_id', 'attempts',
+        'created_time'
+    )
+    list_select_related = ('webhook',)
+    list_filter = ('webhook',)
+    ordering = ('-id',)
+
+
+@admin.register(Job)
+class JobAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    """
+    Consultation des tâches différées et de leurs erreurs.
+    """
+    list_display = (
+        'id', 'name', 'status', 'priority', 'attempts', 'max_attempts',
+        'available_time', 'finished_time'
+    )
+    list_filter = ('status', 'name')
+    ordering = ('-id',)
@@ -0,0 +1,152 @@
+"""
+Outils d'administration pour les tables volumineuses.
+
+- `EstimatedCountPaginator` remplace le `COUNT(*)` des listes non filtrées par
+  l'estimation tenue à jour par la base (statistiques de l'optimiseur) ;
+- `AutocompleteFilter` filtre sur une clé étrangère via un champ
+  d'autocomplétion au lieu de charger toutes les valeurs dans la barre latérale ;
+- `LargeTableAdminMixin` regroupe ces réglages et remplace la recherche
+  `icontains` (parcours complet) par une recherche par préfixe indexée.
+"""
+from django import forms
+from django.contrib import admin
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.db.models import Q, QuerySet
+from django.utils.functional import cached_property
+
+# En dessous de ce nombre de lignes estimées, le comptage exact reste bon marché
+EXACT_COUNT_LIMIT = 10000
+
+
+def estimate_count(model, using='default'):
+    """
+    Retourne le nombre de lignes estimé de la table d'un modèle, ou None si la
+    base n'en dispose pas (SQLite sans ANALYZE, table jamais analysée…).
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    if connection.vendor == 'postgresql':
+        sql = "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass"
+    elif connection.vendor == 'mysql':
+        sql = (
+            "SELECT table_rows FROM information_schema.tables "
+            "WHERE table_schema = DATABASE() AND table_name = %s"
+        )
+    elif connection.vendor == 'sqlite':
+        sql = "SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1"
+    else:
+        return None
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [table])
+            row = cursor.fetchone()
+    except DatabaseError:
+        return None
+    if row is None or row[0] is None:
+        return None
+    # sqlite_stat1.stat commence par le nombre de lignes : « 120000 4 1 »
+    estimate = int(str(row[0]).split()[0])
+    return estimate if estimate >= 0 else None
+
+
+def is_unfiltered(queryset):
+    """
+    Vrai si le queryset n'ajoute aucun filtre à ceux du manager par défaut
+    (lignes supprimées logiquement masquées, que l'estimation inclut encore).
+    """
+    default = queryset.model._default_manager.all().query.where
+    return queryset.query.where == default
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginateur utilisant le nombre de lignes estimé pour les listes non filtrées
+    des grandes tables ; les listes filtrées gardent un comptage exact.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if isinstance(queryset, QuerySet) and is_unfiltered(queryset):
+            estimate = estimate_count(queryset.model, queryset.db)
+            if estimate is not None and estimate >= EXACT_COUNT_LIMIT:
+                return estimate
+        return super().count
+
+
+class AutocompleteFilter(admin.FieldListFilter):
+    """
+    Filtre de liste sur une clé étrangère affiché sous forme de champ
+    d'autocomplétion. Seul l'objet sélectionné est chargé ; les suggestions
+    passent par la vue d'autocomplétion de l'admin du modèle cible (qui doit
+    définir `search_fields`).
+    """
+    template = 'admin/autocomplete_filter.html'
+
+    def __init__(self, field, request, params, model, model_admin, field_path):
+        self.lookup_kwarg = f'{field_path}__{field.target_field.name}__exact'
+        super().__init__(field, request, params, model, model_admin, field_path)
+        self.value = self.used_parameters.get(self.lookup_kwarg)
+        if isinstance(self.value, list):
+            self.value = self.value[-1]
+        self.form_field = forms.ModelChoiceField(
+            queryset=field.remote_field.model._default_manager.all(),
+            widget=AutocompleteSelect(field, model_admin.admin_site),
+            required=False,
+        )
+
+    def expected_parameters(self):
+        return [self.lookup_kwarg]
+
+    def has_output(self):
+        return True
+
+    def rendered_widget(self):
+        return self.form_field.widget.render(
+            self.lookup_kwarg, self.value, attrs={'id': f'filter_{self.lookup_kwarg}'}
+        )
+
+    def choices(self, changelist):
+        self.clear_url = changelist.get_query_string(remove=[self.lookup_kwarg])
+        yield {
+            'selected': self.value is None,
+            'query_string': self.clear_url,
+            'display': "Tous",
+        }
+
+
+class LargeTableAdminMixin:
+    """
+    Réglages d'une liste d'administration adaptés aux grandes tables :
+    pas de second comptage ni de facettes, comptage estimé et recherche par
+    préfixe sur des colonnes indexées.
+
+    `search_fields` ne doit lister que des colonnes indexées : la recherche
+    (sensible à la casse) est traduite en intervalle `>= terme` et
+    `< terme + U+10FFFF`, utilisable par un index B-tree contrairement au
+    `LIKE '%terme%'` de la recherche par défaut.
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    show_facets = admin.ShowFacets.NEVER
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        query = Q()
+        for field in self.get_search_fields(request):
+            query |= Q(**{f'{field}__gte': term, f'{field}__lt': term + '\U0010ffff'})
+        return queryset.filter(query), False
+
+    @property
+    def media(self):
+        media = super().media
+        if any(
+            isinstance(spec, tuple) and issubclass(spec[1], AutocompleteFilter)
+            for spec in self.list_filter
+        ):
+            media += AutocompleteSelect(None, self.admin_site).media
+        return media
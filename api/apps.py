@@ -4,3 +4,20 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        # Suivi des modifications pour la synchronisation incrémentale
+        from .changes import connect_signals
+        connect_signals()
+
+        # Journal des requêtes lentes sur toutes les connexions
+        from softdesk_api.slow_queries import install
+        install()
+
+        # Mesure des requêtes SQL pour /metrics
+        from softdesk_api import metrics
+        metrics.install()
+
+        # Enregistre les tâches différées déclarées dans les modules `tasks`
+        from django.utils.module_loading import autodiscover_modules
+        autodiscover_modules('tasks')
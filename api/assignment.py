@@ -0,0 +1,66 @@
+"""
+Validation de l'assignation d'une issue.
+
+Un seul SELECT résout les usernames et vérifie l'appartenance au projet (EXISTS
+sur les contributeurs). Le résultat est mémorisé sur la requête : une même
+assignation n'est vérifiée qu'une fois, quel que soit le chemin (création,
+mise à jour, modification groupée).
+
+Erreurs communes à tous les chemins :
+- utilisateur inconnu : ValidationError (400) sur le champ `assignee` ;
+- utilisateur non contributeur du projet : PermissionDenied (403).
+"""
+from django.db.models import Exists, OuterRef
+from rest_framework.exceptions import PermissionDenied, ValidationError
+
+from users.models import User, Contributor
+
+UNKNOWN_USER = "Utilisateur avec ce username n'existe pas."
+NOT_A_MEMBER = "L'utilisateur assigné doit être contributeur du projet."
+
+
+def get_cache(request):
+    """Cache des assignations résolues, porté par la requête en cours."""
+    if request is None:
+        return {}
+    if not hasattr(request, '_assignees'):
+        request._assignees = {}
+    return request._assignees
+
+
+def resolve_assignees(project, usernames, request=None):
+    """
+    Retourne {username: User} pour des assignees du projet. Lève
+    ValidationError si un username est inconnu et PermissionDenied si un
+    utilisateur n'est pas contributeur du projet.
+    """
+    cache = get_cache(request)
+    missing = {
+        username for username in usernames if (project.pk, username) not in cache
+    }
+    if missing:
+        users = {
+            user.username: user
+            for user in User.objects.filter(username__in=missing).annotate(
+                is_project_member=Exists(Contributor.objects.filter(
+                    project=project, contributor=OuterRef('pk')
+                ))
+            )
+        }
+        for username in missing:
+            cache[(project.pk, username)] = users.get(username)
+
+    resolved = {}
+    for username in usernames:
+        user = cache[(project.pk, username)]
+        if user is None:
+            raise ValidationError({'assignee': [UNKNOWN_USER]})
+        if not user.is_project_member:
+            raise PermissionDenied(NOT_A_MEMBER)
+        resolved[username] = user
+    return resolved
+
+
+def resolve_assignee(project, username, request=None):
+    """Retourne l'utilisateur assignable désigné par `username` (voir ci-dessus)."""
+    return resolve_assignees(project, [username], request)[username]
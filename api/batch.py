@@ -0,0 +1,206 @@
+"""
+Exécution groupée de requêtes : POST /api/batch/.
+
+Le client envoie une liste de sous-requêtes ; l'utilisateur est authentifié une
+seule fois (le JWT n'est décodé que pour le lot) puis chaque sous-requête est
+résolue par le routeur d'URL et confiée à la vue existante, avec ses permissions
+et sa validation habituelles. La réponse contient, dans l'ordre, le code HTTP et
+le corps de chaque sous-requête. Seules les vues DRF sous `/api/` peuvent être
+appelées : les autres (administration, flux SSE) ne reconnaîtraient pas
+l'utilisateur imposé à la sous-requête.
+
+Avec `"concurrent": true`, les lectures (GET) consécutives sont exécutées en
+parallèle ; une écriture reste une barrière, exécutée seule et dans l'ordre.
+"""
+import io
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+from rest_framework import permissions, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'MAX_REQUESTS': 20,
+    'MAX_WORKERS': 4,
+}
+
+METHODS = ('GET', 'POST', 'PUT', 'PATCH', 'DELETE')
+
+# Préfixe des chemins acceptés dans un lot
+API_PREFIX = '/api/'
+
+
+def get_setting(name):
+    """Retourne un paramètre du lot (surchargeable via BATCH_API)."""
+    return getattr(settings, 'BATCH_API', {}).get(name, DEFAULTS[name])
+
+
+def build_subrequest(request, method, path, body):
+    """
+    Construit la requête Django d'une sous-requête. Elle hérite des en-têtes du
+    lot, sauf `Authorization` : l'utilisateur déjà authentifié lui est imposé.
+    """
+    url = urlsplit(path)
+    subrequest = HttpRequest()
+    subrequest.method = method
+    subrequest.path = subrequest.path_info = url.path
+    subrequest.META = {
+        key: value for key, value in request.META.items()
+        if key not in ('HTTP_AUTHORIZATION', 'CONTENT_LENGTH', 'wsgi.input')
+    }
+    subrequest.META.update({
+        'REQUEST_METHOD': method,
+        'PATH_INFO': url.path,
+        'QUERY_STRING': url.query,
+    })
+    subrequest.GET = QueryDict(url.query)
+    content = json.dumps(body).encode('utf-8') if body is not None else b''
+    subrequest.META['CONTENT_TYPE'] = 'application/json'
+    subrequest.META['CONTENT_LENGTH'] = str(len(content))
+    subrequest._stream = io.BytesIO(content)
+    subrequest._read_started = False
+    # Reconnu par rest_framework.request.Request : pas de nouvelle authentification
+    subrequest._force_auth_user = request.user
+    subrequest._force_auth_token = request.auth
+    return subrequest
+
+
+def decode(response):
+    """Retourne le corps d'une réponse : JSON décodé si possible, sinon texte."""
+    if not response.content:
+        return None
+    try:
+        return json.loads(response.content)
+    except ValueError:
+        return response.content.decode(response.charset or 'utf-8', 'replace')
+
+
+def error(status_code, message):
+    return {"status": status_code, "body": {"message": message}}
+
+
+def execute(request, item):
+    """Exécute une sous-requête et retourne son code HTTP et son corps."""
+    method, path = item['method'], item['path']
+    url_path = urlsplit(path).path
+    if not url_path.startswith(API_PREFIX):
+        return error(
+            status.HTTP_400_BAD_REQUEST,
+            "Seules les ressources de l'API peuvent être appelées dans un lot."
+        )
+    try:
+        match = resolve(url_path)
+    except Resolver404:
+        return error(
+            status.HTTP_404_NOT_FOUND, "La ressource demandée est introuvable."
+        )
+
+    # Seules les vues DRF reconnaissent l'utilisateur imposé à la sous-requête
+    view_class = getattr(match.func, 'view_class', None)
+    if not (isinstance(view_class, type) and issubclass(view_class, APIView)) \
+            or view_class is BatchView:
+        return error(
+            status.HTTP_400_BAD_REQUEST,
+            "Cette ressource ne peut pas être appelée dans un lot."
+        )
+
+    subrequest = build_subrequest(request, method, path, item.get('body'))
+    subrequest.resolver_match = match
+    try:
+        response = match.func(subrequest, *match.args, **match.kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+    except Exception:
+        logger.exception(f"Échec de la sous-requête {method} {path}")
+        return error(status.HTTP_500_INTERNAL_SERVER_ERROR, "Erreur interne.")
+    if response.streaming:
+        return error(
+            status.HTTP_400_BAD_REQUEST,
+            "Cette ressource ne peut pas être appelée dans un lot."
+        )
+    return {"status": response.status_code, "body": decode(response)}
+
+
+def execute_in_thread(request, item):
+    """Exécute une sous-requête dans un thread et libère sa connexion."""
+    try:
+        return execute(request, item)
+    finally:
+        connections.close_all()
+
+
+def validate_items(items):
+    """Vérifie le format et la taille du lot ; lève ValidationError sinon."""
+    if not isinstance(items, list) or not items:
+        raise ValidationError({"requests": "Une liste de requêtes est attendue."})
+    limit = get_setting('MAX_REQUESTS')
+    if len(items) > limit:
+        raise ValidationError(
+            {"requests": f"Un lot est limité à {limit} requêtes."}
+        )
+    for index, item in enumerate(items):
+        if not isinstance(item, dict) or not isinstance(item.get('path'), str):
+            raise ValidationError({"requests": f"Requête {index} : chemin manquant."})
+        item['method'] = str(item.get('method', 'GET')).upper()
+        if item['method'] not in METHODS:
+            raise ValidationError(
+                {"requests": f"Requête {index} : méthode {item['method']} refusée."}
+            )
+
+
+class BatchView(APIView):
+    """
+    Exécute une liste de sous-requêtes en un seul appel HTTP.
+
+    Corps attendu :
+    `{"requests": [{"id": "p", "method": "GET", "path": "/api/projects/1/"}, ...],
+    "concurrent": false}`. Chaque résultat reprend l'`id` éventuel de sa
+    sous-requête, son code HTTP (`status`) et son corps (`body`).
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        data = request.data if isinstance(request.data, dict) else {}
+        items = data.get('requests')
+        validate_items(items)
+
+        if data.get('concurrent'):
+            results = self.run_concurrently(request, items)
+        else:
+            results = [execute(request, item) for item in items]
+
+        for item, result in zip(items, results):
+            if 'id' in item:
+                result['id'] = item['id']
+        return Response({
+            "message": "Lot exécuté.",
+            "data": results
+        }, status=status.HTTP_200_OK)
+
+    def run_concurrently(self, request, items):
+        """
+        Exécute les GET consécutifs en parallèle ; chaque écriture attend la fin
+        des lectures qui la précèdent et s'exécute seule.
+        """
+        results = []
+        with ThreadPoolExecutor(max_workers=get_setting('MAX_WORKERS')) as pool:
+            pending = []
+            for item in items:
+                if item['method'] == 'GET':
+                    pending.append(pool.submit(execute_in_thread, request, item))
+                    continue
+                results += [future.result() for future in pending]
+                pending = []
+                results.append(execute(request, item))
+            results += [future.result() for future in pending]
+        return results
@@ -0,0 +1,250 @@
+"""
+Suivi des modifications pour la synchronisation incrémentale des clients.
+
+Chaque sauvegarde d'un projet, d'une issue, d'un commentaire ou d'un contributeur
+reçoit un numéro de séquence global et monotone (`change_seq`) ; chaque
+suppression, y compris en cascade ou logique, laisse une `Tombstone`. Un client
+envoie le dernier curseur reçu et n'obtient que ce qui a changé depuis.
+
+Les mises à jour ensemblistes (`QuerySet.update`) ne déclenchent pas les signaux
+et doivent affecter elles-mêmes `change_seq=next_change_seq()` et
+`version=F('version') + 1`, dans la transaction qui écrit les lignes.
+
+Les suppressions en masse (`QuerySet.delete`, suppression d'un utilisateur)
+passent par `batched_tombstones()` pour n'utiliser qu'une séquence et un INSERT
+groupé ; `Model.delete()` des modèles suivis le fait d'office.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Expression, F
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+
+from .models import Project, Issue, Comment, ChangeSequence, Tombstone
+from users.models import Contributor
+
+TRACKED_MODELS = {
+    Project: 'project',
+    Issue: 'issue',
+    Comment: 'comment',
+    Contributor: 'contributor',
+}
+
+
+def next_change_seq():
+    """
+    Réserve le prochain numéro de séquence. À appeler dans la transaction qui
+    écrit la ligne portant le numéro : le verrou posé par l'UPDATE est conservé
+    jusqu'à sa validation, ce qui garantit qu'un curseur ne dépasse jamais une
+    modification non encore validée. Hors transaction, le numéro serait validé
+    avant la ligne (les modèles suivis sauvegardent donc dans une transaction,
+    voir ChangeTrackedMixin).
+    """
+    with transaction.atomic():
+        if not ChangeSequence.objects.filter(pk=1).update(value=F('value') + 1):
+            ChangeSequence.objects.get_or_create(pk=1)
+            ChangeSequence.objects.filter(pk=1).update(value=F('value') + 1)
+        return ChangeSequence.objects.values_list('value', flat=True).get(pk=1)
+
+
+def get_project_id(instance):
+    """Retourne l'identifiant du projet auquel appartient un objet suivi."""
+    if isinstance(instance, Project):
+        return instance.pk
+    if isinstance(instance, Comment):
+        if Comment.issue.is_cached(instance):
+            return instance.issue.project_id
+        return Issue.all_objects.values_list('project_id', flat=True).get(
+            pk=instance.issue_id
+        )
+    return instance.project_id
+
+
+def stamp_change(sender, instance, raw=False, update_fields=None, **kwargs):
+    """
+    Attribue une nouvelle séquence à l'objet sauvegardé et incrémente sa
+    version en base (jamais à partir d'une copie en mémoire périmée).
+    """
+    if raw:
+        return
+    instance.change_seq = next_change_seq()
+    versioned = hasattr(instance, 'version') and not instance._state.adding
+    if versioned and (update_fields is None or 'version' in update_fields):
+        instance.version = F('version') + 1
+
+
+def refresh_version(sender, instance, raw=False, **kwargs):
+    """Relit la version incrémentée par la base lors de la sauvegarde."""
+    if isinstance(getattr(instance, 'version', None), Expression):
+        instance.refresh_from_db(fields=['version'])
+
+
+def create_tombstone(instance):
+    """Enregistre la suppression d'un objet suivi."""
+    return Tombstone.objects.create(
+        model=TRACKED_MODELS[type(instance)],
+        object_id=str(instance.pk),
+        project_id=get_project_id(instance),
+        change_seq=next_change_seq(),
+    )
+
+
+_tombstones = ContextVar('tombstones', default=None)
+
+
+class TombstoneBatch:
+    """Tombstones d'une suppression groupée, écrites en une fois à sa sortie."""
+
+    def __init__(self):
+        self.rows = []
+        # Projet des issues supprimées dans le lot, relevé avant leur suppression
+        self.issue_projects = {}
+
+    def add(self, instance):
+        issue_id = None
+        if isinstance(instance, Comment):
+            issue_id = instance.issue_id
+            project_id = instance.issue.project_id \
+                if Comment.issue.is_cached(instance) else None
+        else:
+            project_id = get_project_id(instance)
+        self.rows.append(
+            (TRACKED_MODELS[type(instance)], str(instance.pk), project_id, issue_id)
+        )
+
+    def flush(self):
+        if not self.rows:
+            return
+        missing = {
+            issue_id for _, _, project_id, issue_id in self.rows
+            if project_id is None and issue_id not in self.issue_projects
+        }
+        if missing:
+            self.issue_projects.update(
+                Issue.all_objects.filter(pk__in=missing).values_list('pk', 'project_id')
+            )
+        change_seq = next_change_seq()
+        Tombstone.objects.bulk_create([
+            Tombstone(
+                model=model,
+                object_id=object_id,
+                project_id=project_id or self.issue_projects[issue_id],
+                change_seq=change_seq,
+            )
+            for model, object_id, project_id, issue_id in self.rows
+        ])
+        self.rows = []
+
+
+@contextmanager
+def batched_tombstones():
+    """
+    Regroupe les tombstones des suppressions exécutées dans le bloc, cascades
+    comprises : une seule séquence, un seul INSERT groupé et au plus une
+    requête pour retrouver le projet des commentaires. Le bloc s'exécute dans
+    une transaction.
+    """
+    if _tombstones.get() is not None:
+        yield  # Déjà dans un lot
+        return
+    batch = TombstoneBatch()
+    token = _tombstones.set(batch)
+    try:
+        with transaction.atomic():
+            yield
+            batch.flush()
+    finally:
+        _tombstones.reset(token)
+
+
+def remember_issue_project(sender, instance, **kwargs):
+    """Relève le projet d'une issue avant sa suppression, pour ses commentaires."""
+    batch = _tombstones.get()
+    if batch is not None:
+        batch.issue_projects[instance.pk] = instance.project_id
+
+
+def record_tombstone(sender, instance, **kwargs):
+    """
+    Trace la suppression physique d'un objet. Un objet supprimé logiquement a
+    reçu sa tombstone à la suppression : sa purge n'en crée pas une seconde.
+    """
+    if getattr(instance, 'deleted_at', None) is not None:
+        return
+    batch = _tombstones.get()
+    if batch is not None:
+        batch.add(instance)
+    else:
+        create_tombstone(instance)
+
+
+def connect_signals():
+    """Branche le suivi des modifications (appelé depuis ApiConfig.ready)."""
+    for model in TRACKED_MODELS:
+        pre_save.connect(stamp_change, sender=model, dispatch_uid=f'stamp_{model}')
+        post_save.connect(
+            refresh_version, sender=model, dispatch_uid=f'version_{model}'
+        )
+        post_delete.connect(
+            record_tombstone, sender=model, dispatch_uid=f'tombstone_{model}'
+        )
+    pre_delete.connect(
+        remember_issue_project, sender=Issue, dispatch_uid='tombstone_issue_project'
+    )
+
+
+def get_changes(project, since, limit=None):
+    """
+    Retourne les objets modifiés et les suppressions d'un projet depuis `since`,
+    ainsi que le nouveau curseur et un indicateur `has_more`.
+
+    Environ `limit` lignes par type sont lues ; si un type est tronqué, le
+    curseur est ramené à la dernière séquence complète afin qu'aucune
+    modification ne soit sautée au prochain appel.
+    """
+    limit = limit or getattr(settings, 'CHANGES_PAGE_SIZE', 500)
+    querysets = {
+        'issues': Issue.objects.filter(project=project)
+        .select_related('creator', 'assignee', 'project'),
+        'comments': Comment.objects.filter(
+            issue__project=project, issue__deleted_at__isnull=True
+        )
+        .select_related('creator', 'issue'),
+        'contributors': Contributor.objects.filter(project=project)
+        .select_related('contributor'),
+        'deleted': Tombstone.objects.filter(project_id=project.pk),
+    }
+
+    results = {}
+    bound = None
+    for key, queryset in querysets.items():
+        rows = list(
+            queryset.filter(change_seq__gt=since).order_by('change_seq')[:limit]
+        )
+        if len(rows) == limit:
+            # Complète la dernière séquence (une mise à jour ensembliste
+            # partage la même séquence entre plusieurs lignes).
+            last = rows[-1].change_seq
+            rows = [row for row in rows if row.change_seq < last]
+            rows += list(queryset.filter(change_seq=last).order_by('pk'))
+            bound = last if bound is None else min(bound, last)
+        results[key] = rows
+
+    if bound is not None:
+        results = {
+            key: [row for row in rows if row.change_seq <= bound]
+            for key, rows in results.items()
+        }
+
+    seqs = [row.change_seq for rows in results.values() for row in rows]
+    project_changed = since < project.change_seq and (
+        bound is None or project.change_seq <= bound
+    )
+    if project_changed:
+        seqs.append(project.change_seq)
+    results['project'] = project if project_changed else None
+    results['cursor'] = max(seqs, default=since)
+    results['has_more'] = bound is not None
+    return results
@@ -0,0 +1,116 @@
+"""
+Contrôle de concurrence optimiste pour les projets, issues et commentaires.
+
+Chaque écriture incrémente la colonne `version`, exposée dans l'en-tête `ETag`
+des réponses de détail. Une mise à jour accompagnée de `If-Match` s'exécute en
+un seul `UPDATE ... WHERE id = ? AND version IN (...)` : si aucune ligne ne
+correspond, la ressource a changé depuis sa lecture et la requête échoue en 412.
+Aucun verrou n'est tenu pendant la requête.
+
+Sans `If-Match`, la dernière écriture l'emporte, comme auparavant.
+"""
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from .changes import next_change_seq
+from .models import make_excerpt
+
+
+class PreconditionFailed(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = (
+        "La ressource a été modifiée depuis sa lecture. "
+        "Rechargez-la puis renvoyez la modification."
+    )
+    default_code = 'precondition_failed'
+
+
+def etag(instance):
+    return f'"{instance.version}"'
+
+
+def parse_if_match(request):
+    """
+    Retourne les versions acceptées par l'en-tête If-Match, ou None s'il est
+    absent ou vaut `*`. Les ETags faibles ou invalides ne correspondent jamais
+    (comparaison forte).
+    """
+    header = request.headers.get('If-Match')
+    if header is None or header.strip() == '*':
+        return None
+    versions = []
+    for tag in header.split(','):
+        tag = tag.strip()
+        if len(tag) > 2 and tag[0] == tag[-1] == '"' and tag[1:-1].isdigit():
+            versions.append(int(tag[1:-1]))
+    return versions
+
+
+def conditional_update(instance, values, versions):
+    """
+    Applique `values` à l'objet si sa version en base figure dans `versions`,
+    en une requête ; lève PreconditionFailed sinon. Comme toute mise à jour
+    ensembliste, affecte elle-même `change_seq`, `updated_time` et l'extrait
+    de la description.
+    """
+    model = type(instance)
+    values = dict(values)
+    if 'description' in values and hasattr(instance, 'description_excerpt'):
+        values['description_excerpt'] = make_excerpt(values['description'])
+    if any(field.name == 'updated_time' for field in model._meta.concrete_fields):
+        values['updated_time'] = timezone.now()
+
+    with transaction.atomic():
+        values['change_seq'] = next_change_seq()
+        updated = model._base_manager.filter(
+            pk=instance.pk, version__in=versions
+        ).update(version=F('version') + 1, **values)
+        if not updated:
+            raise PreconditionFailed()
+
+    for name, value in values.items():
+        setattr(instance, name, value)
+    if len(versions) == 1:
+        instance.version = versions[0] + 1
+    else:
+        instance.refresh_from_db(fields=['version'])
+    return instance
+
+
+class VersionedResourceMixin:
+    """
+    Mixin de vue de détail : ajoute l'ETag aux réponses et rend les mises à
+    jour conditionnelles lorsque la requête porte `If-Match`. Doit précéder
+    `NestedResourceMixin` (résolution de l'objet) dans les bases de la vue.
+    """
+    required_columns = ('version',)
+    versioned_object = None
+
+    def get_object(self):
+        self.versioned_object = super().get_object()
+        return self.versioned_object
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.request.method in ('PUT', 'PATCH'):
+            context['if_match'] = parse_if_match(self.request)
+        return context
+
+    def with_etag(self, response):
+        if self.versioned_object is not None and status.is_success(
+            response.status_code
+        ):
+            response['ETag'] = etag(self.versioned_object)
+        return response
+
+    def get(self, request, *args, **kwargs):
+        return self.with_etag(super().get(request, *args, **kwargs))
+
+    def put(self, request, *args, **kwargs):
+        return self.with_etag(super().put(request, *args, **kwargs))
+
+    def patch(self, request, *args, **kwargs):
+        return self.with_etag(super().patch(request, *args, **kwargs))
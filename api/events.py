@@ -0,0 +1,240 @@
+"""
+Diffusion en temps réel (Server-Sent Events) de l'activité d'un projet.
+
+Les événements de l'outbox sont publiés, une fois la transaction validée, sur un
+broker de type pub/sub. Par défaut le broker est en mémoire et ne relie que les
+connexions d'un même processus ; `EVENT_STREAM['BROKER']` permet de brancher une
+implémentation partagée (Redis, PostgreSQL LISTEN/NOTIFY...) pour les
+déploiements multi-workers.
+
+Chaque connexion est une coroutine servie par `softdesk_api/asgi.py` : des
+milliers de clients inactifs ne coûtent qu'une file asyncio chacun, sans thread.
+"""
+import asyncio
+import json
+import threading
+from collections import defaultdict
+from functools import lru_cache
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils.module_loading import import_string
+from rest_framework.exceptions import NotFound, PermissionDenied
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+from .models import OutboxEvent
+from .nested import resolve_nested
+
+DEFAULTS = {
+    'BROKER': 'api.events.InMemoryBroker',
+    'HEARTBEAT': 15,
+    'QUEUE_SIZE': 1000,
+    'REPLAY_LIMIT': 1000,
+}
+
+
+def get_setting(name):
+    """Retourne un paramètre du flux d'événements (surchargeable via EVENT_STREAM)."""
+    return getattr(settings, 'EVENT_STREAM', {}).get(name, DEFAULTS[name])
+
+
+class Subscription:
+    """
+    Abonnement d'une connexion SSE : une file asyncio liée à la boucle
+    qui l'a créée, alimentée depuis n'importe quel thread.
+    """
+
+    def __init__(self, project_id, loop):
+        self.project_id = project_id
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=get_setting('QUEUE_SIZE'))
+        self.overflowed = False
+
+    def push(self, event):
+        # Exécuté dans la boucle de l'abonné
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Client trop lent : la connexion est fermée, il reprendra
+            # grâce à Last-Event-ID.
+            self.overflowed = True
+
+
+class InMemoryBroker:
+    """
+    Fan-out en mémoire des événements vers les abonnés d'un projet.
+    Suffisant pour un seul worker ; les brokers multi-workers exposent la même
+    interface (`subscribe`, `unsubscribe`, `publish`).
+    """
+
+    def __init__(self):
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, project_id):
+        subscription = Subscription(project_id, asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers[project_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.project_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.project_id]
+
+    def publish(self, project_id, event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(project_id, ()))
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.push, event)
+            except RuntimeError:
+                # Boucle fermée : l'abonné est déjà parti
+                self.unsubscribe(subscription)
+
+
+@lru_cache(maxsize=None)
+def get_broker():
+    """Retourne l'instance du broker configuré (une par processus)."""
+    return import_string(get_setting('BROKER'))()
+
+
+def serialize_event(event):
+    """Représentation publiée d'un événement de l'outbox."""
+    return {
+        'id': event.id,
+        'model': event.model,
+        'object_id': event.object_id,
+        'project_id': event.project_id,
+        'action': event.action,
+        'payload': event.payload,
+    }
+
+
+def publish_event(event):
+    """Publie un événement de l'outbox vers les flux SSE de son projet."""
+    get_broker().publish(event.project_id, serialize_event(event))
+
+
+def format_sse(event):
+    """Formate un événement selon le protocole text/event-stream."""
+    data = json.dumps(event, cls=DjangoJSONEncoder)
+    return (
+        f"id: {event['id']}\n"
+        f"event: {event['model']}.{event['action']}\n"
+        f"data: {data}\n\n"
+    )
+
+
+def load_missed_events(project_id, last_event_id):
+    """Événements publiés après `last_event_id`, pour la reprise d'un client."""
+    events = OutboxEvent.objects.filter(
+        project_id=project_id, id__gt=last_event_id
+    ).order_by('id')[:get_setting('REPLAY_LIMIT')]
+    return [serialize_event(event) for event in events]
+
+
+def authorize(request, project_id):
+    """
+    Authentifie la requête par JWT et vérifie l'accès au projet.
+    Retourne une réponse d'erreur, ou None si l'accès est autorisé.
+    """
+    try:
+        result = JWTAuthentication().authenticate(request)
+    except (InvalidToken, TokenError):
+        result = None
+    if result is None:
+        return JsonResponse(
+            {
+                "message": (
+                    "Authentification requise : veuillez fournir vos "
+                    "informations d'identification."
+                )
+            },
+            status=401
+        )
+
+    try:
+        resolve_nested(result[0], project_id)
+    except NotFound:
+        return JsonResponse(
+            {"message": "La ressource demandée est introuvable."}, status=404
+        )
+    except PermissionDenied:
+        return JsonResponse(
+            {
+                "message": (
+                    "Accès refusé : vous n'avez pas les permissions nécessaires "
+                    "pour effectuer cette action."
+                )
+            },
+            status=403
+        )
+    return None
+
+
+async def stream_events(project_id, last_event_id=None, broker=None):
+    """
+    Générateur asynchrone du flux SSE d'un projet : rejoue les événements
+    manqués depuis `last_event_id`, puis relaie les nouveaux événements en
+    envoyant un commentaire de heartbeat pendant les périodes d'inactivité.
+    """
+    broker = broker or get_broker()
+    # Abonnement avant la relecture pour ne perdre aucun événement
+    subscription = broker.subscribe(project_id)
+    try:
+        yield "retry: 3000\n\n"
+        last_sent = last_event_id or 0
+        if last_event_id is not None:
+            for event in await sync_to_async(load_missed_events)(
+                project_id, last_event_id
+            ):
+                last_sent = event['id']
+                yield format_sse(event)
+
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    subscription.queue.get(), timeout=get_setting('HEARTBEAT')
+                )
+            except asyncio.TimeoutError:
+                yield ": heartbeat\n\n"
+                continue
+            if subscription.overflowed:
+                break
+            if event['id'] <= last_sent:
+                continue  # Déjà envoyé lors de la relecture
+            last_sent = event['id']
+            yield format_sse(event)
+    finally:
+        broker.unsubscribe(subscription)
+
+
+async def project_events(request, project_id):
+    """
+    Vue asynchrone : flux Server-Sent Events des issues et commentaires
+    d'un projet. Les clients reprennent après une coupure via `Last-Event-ID`.
+    """
+    error = await sync_to_async(authorize)(request, project_id)
+    if error is not None:
+        return error
+
+    last_event_id = request.headers.get('Last-Event-ID')
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        last_event_id = None
+
+    response = StreamingHttpResponse(
+        stream_events(project_id, last_event_id),
+        content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,136 @@
+"""
+Cache des représentations sérialisées (fragments) des issues et commentaires.
+
+Chaque objet est mis en cache sous la clé (modèle, pk, updated_time, version du
+serializer). Une liste ne lit d'abord que les identifiants et les dates de
+modification de la page, récupère les fragments en un seul `get_many`, ne
+sérialise que les absents et assemble la réponse dans l'ordre de la page.
+
+Une modification de l'objet change `updated_time`, donc la clé : aucune
+invalidation explicite n'est nécessaire. Les mises à jour ensemblistes
+(`QuerySet.update`) doivent affecter `updated_time` elles-mêmes. Les champs
+issus d'autres tables (usernames) ne font pas partie de la clé : `TIMEOUT`
+borne la durée pendant laquelle un renommage peut rester invisible.
+Incrémenter `fragment_version` sur le serializer invalide tous ses fragments.
+"""
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from softdesk_api import metrics
+
+DEFAULTS = {
+    'ENABLED': True,
+    'ALIAS': 'default',
+    'TIMEOUT': 3600,
+}
+
+_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0}
+
+
+def get_setting(name):
+    """Retourne un paramètre du cache (surchargeable via FRAGMENT_CACHE)."""
+    return getattr(settings, 'FRAGMENT_CACHE', {}).get(name, DEFAULTS[name])
+
+
+def fragment_key(model, pk, updated_time, version):
+    return (
+        f"fragment:{model._meta.label_lower}:{pk}:"
+        f"{updated_time.timestamp():.6f}:{version}"
+    )
+
+
+def count(hits, misses):
+    with _lock:
+        _stats['hits'] += hits
+        _stats['misses'] += misses
+    # Totaux tous workers confondus, exposés sur /metrics
+    if hits:
+        metrics.FRAGMENT_CACHE.inc(hits, result='hit')
+    if misses:
+        metrics.FRAGMENT_CACHE.inc(misses, result='miss')
+
+
+def get_stats():
+    """Compteurs de succès et d'échecs du cache depuis le démarrage du processus."""
+    with _lock:
+        stats = dict(_stats)
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else None
+    return stats
+
+
+def reset_stats():
+    with _lock:
+        _stats.update(hits=0, misses=0)
+
+
+class FragmentCacheMixin:
+    """
+    Mixin de vue de liste servant les représentations complètes depuis le cache
+    de fragments. Les représentations partielles (`?fields=`, `?expand=`,
+    `?comments=`) dépendent de la requête et sont sérialisées normalement.
+    """
+
+    def can_use_fragments(self):
+        if not get_setting('ENABLED'):
+            return False
+        context = self.get_serializer_context()
+        return not context.get('fields') and not context.get('expand')
+
+    def list(self, request, *args, **kwargs):
+        if not self.can_use_fragments():
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = queryset.values_list('pk', 'updated_time')
+        page = self.paginate_queryset(rows)
+        rows = list(page if page is not None else rows)
+
+        model = queryset.model
+        version = getattr(self.get_serializer_class(), 'fragment_version', 1)
+        keys = [fragment_key(model, pk, updated, version) for pk, updated in rows]
+        cache = caches[get_setting('ALIAS')]
+        fragments = cache.get_many(keys)
+
+        missing = [pk for (pk, _), key in zip(rows, keys) if key not in fragments]
+        count(len(rows) - len(missing), len(missing))
+        rendered = {}
+        if missing:
+            objects = list(queryset.filter(pk__in=missing))
+            serialized = self.get_serializer(objects, many=True).data
+            # La clé est recalculée sur l'objet relu : une modification survenue
+            # entre les deux lectures n'est jamais stockée sous l'ancienne clé.
+            cache.set_many({
+                fragment_key(model, obj.pk, obj.updated_time, version): data
+                for obj, data in zip(objects, serialized)
+            }, get_setting('TIMEOUT'))
+            rendered = {obj.pk: data for obj, data in zip(objects, serialized)}
+
+        # Un objet supprimé entre les deux lectures est omis de la page
+        data = [
+            fragments[key] if key in fragments else rendered[pk]
+            for (pk, _), key in zip(rows, keys)
+            if key in fragments or pk in rendered
+        ]
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+
+class FragmentCacheStatsView(APIView):
+    """
+    Vue réservée au staff : compteurs du cache de fragments de ce processus.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        return Response({
+            "message": "Statistiques du cache de fragments récupérées avec succès.",
+            "data": get_stats()
+        })
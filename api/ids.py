@@ -0,0 +1,62 @@
+"""
+Identifiants UUIDv7 (RFC 9562) ordonnés dans le temps.
+
+Les 48 premiers bits contiennent l'horodatage Unix en millisecondes, suivis de
+la version, d'un compteur de 12 bits (méthode 1 de la RFC : monotonie au sein
+d'une même milliseconde dans ce processus), de la variante et de 62 bits
+aléatoires. Les insertions successives tombent donc à droite de l'index de clé
+primaire au lieu de s'y disperser comme avec uuid4, et l'ordre des identifiants
+suit l'ordre de création.
+
+Les identifiants uuid4 existants restent des UUID valides : ils coexistent avec
+les nouveaux dans la même colonne et les mêmes URL.
+"""
+import os
+import threading
+import time
+import uuid
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+COUNTER_MAX = 0xFFF
+
+
+def build_uuid7(timestamp_ms, counter, random_bits):
+    """Assemble un UUIDv7 à partir de ses composantes (62 bits aléatoires)."""
+    value = (timestamp_ms & 0xFFFFFFFFFFFF) << 80
+    value |= 0x7 << 76
+    value |= (counter & COUNTER_MAX) << 64
+    value |= 0b10 << 62
+    value |= random_bits & 0x3FFFFFFFFFFFFFFF
+    return uuid.UUID(int=value)
+
+
+def uuid7():
+    """
+    Retourne un nouvel UUIDv7. Au sein d'un processus, les identifiants sont
+    strictement croissants, même générés dans la même milliseconde ou si
+    l'horloge recule.
+    """
+    global _last_ms, _counter
+    random_bits = int.from_bytes(os.urandom(8), 'big')
+    with _lock:
+        timestamp_ms = time.time_ns() // 1_000_000
+        if timestamp_ms > _last_ms:
+            _last_ms = timestamp_ms
+            _counter = random_bits >> 53  # Départ aléatoire sur 11 bits
+        else:
+            _counter += 1
+            if _counter > COUNTER_MAX:
+                # Compteur épuisé : on emprunte la milliseconde suivante
+                _last_ms += 1
+                _counter = 0
+        return build_uuid7(_last_ms, _counter, random_bits)
+
+
+def uuid7_timestamp(value):
+    """Retourne l'horodatage (ms Unix) d'un UUIDv7, ou None pour une autre version."""
+    if value.version != 7:
+        return None
+    return value.int >> 80
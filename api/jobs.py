@@ -0,0 +1,173 @@
+"""
+File de tâches différées adossée à la base de données, sans broker externe.
+
+Les fonctions décorées par `@task` sont enregistrées sous un nom stable ; les
+vues les mettent en file avec `enqueue`, qui n'écrit la tâche qu'une fois la
+transaction en cours validée. Le worker (`python manage.py run_tasks`) prend
+les tâches par ordre de priorité puis d'ancienneté et les exécute dans un pool
+de threads.
+
+- Prise en charge : une mise à jour conditionnelle sur (id, attempts) réserve
+  la tâche sans verrou de ligne ; plusieurs workers peuvent tourner en même
+  temps, y compris sur SQLite.
+- Délai de visibilité : une tâche prise reste invisible `VISIBILITY_TIMEOUT`
+  secondes. Si son worker disparaît, elle redevient disponible et est reprise.
+  Le nombre de tentatives sert de jeton : un worker dont la tâche a été reprise
+  ne peut plus en modifier l'état.
+- Relances : une tâche en échec est relancée avec un backoff exponentiel
+  jusqu'à `max_attempts`, puis marquée `failed` avec sa dernière erreur.
+
+Les tâches doivent être idempotentes : une tâche reprise après expiration du
+délai de visibilité peut s'exécuter deux fois.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connections, transaction
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'BATCH_SIZE': 10,
+    'VISIBILITY_TIMEOUT': 300,
+    'MAX_ATTEMPTS': 3,
+    'BACKOFF': 5,
+    'MAX_BACKOFF': 3600,
+}
+
+REGISTRY = {}
+
+PENDING = (Job.STATUS_QUEUED, Job.STATUS_RUNNING)
+
+
+def get_setting(name):
+    """Retourne un paramètre de la file (surchargeable via TASK_QUEUE)."""
+    return getattr(settings, 'TASK_QUEUE', {}).get(name, DEFAULTS[name])
+
+
+def task(name=None, priority=0, max_attempts=None):
+    """
+    Enregistre une fonction comme tâche différée. Ses arguments doivent être
+    sérialisables en JSON.
+    """
+    def decorator(function):
+        function.task_name = name or f"{function.__module__}.{function.__name__}"
+        function.priority = priority
+        function.max_attempts = max_attempts
+        REGISTRY[function.task_name] = function
+        return function
+    return decorator
+
+
+def enqueue(function, args=(), kwargs=None, priority=None, delay=None):
+    """
+    Met une tâche en file après validation de la transaction en cours
+    (immédiatement hors transaction). Une transaction annulée n'en crée aucune.
+    """
+    name = getattr(function, 'task_name', None)
+    if REGISTRY.get(name) is not function:
+        raise ValueError(f"{function!r} n'est pas une tâche enregistrée.")
+
+    def create():
+        Job.objects.create(
+            name=name,
+            args=list(args),
+            kwargs=kwargs or {},
+            priority=function.priority if priority is None else priority,
+            max_attempts=function.max_attempts or get_setting('MAX_ATTEMPTS'),
+            available_time=timezone.now() + timedelta(seconds=delay or 0),
+        )
+
+    transaction.on_commit(create)
+
+
+def claim(limit=None):
+    """
+    Réserve jusqu'à `limit` tâches disponibles et les retourne, les plus
+    prioritaires d'abord.
+    """
+    limit = limit or get_setting('BATCH_SIZE')
+    now = timezone.now()
+    candidates = Job.objects.filter(
+        status__in=PENDING, available_time__lte=now
+    ).order_by('-priority', 'available_time', 'id').values_list('id', 'attempts')
+
+    claimed = []
+    for pk, attempts in candidates[:limit * 2]:
+        reserved = Job.objects.filter(
+            pk=pk, attempts=attempts, status__in=PENDING
+        ).update(
+            status=Job.STATUS_RUNNING,
+            attempts=attempts + 1,
+            available_time=now + timedelta(
+                seconds=get_setting('VISIBILITY_TIMEOUT')
+            ),
+        )
+        if reserved:
+            claimed.append(pk)
+        if len(claimed) == limit:
+            break
+    return list(
+        Job.objects.filter(pk__in=claimed).order_by('-priority', 'id')
+    )
+
+
+def run_job(job):
+    """Exécute une tâche réservée et enregistre son résultat. Retourne son statut."""
+    function = REGISTRY.get(job.name)
+    try:
+        if function is None:
+            raise LookupError(f"Tâche inconnue : {job.name}")
+        if job.attempts > job.max_attempts:
+            raise TimeoutError("Délai de visibilité dépassé à la dernière tentative.")
+        with transaction.atomic():
+            function(*job.args, **job.kwargs)
+    except Exception as exc:
+        logger.warning(
+            f"Échec de la tâche {job.name} #{job.pk} "
+            f"(tentative {job.attempts}/{job.max_attempts}) : {exc}"
+        )
+        fields = {'last_error': f"{type(exc).__name__}: {exc}"}
+        if function is not None and job.attempts < job.max_attempts:
+            backoff = min(
+                get_setting('BACKOFF') * 2 ** (job.attempts - 1),
+                get_setting('MAX_BACKOFF')
+            )
+            fields.update(
+                status=Job.STATUS_QUEUED,
+                available_time=timezone.now() + timedelta(seconds=backoff),
+            )
+        else:
+            fields.update(status=Job.STATUS_FAILED, finished_time=timezone.now())
+    else:
+        fields = {'status': Job.STATUS_DONE, 'finished_time': timezone.now()}
+
+    # Sans effet si la tâche a été reprise par un autre worker entre-temps
+    Job.objects.filter(pk=job.pk, attempts=job.attempts).update(**fields)
+    return fields['status']
+
+
+def run_in_thread(job):
+    close_old_connections()
+    try:
+        return run_job(job)
+    finally:
+        connections.close_all()
+
+
+def run_pending(limit=None, executor=None):
+    """
+    Exécute un lot de tâches disponibles, dans `executor` s'il est fourni.
+    Retourne le nombre de tâches traitées.
+    """
+    jobs = claim(limit)
+    if executor is None:
+        for job in jobs:
+            run_job(job)
+    else:
+        list(executor.map(run_in_thread, jobs))
+    return len(jobs)
@@ -0,0 +1,150 @@
+import time
+import timeit
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from rest_framework import serializers
+
+from api.ids import uuid7
+from api.models import Project, Issue, Comment
+from api.serializers import ProjectSerializer, IssueSerializer, CommentSerializer
+from softdesk_api import slow_queries
+from users.models import User
+
+
+class Rollback(Exception):
+    """Annule les données créées pour une mesure."""
+
+
+def uncached(serializer_class):
+    """Variante du serializer reconstruisant ses champs à chaque instance."""
+    class Uncached(serializer_class):
+        def get_field_schema(self, serializer):
+            return serializers.ModelSerializer.get_fields(serializer)
+    return Uncached
+
+
+def bench_serializers(number):
+    """
+    Instanciation + sérialisation d'un objet (cas d'un GET de détail), avec et
+    sans schéma de champs mis en cache.
+    """
+    user = User.objects.create_user(
+        username='benchmark', email='benchmark@example.com', age=30, password='x'
+    )
+    project = Project.objects.create(
+        title="Benchmark", description="Description", type="back-end", creator=user
+    )
+    issue = Issue.objects.create(
+        title="Benchmark", description="Description", project=project,
+        creator=user, assignee=user, priority="LOW", tag="BUG", status="To Do"
+    )
+    comment = Comment.objects.create(content="Benchmark", issue=issue, creator=user)
+    project = Project.objects.prefetch_related('contributor_set__contributor') \
+        .select_related('creator').get(pk=project.pk)
+
+    results = []
+    for serializer_class, instance in (
+        (ProjectSerializer, project),
+        (IssueSerializer, issue),
+        (CommentSerializer, comment),
+    ):
+        for label, cls in (('cache', serializer_class),
+                           ('sans cache', uncached(serializer_class))):
+            seconds = timeit.timeit(lambda: cls(instance).data, number=number)
+            results.append(
+                (serializer_class.__name__, label, seconds / number * 1e6)
+            )
+    return [
+        f"{name:<20} {label:<12} {micros:8.1f} µs" for name, label, micros in results
+    ]
+
+
+def primary_key_index_size(model):
+    """Taille en octets de l'index de clé primaire d'un modèle, ou None."""
+    table = model._meta.db_table
+    if connection.vendor == 'postgresql':
+        sql = (
+            "SELECT pg_relation_size(indexrelid) FROM pg_index "
+            "WHERE indrelid = %s::regclass AND indisprimary"
+        )
+        params = [table]
+    elif connection.vendor == 'sqlite':
+        # Nécessite la table virtuelle dbstat (SQLITE_ENABLE_DBSTAT_VTAB)
+        sql = "SELECT SUM(pgsize) FROM dbstat WHERE name = %s"
+        params = [f'sqlite_autoindex_{table}_1']
+    else:
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchone()[0]
+
+
+def bench_comment_ids(number):
+    """
+    Débit d'insertion de `number` commentaires et croissance de l'index de clé
+    primaire avec des identifiants uuid4 (aléatoires) puis UUIDv7 (ordonnés).
+    """
+    user = User.objects.create_user(
+        username='benchmark', email='benchmark@example.com', age=30, password='x'
+    )
+    project = Project.objects.create(
+        title="Benchmark", description="Description", type="back-end", creator=user
+    )
+    issue = Issue.objects.create(
+        title="Benchmark", description="Description", project=project,
+        creator=user, priority="LOW", tag="BUG", status="To Do"
+    )
+    rows = number
+    lines = []
+    for label, make_id in (('uuid4', uuid.uuid4), ('uuid7', uuid7)):
+        size_before = primary_key_index_size(Comment)
+        started = time.perf_counter()
+        for start in range(0, rows, 500):
+            Comment.objects.bulk_create([
+                Comment(id=make_id(), content="Benchmark", issue=issue, creator=user)
+                for _ in range(min(500, rows - start))
+            ])
+        elapsed = time.perf_counter() - started
+        size_after = primary_key_index_size(Comment)
+        growth = "n/d" if size_after is None \
+            else f"{(size_after - (size_before or 0)) / 1024:.0f} Kio"
+        lines.append(
+            f"{label:<6} {rows} insertions : {rows / elapsed:9.0f} lignes/s, "
+            f"index de clé primaire +{growth}"
+        )
+        Comment.objects.filter(issue=issue)._raw_delete(connection.alias)
+    return lines
+
+
+BENCHMARKS = {
+    'serializers': bench_serializers,
+    'comment-ids': bench_comment_ids,
+}
+
+
+class Command(BaseCommand):
+    """
+    Micro-benchmarks des chemins critiques. Les données nécessaires sont créées
+    dans une transaction annulée à la fin de chaque mesure.
+    """
+    help = "Exécute des micro-benchmarks (serializers, identifiants…)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*', help=", ".join(BENCHMARKS))
+        parser.add_argument('--number', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        unknown = set(options['names']) - set(BENCHMARKS)
+        if unknown:
+            raise CommandError(f"Benchmark inconnu : {', '.join(sorted(unknown))}.")
+        for name in options['names'] or BENCHMARKS:
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            try:
+                with slow_queries.suspended(), transaction.atomic():
+                    for line in BENCHMARKS[name](options['number']):
+                        self.stdout.write(line)
+                    raise Rollback
+            except Rollback:
+                pass
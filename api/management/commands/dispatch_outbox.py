@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.outbox import dispatch_batch
+
+
+class Command(BaseCommand):
+    """
+    Worker qui vide la table outbox par lots et publie les événements
+    vers les webhooks enregistrés.
+    """
+    help = "Publie les événements issues/commentaires en attente vers les webhooks."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help="Traite les événements en attente puis s'arrête."
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=None,
+            help="Nombre maximal d'événements lus par lot."
+        )
+        parser.add_argument(
+            '--interval', type=float, default=1.0,
+            help="Attente en secondes lorsque la file est vide."
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            count = dispatch_batch(batch_size=options['batch_size'])
+            if count:
+                self.stdout.write(f"{count} événement(s) publié(s).")
+                continue
+            if options['once']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,60 @@
+import io
+import json
+import pstats
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+
+from softdesk_api.profiling import get_directory
+
+
+class Command(BaseCommand):
+    """
+    Agrège les échantillons du profilage par vue et affiche les fonctions
+    au temps cumulé le plus élevé, avec la durée et le nombre de requêtes SQL
+    moyens des échantillons.
+    """
+    help = "Affiche les points chauds par vue à partir des échantillons cProfile."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top', type=int, default=15,
+            help="Nombre de fonctions affichées par vue."
+        )
+        parser.add_argument(
+            '--view', default=None,
+            help="Limite le rapport à une vue (nom d'URL)."
+        )
+        parser.add_argument(
+            '--filter', default=None,
+            help="Expression régulière sur le chemin des fonctions (ex. 'api/')."
+        )
+
+    def handle(self, *args, **options):
+        samples = defaultdict(list)
+        for metadata_path in sorted(get_directory().glob('*.json')):
+            profile_path = metadata_path.with_suffix('.prof')
+            if not profile_path.exists():
+                continue
+            metadata = json.loads(metadata_path.read_text())
+            if options['view'] and metadata['view'] != options['view']:
+                continue
+            samples[metadata['view']].append((metadata, profile_path))
+
+        if not samples:
+            self.stdout.write("Aucun échantillon de profilage trouvé.")
+            return
+
+        for view, entries in sorted(samples.items()):
+            count = len(entries)
+            duration = sum(metadata['duration_ms'] for metadata, _ in entries) / count
+            queries = sum(metadata['queries'] for metadata, _ in entries) / count
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"{view} : {count} échantillon(s), {duration:.1f} ms "
+                f"et {queries:.1f} requête(s) SQL en moyenne"
+            ))
+            output = io.StringIO()
+            stats = pstats.Stats(*[str(path) for _, path in entries], stream=output)
+            restrictions = [options['filter']] if options['filter'] else []
+            stats.sort_stats('cumulative').print_stats(*restrictions, options['top'])
+            self.stdout.write(output.getvalue())
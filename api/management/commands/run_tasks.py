@@ -0,0 +1,40 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from api.jobs import run_pending
+
+
+class Command(BaseCommand):
+    """
+    Worker de la file de tâches différées : réserve les tâches disponibles par
+    lots et les exécute dans un pool de threads.
+    """
+    help = "Exécute les tâches différées en attente (onboarding, suppressions...)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help="Traite les tâches disponibles puis s'arrête."
+        )
+        parser.add_argument(
+            '--workers', type=int, default=4,
+            help="Nombre de threads exécutant les tâches."
+        )
+        parser.add_argument(
+            '--interval', type=float, default=1.0,
+            help="Attente en secondes lorsque la file est vide."
+        )
+
+    def handle(self, *args, **options):
+        workers = max(options['workers'], 1)
+        with ThreadPoolExecutor(workers, thread_name_prefix='task') as executor:
+            while True:
+                count = run_pending(limit=workers, executor=executor)
+                if count:
+                    self.stdout.write(f"{count} tâche(s) exécutée(s).")
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
@@ -0,0 +1,333 @@
+import multiprocessing
+import random
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, connections, transaction
+from django.db.models import Max
+
+from api.changes import next_change_seq
+from api.ids import build_uuid7, uuid7_timestamp
+from api.models import Project, Issue, Comment, make_excerpt
+from softdesk_api import slow_queries
+from users.models import User, Contributor
+
+MASK64 = (1 << 64) - 1
+
+# Horodatage de départ des UUIDv7 générés sur une base vide (un par
+# milliseconde et par commentaire)
+SEED_EPOCH_MS = 1_700_000_000_000
+
+WORDS = (
+    "api bug build cache client crash deploy docs error feature fix login "
+    "mobile page payment performance release request screen server sync test "
+    "timeout update user validation"
+).split()
+
+
+def unit(seed, stream, index):
+    """
+    Valeur pseudo-aléatoire dans [0, 1) dérivée uniquement de (seed, stream,
+    index) (mélange splitmix64) : n'importe quel processus peut recalculer
+    le créateur ou les membres d'un projet sans état partagé.
+    """
+    value = (seed * 0x9E3779B97F4A7C15 + stream * 0xBF58476D1CE4E5B9 + index) & MASK64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK64
+    return (value ^ (value >> 31)) / 2 ** 64
+
+
+def skewed(value, count, exponent):
+    """Index dans [0, count) concentré sur les petites valeurs (loi de puissance)."""
+    return min(int(count * value ** exponent), count - 1)
+
+
+class SeedPlan:
+    """
+    Paramètres d'une génération et fonctions déterministes décrivant le jeu de
+    données. L'objet est transmis tel quel aux processus de génération.
+    """
+
+    def __init__(self, options, bases, password_hash, change_seq):
+        self.seed = options['seed']
+        self.counts = {
+            'users': options['users'],
+            'projects': options['projects'],
+            'issues': options['issues'],
+            'comments': options['comments'],
+        }
+        self.members_mean = options['members']
+        self.batch_size = options['batch_size']
+        self.bases = bases
+        self.password_hash = password_hash
+        self.change_seq = change_seq
+        self.members = {}
+
+    def __getstate__(self):
+        # Le cache des membres n'est pas transmis aux processus de génération
+        return dict(self.__dict__, members={})
+
+    def user_id(self, index):
+        return self.bases['users'] + index
+
+    def project_creator(self, project):
+        index = skewed(unit(self.seed, 1, project), self.counts['users'], 2)
+        return self.user_id(index)
+
+    def project_members(self, project):
+        """Créateur puis membres du projet, sans doublon."""
+        if project not in self.members:
+            self.members[project] = self.compute_members(project)
+        return self.members[project]
+
+    def compute_members(self, project):
+        creator = self.project_creator(project)
+        size = int(self.members_mean * 2 * unit(self.seed, 2, project))
+        members = [creator]
+        for slot in range(size):
+            user = self.user_id(
+                skewed(unit(self.seed, 3, project * 64 + slot), self.counts['users'], 2)
+            )
+            if user not in members:
+                members.append(user)
+        return tuple(members)
+
+    def issue_project(self, issue):
+        return skewed(unit(self.seed, 4, issue), self.counts['projects'], 2)
+
+    def comment_issue(self, comment):
+        return skewed(unit(self.seed, 5, comment), self.counts['issues'], 1.5)
+
+
+def sentence(rng, length):
+    return " ".join(rng.choice(WORDS) for _ in range(length)).capitalize()
+
+
+def described(description):
+    # bulk_create n'appelle pas save() : l'extrait est calculé ici
+    return {
+        'description': description,
+        'description_excerpt': make_excerpt(description),
+    }
+
+
+def build_users(plan, rng, start, stop):
+    for index in range(start, stop):
+        user_id = plan.user_id(index)
+        yield User(
+            id=user_id,
+            username=f"seed{user_id}",
+            email=f"seed{user_id}@example.com",
+            age=rng.randint(15, 80),
+            can_be_contacted=rng.random() < 0.5,
+            can_data_be_shared=rng.random() < 0.3,
+            password=plan.password_hash,
+        )
+
+
+def build_projects(plan, rng, start, stop):
+    for index in range(start, stop):
+        yield Project(
+            id=plan.bases['projects'] + index,
+            title=sentence(rng, 3),
+            **described(sentence(rng, rng.randint(5, 60))),
+            type=rng.choice(Project.PROJECT_TYPES)[0],
+            creator_id=plan.project_creator(index),
+            change_seq=plan.change_seq,
+        )
+
+
+def build_contributors(plan, rng, start, stop):
+    for index in range(start, stop):
+        for position, user_id in enumerate(plan.project_members(index)):
+            yield Contributor(
+                project_id=plan.bases['projects'] + index,
+                contributor_id=user_id,
+                role=Contributor.ROLE_OWNER if position == 0
+                else Contributor.ROLE_CONTRIBUTOR,
+                change_seq=plan.change_seq,
+            )
+
+
+def build_issues(plan, rng, start, stop):
+    for index in range(start, stop):
+        project = plan.issue_project(index)
+        members = plan.project_members(project)
+        yield Issue(
+            id=plan.bases['issues'] + index,
+            title=sentence(rng, 4),
+            **described(sentence(rng, rng.randint(10, 120))),
+            project_id=plan.bases['projects'] + project,
+            creator_id=rng.choice(members),
+            assignee_id=rng.choice(members) if rng.random() < 0.7 else None,
+            priority=rng.choice(Issue.PRIORITIES)[0],
+            tag=rng.choice(Issue.TAGS)[0],
+            status=rng.choice(Issue.STATUSES)[0],
+            change_seq=plan.change_seq,
+        )
+
+
+def build_comments(plan, rng, start, stop):
+    for index in range(start, stop):
+        issue = plan.comment_issue(index)
+        members = plan.project_members(plan.issue_project(issue))
+        yield Comment(
+            id=build_uuid7(plan.bases['comments'] + index, 0, rng.getrandbits(62)),
+            content=sentence(rng, rng.randint(3, 40)),
+            issue_id=plan.bases['issues'] + issue,
+            creator_id=rng.choice(members),
+            change_seq=plan.change_seq,
+        )
+
+
+PHASES = [
+    ('users', User, build_users),
+    ('projects', Project, build_projects),
+    ('contributors', Contributor, build_contributors),
+    ('issues', Issue, build_issues),
+    ('comments', Comment, build_comments),
+]
+
+
+def run_range(plan, phase, start, stop):
+    """
+    Génère et insère les lignes [start, stop) d'une phase, lot par lot. Chaque
+    lot a son propre générateur aléatoire : le résultat ne dépend pas du nombre
+    de processus.
+    """
+    model, builder = {name: (model, builder) for name, model, builder in PHASES}[phase]
+    inserted = 0
+    for batch_start in range(start, stop, plan.batch_size):
+        batch_stop = min(batch_start + plan.batch_size, stop)
+        rng = random.Random(f"{plan.seed}-{phase}-{batch_start}")
+        rows = list(builder(plan, rng, batch_start, batch_stop))
+        with transaction.atomic():
+            model.objects.bulk_create(rows, batch_size=plan.batch_size)
+        inserted += len(rows)
+    return inserted
+
+
+def run_worker(plan, phase, start, stop):
+    """Point d'entrée d'un processus de génération."""
+    try:
+        return run_range(plan, phase, start, stop)
+    finally:
+        connections.close_all()
+
+
+def comment_epoch():
+    """
+    Horodatage de départ des UUIDv7 des commentaires : après le plus récent
+    UUIDv7 existant, afin qu'une nouvelle génération ne réutilise pas les
+    identifiants d'une précédente. Les UUID d'une autre version ne peuvent pas
+    entrer en collision (le numéro de version fait partie de l'identifiant).
+    """
+    ids = Comment.objects.order_by('-id').values_list('id', flat=True)
+    for value in ids.iterator():
+        timestamp = uuid7_timestamp(value)
+        if timestamp is not None:
+            return max(SEED_EPOCH_MS, timestamp + 1)
+    return SEED_EPOCH_MS
+
+
+def reset_sequences():
+    """
+    Recale les séquences des clés primaires insérées explicitement (sans effet
+    sous SQLite, qui suit déjà la plus grande valeur insérée).
+    """
+    statements = connection.ops.sequence_reset_sql(no_style(), [User, Project, Issue])
+    with connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+def split(total, parts, step):
+    """Découpe [0, total) en `parts` intervalles alignés sur `step`."""
+    chunk = -(-total // parts)
+    chunk = -(-chunk // step) * step
+    return [(start, min(start + chunk, total)) for start in range(0, total, chunk)]
+
+
+class Command(BaseCommand):
+    """
+    Génère un jeu de données synthétique reproductible (utilisateurs, projets,
+    contributeurs, issues, commentaires) avec des distributions biaisées : peu
+    d'utilisateurs et de projets concentrent l'essentiel de l'activité.
+
+    Les insertions passent par `bulk_create` par gros lots, avec un unique hash
+    de mot de passe précalculé, et peuvent être réparties sur plusieurs processus
+    travaillant sur des plages d'identifiants disjointes.
+    """
+    help = "Génère des données synthétiques à grande échelle (bulk_create)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--projects', type=int, default=500)
+        parser.add_argument('--issues', type=int, default=20000)
+        parser.add_argument('--comments', type=int, default=80000)
+        parser.add_argument(
+            '--members', type=float, default=4,
+            help="Nombre moyen de contributeurs ajoutés par projet."
+        )
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--workers', type=int, default=1,
+            help="Nombre de processus de génération (inutile sous SQLite)."
+        )
+        parser.add_argument(
+            '--password', default='password',
+            help="Mot de passe commun à tous les utilisateurs générés."
+        )
+
+    def handle(self, *args, **options):
+        for name in ('users', 'projects', 'issues'):
+            if options[name] < 1:
+                raise CommandError(f"--{name} doit être strictement positif.")
+
+        bases = {
+            'users': (User.objects.aggregate(value=Max('id'))['value'] or 0) + 1,
+            'projects': (Project.objects.aggregate(value=Max('id'))['value'] or 0) + 1,
+            'issues': (Issue.objects.aggregate(value=Max('id'))['value'] or 0) + 1,
+            'comments': comment_epoch(),
+        }
+        plan = SeedPlan(
+            options, bases, make_password(options['password']), next_change_seq()
+        )
+        totals = dict(plan.counts, contributors=options['projects'])
+
+        # Chaque INSERT groupé dépasserait le seuil du journal des requêtes lentes
+        with slow_queries.suspended():
+            self.run_phases(plan, totals, options['workers'])
+        reset_sequences()
+
+    def run_phases(self, plan, totals, workers):
+        started = time.perf_counter()
+        grand_total = 0
+        for phase, _, _ in PHASES:
+            phase_started = time.perf_counter()
+            ranges = split(totals[phase], workers, plan.batch_size)
+            if workers > 1 and len(ranges) > 1:
+                # Les processus héritent de Django mais pas des connexions
+                connections.close_all()
+                context = multiprocessing.get_context('fork')
+                with context.Pool(len(ranges)) as pool:
+                    count = sum(pool.starmap(
+                        run_worker, [(plan, phase, *bounds) for bounds in ranges]
+                    ))
+            else:
+                count = sum(run_range(plan, phase, *bounds) for bounds in ranges)
+            elapsed = time.perf_counter() - phase_started
+            grand_total += count
+            self.stdout.write(
+                f"{phase} : {count} ligne(s) en {elapsed:.1f} s "
+                f"({count / max(elapsed, 1e-9):.0f} lignes/s)"
+            )
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Total : {grand_total} ligne(s) en {elapsed:.1f} s "
+            f"({grand_total / max(elapsed, 1e-9):.0f} lignes/s)"
+        ))
@@ -1,9 +1,44 @@
 from django.db import models
+from django.utils import timezone
+from django.utils.text import Truncator
 from users.models import User, Contributor
-import uuid
+from .ids import uuid7
+from .tracking import ChangeTrackedMixin
 
+# Longueur de l'extrait de description servi par les listes
+EXCERPT_LENGTH = 200
 
-class Project(models.Model):
+
+def make_excerpt(text):
+    """Extrait d'une description : espaces normalisés, coupé à EXCERPT_LENGTH."""
+    return Truncator(' '.join(text.split())).chars(EXCERPT_LENGTH)
+
+
+def refresh_excerpt(instance, kwargs):
+    """
+    Recalcule `description_excerpt` avant la sauvegarde, sauf si la description
+    n'a pas été chargée (`defer`) ; l'extrait suit la description dans
+    `update_fields`.
+    """
+    if 'description' in instance.get_deferred_fields():
+        return
+    instance.description_excerpt = make_excerpt(instance.description)
+    update_fields = kwargs.get('update_fields')
+    if update_fields is not None and 'description' in update_fields:
+        kwargs['update_fields'] = {*update_fields, 'description_excerpt'}
+
+
+class LiveManager(models.Manager):
+    """
+    Manager par défaut des modèles à suppression logique : masque les lignes
+    supprimées. `all_objects` donne accès à toutes les lignes.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
+class Project(ChangeTrackedMixin, models.Model):
     # Types de projets
     BACKEND = 'back-end'
     FRONTEND = 'front-end'
@@ -17,8 +52,16 @@ class Project(models.Model):
         (ANDROID, 'Android'),
     ]
 
-    title = models.CharField(max_length=255, help_text="Titre du projet")
+    title = models.CharField(
+        max_length=255, db_index=True, help_text="Titre du projet"
+    )
     description = models.TextField(help_text="Description détaillée du projet")
+    description_excerpt = models.CharField(
+        max_length=EXCERPT_LENGTH,
+        blank=True,
+        editable=False,
+        help_text="Début de la description, calculé à la sauvegarde (listes)"
+    )
     type = models.CharField(
         max_length=50,
         choices=PROJECT_TYPES,
@@ -30,22 +73,49 @@ class Project(models.Model):
         on_delete=models.CASCADE,
         help_text="Créateur du projet"
     )
-    contributors = models.ManyToManyField(
-        Contributor,
-        related_name="projects_contributed",
-        blank=True,
-        help_text="Contributeurs associés au projet"
-    )
     created_time = models.DateTimeField(
         auto_now_add=True,
         help_text="Date de création du projet"
     )
+    change_seq = models.BigIntegerField(
+        default=0,
+        editable=False,
+        db_index=True,
+        help_text="Numéro de séquence de la dernière modification"
+    )
+    version = models.PositiveIntegerField(
+        default=1,
+        editable=False,
+        help_text="Version de l'objet, incrémentée à chaque écriture (ETag)"
+    )
+    deleted_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Date de suppression (purge différée, annulable d'ici là)"
+    )
+
+    objects = LiveManager()
+    all_objects = models.Manager()
+
+    def save(self, *args, **kwargs):
+        creating = self._state.adding
+        refresh_excerpt(self, kwargs)
+        super().save(*args, **kwargs)
+        if creating:
+            # Le créateur est toujours membre : la liste des projets d'un
+            # utilisateur se lit alors uniquement dans l'index des contributeurs.
+            Contributor.objects.get_or_create(
+                contributor_id=self.creator_id,
+                project=self,
+                defaults={'role': Contributor.ROLE_OWNER}
+            )
 
     def __str__(self):
         return self.title  # Retourne le titre comme représentation du projet
 
 
-class Issue(models.Model):
+class Issue(ChangeTrackedMixin, models.Model):
     # Priorités de l'issue
     PRIORITY_LOW = 'LOW'
     PRIORITY_MEDIUM = 'MEDIUM'
@@ -79,8 +149,16 @@ class Issue(models.Model):
         (STATUS_FINISHED, 'Finished'),
     ]
 
-    title = models.CharField(max_length=100, help_text="Titre de l'issue")
+    title = models.CharField(
+        max_length=100, db_index=True, help_text="Titre de l'issue"
+    )
     description = models.TextField(help_text="Description détaillée de l'issue")
+    description_excerpt = models.CharField(
+        max_length=EXCERPT_LENGTH,
+        blank=True,
+        editable=False,
+        help_text="Début de la description, calculé à la sauvegarde (listes)"
+    )
     project = models.ForeignKey(
         Project,
         related_name="issues",
@@ -123,17 +201,70 @@ class Issue(models.Model):
         auto_now_add=True,
         help_text="Date de création de l'issue"
     )
+    updated_time = models.DateTimeField(
+        auto_now=True,
+        help_text="Date de dernière modification de l'issue"
+    )
+    change_seq = models.BigIntegerField(
+        default=0,
+        editable=False,
+        help_text="Numéro de séquence de la dernière modification"
+    )
+    version = models.PositiveIntegerField(
+        default=1,
+        editable=False,
+        help_text="Version de l'objet, incrémentée à chaque écriture (ETag)"
+    )
+    deleted_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Date de suppression (purge différée, annulable d'ici là)"
+    )
+
+    objects = LiveManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        # Les index partiels ne couvrent que les issues non supprimées : les
+        # requêtes du manager par défaut (deleted_at IS NULL) peuvent les utiliser.
+        indexes = [
+            models.Index(
+                fields=['project', 'change_seq'], name='issue_project_change_idx'
+            ),
+            # Liste des issues d'un projet, triée par date de création
+            models.Index(
+                fields=['project', 'created_time'],
+                name='issue_live_project_idx',
+                condition=models.Q(deleted_at__isnull=True)
+            ),
+            # Boîte de réception « mes issues » (/api/auth/me/issues/)
+            models.Index(
+                fields=['assignee', 'status', 'created_time'],
+                name='issue_assignee_status_idx',
+                condition=models.Q(deleted_at__isnull=True)
+            ),
+            models.Index(
+                fields=['creator', 'created_time'],
+                name='issue_creator_created_idx',
+                condition=models.Q(deleted_at__isnull=True)
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        refresh_excerpt(self, kwargs)
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.title  # Retourne le titre comme représentation de l'issue
 
 
-class Comment(models.Model):
+class Comment(ChangeTrackedMixin, models.Model):
     id = models.UUIDField(
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
         editable=False,
-        help_text="Identifiant unique du commentaire"
+        help_text="Identifiant unique du commentaire (UUIDv7, ordonné dans le temps)"
     )
     content = models.TextField(help_text="Contenu du commentaire")
     issue = models.ForeignKey(
@@ -152,7 +283,203 @@ class Comment(models.Model):
         auto_now_add=True,
         help_text="Date de création du commentaire"
     )
+    updated_time = models.DateTimeField(
+        auto_now=True,
+        help_text="Date de dernière modification du commentaire"
+    )
+    change_seq = models.BigIntegerField(
+        default=0,
+        editable=False,
+        db_index=True,
+        help_text="Numéro de séquence de la dernière modification"
+    )
+    version = models.PositiveIntegerField(
+        default=1,
+        editable=False,
+        help_text="Version de l'objet, incrémentée à chaque écriture (ETag)"
+    )
 
     def __str__(self):
         # Affiche une description lisible du commentaire
         return f"Comment by {self.creator.user.username} on {self.issue.title}"
+
+
+class Webhook(models.Model):
+    """
+    URL externe notifiée par lots des événements issues/commentaires.
+    Sans projet associé, le webhook reçoit les événements de tous les projets.
+    """
+    url = models.URLField(max_length=500, help_text="URL appelée en POST")
+    project = models.ForeignKey(
+        Project,
+        related_name="webhooks",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        help_text="Projet surveillé (tous les projets si vide)"
+    )
+    is_active = models.BooleanField(default=True, help_text="Webhook actif")
+    created_time = models.DateTimeField(
+        auto_now_add=True,
+        help_text="Date d'enregistrement du webhook"
+    )
+    # État de livraison propre à chaque webhook (voir api.outbox)
+    last_event_id = models.BigIntegerField(
+        default=0, help_text="Dernier événement de l'outbox traité pour ce webhook"
+    )
+    attempts = models.PositiveIntegerField(
+        default=0, help_text="Tentatives déjà faites pour le lot en cours"
+    )
+    available_time = models.DateTimeField(
+        default=timezone.now,
+        help_text="Date à partir de laquelle le dispatcher peut reprendre le webhook"
+    )
+    last_error = models.TextField(blank=True, default='')
+
+    def save(self, *args, **kwargs):
+        # Un nouveau webhook ne reçoit que les événements postérieurs à son
+        # enregistrement
+        if self._state.adding and not self.last_event_id:
+            latest = OutboxEvent.objects.order_by('-id').values_list('id', flat=True)
+            self.last_event_id = latest.first() or 0
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return self.url
+
+
+class OutboxEvent(models.Model):
+    """
+    Événement écrit dans la même transaction que la modification qu'il décrit
+    (transactional outbox). Le dispatcher les publie ensuite par lots.
+    """
+    ACTION_CREATED = 'created'
+    ACTION_UPDATED = 'updated'
+    ACTION_DELETED = 'deleted'
+
+    ACTIONS = [
+        (ACTION_CREATED, 'Created'),
+        (ACTION_UPDATED, 'Updated'),
+        (ACTION_DELETED, 'Deleted'),
+    ]
+
+    model = models.CharField(max_length=20, help_text="Type d'objet (issue, comment)")
+    object_id = models.CharField(max_length=36, help_text="Identifiant de l'objet")
+    # Simple entier et non clé étrangère : l'événement doit survivre à la
+    # suppression du projet pour pouvoir être publié.
+    project_id = models.BigIntegerField(help_text="Projet concerné")
+    action = models.CharField(max_length=7, choices=ACTIONS)
+    payload = models.JSONField(default=dict, help_text="Représentation de l'objet")
+    created_time = models.DateTimeField(auto_now_add=True)
+    # Renseignée une fois l'événement traité par tous les webhooks concernés
+    dispatched_time = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['dispatched_time', 'id'], name='outbox_pending_idx'
+            ),
+            models.Index(fields=['project_id', 'id'], name='outbox_project_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.model} {self.object_id} {self.action}"
+
+
+class DeadLetter(models.Model):
+    """
+    Lot abandonné par le dispatcher après `MAX_ATTEMPTS` échecs de livraison
+    à un webhook. Les événements sont conservés tels qu'ils auraient été
+    envoyés, pour être rejoués ou analysés.
+    """
+    webhook = models.ForeignKey(
+        Webhook, related_name="dead_letters", on_delete=models.CASCADE
+    )
+    first_event_id = models.BigIntegerField(help_text="Premier événement du lot")
+    last_event_id = models.BigIntegerField(help_text="Dernier événement du lot")
+    events = models.JSONField(default=list, help_text="Événements non livrés")
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default='')
+    created_time = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.webhook} #{self.first_event_id}-{self.last_event_id}"
+
+
+class ChangeSequence(models.Model):
+    """
+    Compteur global et monotone des modifications, utilisé par la synchronisation
+    incrémentale. Une seule ligne ; son verrou en écriture ordonne les séquences
+    dans l'ordre de validation des transactions.
+    """
+    value = models.BigIntegerField(default=0)
+
+
+class Tombstone(models.Model):
+    """
+    Trace d'un objet supprimé, renvoyée aux clients qui synchronisent
+    depuis un curseur antérieur à la suppression.
+    """
+    model = models.CharField(
+        max_length=20, help_text="Type d'objet (project, issue, comment, contributor)"
+    )
+    object_id = models.CharField(max_length=36, help_text="Identifiant de l'objet")
+    project_id = models.BigIntegerField(help_text="Projet concerné")
+    change_seq = models.BigIntegerField(help_text="Séquence de la suppression")
+    deleted_time = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['project_id', 'change_seq'], name='tombstone_project_change_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.model} {self.object_id} supprimé"
+
+
+class Job(models.Model):
+    """
+    Tâche différée exécutée par le worker (python manage.py run_tasks).
+    `available_time` porte à la fois le retard demandé, le backoff entre deux
+    tentatives et le délai de visibilité d'une tâche en cours.
+    """
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+
+    STATUSES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    name = models.CharField(max_length=200, help_text="Nom de la tâche enregistrée")
+    args = models.JSONField(default=list, help_text="Arguments positionnels")
+    kwargs = models.JSONField(default=dict, help_text="Arguments nommés")
+    priority = models.SmallIntegerField(
+        default=0, help_text="Priorité (les plus élevées passent en premier)"
+    )
+    status = models.CharField(max_length=7, choices=STATUSES, default=STATUS_QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    available_time = models.DateTimeField(
+        default=timezone.now,
+        help_text="Date à partir de laquelle la tâche peut être prise par un worker"
+    )
+    last_error = models.TextField(blank=True, default='')
+    created_time = models.DateTimeField(auto_now_add=True)
+    finished_time = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['status', 'available_time'], name='job_available_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.status})"
@@ -0,0 +1,123 @@
+"""
+Résolution des ressources imbriquées (projet > issue > commentaire).
+
+Un seul SELECT charge l'objet demandé en vérifiant la hiérarchie de l'URL
+(l'issue appartient bien au projet, le commentaire à l'issue, aucun parent
+n'est supprimé) et annote `is_member` via une sous-requête EXISTS sur les
+contributeurs. Le résultat suffit
+à répondre 404 (objet absent ou hors de la hiérarchie) ou 403 (non membre).
+"""
+from django.db.models import BooleanField, Exists, ExpressionWrapper, OuterRef, Q
+from rest_framework.exceptions import NotFound, PermissionDenied
+
+from .models import Project, Issue, Comment
+from users.models import Contributor
+
+
+def annotate_membership(queryset, user, project_path=''):
+    """
+    Annote `is_member` : vrai si `user` est contributeur ou créateur du projet
+    atteint par `project_path` (vide pour un queryset de projets).
+    """
+    prefix = f'{project_path}__' if project_path else ''
+    is_contributor = Exists(
+        Contributor.objects.filter(
+            project_id=OuterRef(f'{project_path}_id' if project_path else 'pk'),
+            contributor=user,
+        )
+    )
+    return queryset.annotate(
+        is_member=ExpressionWrapper(
+            Q(**{f'{prefix}creator': user}) | Q(is_contributor),
+            output_field=BooleanField()
+        )
+    )
+
+
+def resolve_nested(user, project_id, issue_id=None, comment_id=None, queryset=None):
+    """
+    Retourne le projet, l'issue ou le commentaire désigné par la route, en
+    une requête. Lève NotFound si l'objet n'existe pas dans cette hiérarchie et
+    PermissionDenied si l'utilisateur n'est pas membre du projet.
+    """
+    if comment_id is not None:
+        queryset = Comment.objects.all() if queryset is None else queryset
+        queryset = annotate_membership(
+            queryset.filter(
+                pk=comment_id, issue_id=issue_id, issue__project_id=project_id,
+                issue__deleted_at__isnull=True,
+                issue__project__deleted_at__isnull=True
+            ),
+            user, 'issue__project'
+        )
+    elif issue_id is not None:
+        queryset = Issue.objects.all() if queryset is None else queryset
+        queryset = annotate_membership(
+            queryset.filter(
+                pk=issue_id, project_id=project_id,
+                project__deleted_at__isnull=True
+            ),
+            user, 'project'
+        )
+    else:
+        queryset = Project.objects.all() if queryset is None else queryset
+        queryset = annotate_membership(queryset.filter(pk=project_id), user)
+
+    obj = queryset.first()
+    if obj is None:
+        raise NotFound()
+    if not obj.is_member:
+        raise PermissionDenied("Vous n'êtes pas contributeur de ce projet.")
+    return obj
+
+
+class NestedResourceMixin:
+    """
+    Mixin de vue pour les routes imbriquées.
+
+    - `get_object()` résout l'objet de la route (`pk`) dans sa hiérarchie ;
+    - `get_parent()` résout le parent (projet pour les issues, issue pour les
+      commentaires) des vues de liste et de création.
+
+    `nested_level` indique la ressource servie : 'project', 'issue' ou 'comment'.
+    """
+    nested_level = 'project'
+
+    def get_lookup(self, level):
+        kwargs = self.kwargs
+        if level == 'project':
+            return {'project_id': kwargs.get('project_id', kwargs.get('pk'))}
+        if level == 'issue':
+            return {
+                'project_id': kwargs['project_id'],
+                'issue_id': kwargs.get('issue_id', kwargs.get('pk')),
+            }
+        return {
+            'project_id': kwargs['project_id'],
+            'issue_id': kwargs['issue_id'],
+            'comment_id': kwargs['pk'],
+        }
+
+    def get_object(self):
+        obj = resolve_nested(
+            self.request.user,
+            queryset=self.get_queryset(),
+            **self.get_lookup(self.nested_level)
+        )
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    def get_parent(self):
+        if not hasattr(self, '_nested_parent'):
+            level = 'project' if self.nested_level == 'issue' else 'issue'
+            # Le parent sert au filtrage et aux permissions : ses descriptions,
+            # potentiellement longues, ne sont pas lues.
+            if level == 'issue':
+                queryset = Issue.objects.select_related('project') \
+                    .defer('description', 'project__description')
+            else:
+                queryset = Project.objects.defer('description')
+            self._nested_parent = resolve_nested(
+                self.request.user, queryset=queryset, **self.get_lookup(level)
+            )
+        return self._nested_parent
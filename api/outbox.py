@@ -0,0 +1,294 @@
+"""
+Transactional outbox et dispatcher de webhooks pour les issues et commentaires.
+
+Les vues appellent `record_event` dans la transaction qui modifie l'objet :
+l'événement n'existe donc que si l'écriture a bien été validée. Le dispatcher
+(`python manage.py dispatch_outbox`) vide ensuite la table par lots, fusionne
+les événements successifs d'un même objet et les publie en POST vers les
+webhooks enregistrés, avec relances et backoff exponentiel.
+
+- Livraison par webhook : chaque webhook mémorise le dernier événement traité
+  (`last_event_id`) et reçoit les événements suivants dans l'ordre de l'outbox.
+  Les identifiants sont attribués sous le verrou d'écriture de SQLite, donc
+  dans l'ordre de validation des transactions.
+- Prise en charge : comme pour la file de tâches (api.jobs), une mise à jour
+  conditionnelle sur (id, last_event_id, attempts) réserve le webhook pendant
+  `VISIBILITY_TIMEOUT` secondes ; deux dispatchers n'envoient pas le même lot.
+- Relances : une seule tentative d'envoi par prise en charge. Après un échec,
+  le webhook n'est repris qu'une fois son backoff exponentiel écoulé
+  (`available_time`) ; le dispatcher passe entre-temps aux autres webhooks.
+- Abandon : après `MAX_ATTEMPTS` échecs, le lot est enregistré comme
+  `DeadLetter` et le webhook passe aux événements suivants.
+"""
+import json
+import logging
+import urllib.error
+import urllib.request
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from .events import publish_event
+from .models import OutboxEvent, Webhook, DeadLetter, Issue, Comment
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'BATCH_SIZE': 500,
+    'MAX_ATTEMPTS': 10,
+    'BACKOFF': 0.5,
+    'MAX_BACKOFF': 300,
+    'TIMEOUT': 5,
+    'VISIBILITY_TIMEOUT': 300,
+}
+
+
+def get_setting(name):
+    """Retourne un paramètre du dispatcher (surchargeable via OUTBOX_DISPATCHER)."""
+    return getattr(settings, 'OUTBOX_DISPATCHER', {}).get(name, DEFAULTS[name])
+
+
+def record_event(instance, action, payload=None):
+    """
+    Enregistre un événement pour une issue ou un commentaire.
+    Doit être appelé dans la transaction qui modifie l'objet ; l'événement est
+    diffusé aux flux SSE du projet une fois la transaction validée.
+    """
+    if isinstance(instance, Issue):
+        model, project_id = 'issue', instance.project_id
+    elif isinstance(instance, Comment):
+        model, project_id = 'comment', instance.issue.project_id
+    else:
+        raise TypeError(f"Type d'objet non supporté : {type(instance).__name__}")
+
+    if payload is None:
+        payload = {'id': instance.pk}
+    # Normalise le payload (UUID, dates...) pour le champ JSON
+    payload = json.loads(json.dumps(payload, cls=DjangoJSONEncoder))
+    event = OutboxEvent.objects.create(
+        model=model,
+        object_id=str(instance.pk),
+        project_id=project_id,
+        action=action,
+        payload=payload,
+    )
+    transaction.on_commit(lambda: publish_event(event))
+    return event
+
+
+def record_issue_events(issues, action, payloads):
+    """
+    Variante groupée de `record_event` pour les issues modifiées par une mise
+    à jour ensembliste : un seul INSERT pour tous les événements.
+    """
+    payloads = json.loads(json.dumps(list(payloads), cls=DjangoJSONEncoder))
+    events = OutboxEvent.objects.bulk_create([
+        OutboxEvent(
+            model='issue',
+            object_id=str(issue.pk),
+            project_id=issue.project_id,
+            action=action,
+            payload=payload,
+        )
+        for issue, payload in zip(issues, payloads)
+    ])
+    transaction.on_commit(lambda: [publish_event(event) for event in events])
+    return events
+
+
+def coalesce(events):
+    """
+    Fusionne les événements successifs d'un même objet :
+    - plusieurs mises à jour ne produisent que la dernière ;
+    - une création suivie de mises à jour reste une création avec le dernier état ;
+    - une suppression l'emporte, et une création suivie d'une suppression
+      dans le même lot disparaît complètement.
+    L'ordre de première apparition des objets est conservé.
+    """
+    merged = {}
+    for event in events:
+        key = (event.model, event.object_id)
+        previous = merged.get(key)
+        if previous is None:
+            merged[key] = {
+                'id': event.id,
+                'model': event.model,
+                'object_id': event.object_id,
+                'project_id': event.project_id,
+                'action': event.action,
+                'payload': event.payload,
+            }
+            continue
+
+        previous['id'] = event.id
+        if event.action == OutboxEvent.ACTION_DELETED:
+            if previous['action'] == OutboxEvent.ACTION_CREATED:
+                previous['action'] = None  # Objet jamais vu par les webhooks
+            else:
+                previous['action'] = OutboxEvent.ACTION_DELETED
+            previous['payload'] = event.payload
+        elif previous['action'] is None:
+            # Identifiant réutilisé après une suppression dans le même lot
+            previous['action'] = event.action
+            previous['payload'] = event.payload
+        else:
+            if previous['action'] != OutboxEvent.ACTION_CREATED:
+                previous['action'] = event.action
+            previous['payload'] = event.payload
+
+    return [item for item in merged.values() if item['action'] is not None]
+
+
+def post_json(url, body, timeout):
+    """Envoie `body` en JSON à `url` et lève une exception en cas d'échec HTTP."""
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(body, cls=DjangoJSONEncoder).encode('utf-8'),
+        headers={'Content-Type': 'application/json'},
+        method='POST',
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return response.status
+
+
+def deliver(webhook, events, sender=post_json):
+    """
+    Publie un lot vers un webhook, en une seule tentative : les relances sont
+    planifiées par `dispatch_webhook` (backoff enregistré sur le webhook), sans
+    retenir les autres webhooks. Retourne None si le lot a été accepté, sinon
+    l'erreur rencontrée.
+    """
+    try:
+        sender(webhook.url, {'events': events}, get_setting('TIMEOUT'))
+    except (urllib.error.URLError, OSError, ValueError) as exc:
+        logger.warning(
+            f"Échec de l'envoi au webhook {webhook.url} "
+            f"(tentative {webhook.attempts}/{get_setting('MAX_ATTEMPTS')}) : {exc}"
+        )
+        return f"{type(exc).__name__}: {exc}"
+    return None
+
+
+def pending_events(webhook, limit):
+    """Événements que `webhook` n'a pas encore traités, dans l'ordre de l'outbox."""
+    events = OutboxEvent.objects.filter(id__gt=webhook.last_event_id)
+    if webhook.project_id is not None:
+        events = events.filter(project_id=webhook.project_id)
+    return list(events.order_by('id')[:limit])
+
+
+def claim(limit=None):
+    """
+    Réserve les webhooks actifs qui ont des événements en attente.
+    Retourne une liste de couples (webhook, lot d'événements).
+    """
+    limit = limit or get_setting('BATCH_SIZE')
+    now = timezone.now()
+    candidates = Webhook.objects.filter(
+        is_active=True, available_time__lte=now
+    ).order_by('available_time', 'id')
+
+    claimed = []
+    for webhook in candidates:
+        events = pending_events(webhook, limit)
+        if not events:
+            continue
+        # Le lot lu reste valable tant que le curseur n'a pas bougé
+        reserved = Webhook.objects.filter(
+            pk=webhook.pk,
+            last_event_id=webhook.last_event_id,
+            attempts=webhook.attempts,
+            available_time__lte=now,
+        ).update(
+            attempts=webhook.attempts + 1,
+            available_time=now + timedelta(
+                seconds=get_setting('VISIBILITY_TIMEOUT')
+            ),
+        )
+        if reserved:
+            webhook.attempts += 1
+            claimed.append((webhook, events))
+    return claimed
+
+
+def dispatch_webhook(webhook, events, sender=post_json):
+    """
+    Livre un lot réservé par `claim` et met à jour l'état du webhook.
+    Retourne le nombre d'événements traités.
+    """
+    coalesced = coalesce(events)
+    error = None
+    if coalesced:
+        error = deliver(webhook, coalesced, sender=sender)
+    now = timezone.now()
+    # Sans effet si le webhook a été repris par un autre dispatcher entre-temps
+    current = Webhook.objects.filter(
+        pk=webhook.pk,
+        last_event_id=webhook.last_event_id,
+        attempts=webhook.attempts,
+    )
+    if error is None:
+        current.update(
+            last_event_id=events[-1].id, attempts=0, available_time=now, last_error=''
+        )
+        return len(events)
+
+    if webhook.attempts >= get_setting('MAX_ATTEMPTS'):
+        with transaction.atomic():
+            abandoned = current.update(
+                last_event_id=events[-1].id, attempts=0, available_time=now,
+                last_error=error,
+            )
+            if abandoned:
+                DeadLetter.objects.create(
+                    webhook=webhook,
+                    first_event_id=events[0].id,
+                    last_event_id=events[-1].id,
+                    events=json.loads(json.dumps(coalesced, cls=DjangoJSONEncoder)),
+                    attempts=webhook.attempts,
+                    last_error=error,
+                )
+        logger.error(
+            f"Lot #{events[0].id}-{events[-1].id} abandonné pour le webhook "
+            f"{webhook.url} après {webhook.attempts} tentatives : {error}"
+        )
+        return 0
+
+    backoff = min(
+        get_setting('BACKOFF') * 2 ** webhook.attempts, get_setting('MAX_BACKOFF')
+    )
+    current.update(available_time=now + timedelta(seconds=backoff), last_error=error)
+    return 0
+
+
+def mark_dispatched():
+    """Date les événements déjà traités par tous les webhooks actifs concernés."""
+    waiting = Webhook.objects.filter(
+        is_active=True, last_event_id__lt=OuterRef('id')
+    ).filter(Q(project__isnull=True) | Q(project_id=OuterRef('project_id')))
+    return OutboxEvent.objects.filter(dispatched_time__isnull=True) \
+        .filter(~Exists(waiting)) \
+        .update(dispatched_time=timezone.now())
+
+
+def dispatch_batch(batch_size=None, sender=post_json):
+    """
+    Publie un lot d'événements en attente par webhook. Retourne le nombre
+    d'événements livrés.
+
+    Chaque webhook avance son propre curseur dans l'outbox : un webhook en
+    échec ne bloque ni ne fait rejouer les autres, et ne reçoit aucun
+    événement plus récent tant que son lot en cours n'est pas livré ou
+    abandonné, ce qui préserve l'ordre des événements d'un même objet.
+    La livraison est « au moins une fois » : les identifiants d'événements
+    permettent aux destinataires de dédupliquer.
+    """
+    count = 0
+    for webhook, events in claim(batch_size):
+        count += dispatch_webhook(webhook, events, sender=sender)
+    mark_dispatched()
+    return count
@@ -15,6 +15,12 @@ class IsContributor(permissions.BasePermission):
         Retourne True si l'utilisateur est contributeur ou créateur du projet associé.
         """
 
+        # Objet résolu par `resolve_nested` : l'appartenance est déjà calculée
+        # dans la requête qui l'a chargé.
+        is_member = getattr(obj, 'is_member', None)
+        if is_member is not None:
+            return is_member
+
         # Détermine le projet associé en fonction de l'objet reçu
         if isinstance(obj, Project):
             project = obj
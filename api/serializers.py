@@ -1,12 +1,117 @@
+import copy
+from collections import namedtuple
 from rest_framework import serializers
+from .assignment import resolve_assignee
+from .concurrency import conditional_update
 from .models import Project, Issue, Comment
-from users.models import Contributor
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
+# Relation intégrable via ?expand= : nom de la relation, serializer imbriqué et
+# fabrique du queryset préchargé (tronqué au plafond d'intégration).
+Expansion = namedtuple('Expansion', ['relation', 'serializer', 'queryset'])
 
-class ProjectSerializer(serializers.ModelSerializer):
+
+def expanded_attr(name):
+    """Attribut recevant les objets préchargés d'une relation intégrée."""
+    return f'expanded_{name}'
+
+
+class CachedFieldsModelSerializer(serializers.ModelSerializer):
+    """
+    ModelSerializer dont le schéma de champs (champs déclarés et champs déduits
+    du modèle) n'est construit qu'une fois par classe. Chaque instance reçoit
+    ensuite des copies superficielles de ces champs, liées à elle seule, au lieu
+    de refaire l'introspection du modèle et les deepcopy de DRF.
+
+    Le schéma mis en cache ne doit dépendre ni du contexte ni de l'instance :
+    les champs qui en dépendent sont ajoutés ou filtrés par un `get_fields()`
+    placé au-dessus dans le MRO (voir `SparseFieldsMixin`).
+    """
+    _field_schemas = {}
+
+    @classmethod
+    def get_field_schema(cls, serializer):
+        schema = cls._field_schemas.get(cls)
+        if schema is None:
+            schema = super(CachedFieldsModelSerializer, serializer).get_fields()
+            cls._field_schemas[cls] = schema
+        return schema
+
+    def get_fields(self):
+        fields = {}
+        for name, field in self.get_field_schema(self).items():
+            if isinstance(field, serializers.BaseSerializer):
+                # Un serializer imbriqué porte un état (child, champs liés)
+                fields[name] = copy.deepcopy(field)
+                continue
+            field = copy.copy(field)
+            if hasattr(field, '_validators'):
+                field._validators = list(field._validators)
+            fields[name] = field
+        return fields
+
+
+class ConditionalUpdateMixin:
+    """
+    Rend la mise à jour conditionnelle lorsque la vue place les versions
+    attendues (`If-Match`) dans le contexte, sous la clé `if_match`.
+    """
+
+    def update(self, instance, validated_data):
+        versions = self.context.get('if_match')
+        if versions is None:
+            return super().update(instance, validated_data)
+        return conditional_update(instance, validated_data, versions)
+
+
+class SparseFieldsMixin:
+    """
+    Restreint la représentation aux champs demandés via `?fields=` et intègre
+    les relations demandées via `?expand=`. Les valeurs sont lues dans le
+    contexte (`fields`, `expand`) et ne s'appliquent qu'à la ressource de
+    premier niveau, jamais aux serializers imbriqués.
+
+    `sparse_fields` associe chaque champ sélectionnable aux colonnes ORM
+    nécessaires à son rendu, utilisées par les vues pour `.only()`. Les champs
+    de `detail_only_fields` sont omis des représentations résumées des listes
+    (contexte `summary`).
+    """
+    sparse_fields = {}
+    detail_only_fields = ()
+
+    def is_top_level(self):
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        return parent is None
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if not self.is_top_level():
+            return fields
+
+        expand = self.context.get('expand') or {}
+        for name, expansion in expand.items():
+            fields[name] = expansion.serializer(
+                source=expanded_attr(name), many=True, read_only=True
+            )
+
+        if self.context.get('summary'):
+            for name in self.detail_only_fields:
+                fields.pop(name, None)
+
+        requested = self.context.get('fields')
+        if requested:
+            keep = set(requested) | set(expand)
+            fields = {name: field for name, field in fields.items() if name in keep}
+        return fields
+
+
+class ProjectSerializer(
+    SparseFieldsMixin, ConditionalUpdateMixin, CachedFieldsModelSerializer
+):
     """
     Serializer pour le modèle Project, incluant le créateur,
     les contributeurs et un format personnalisé pour la date de création.
@@ -28,25 +133,48 @@ class ProjectSerializer(serializers.ModelSerializer):
         help_text="Titre du projet"
     )
 
+    sparse_fields = {
+        'id': ('id',),
+        'title': ('title',),
+        'description': ('description',),
+        'description_excerpt': ('description_excerpt',),
+        'type': ('type',),
+        'creator': ('creator__username',),
+        'contributors': (),
+        'created_time': ('created_time',),
+    }
+    # Texte complet réservé au détail ; les listes servent l'extrait
+    detail_only_fields = ('description',)
+
     class Meta:
         model = Project
-        fields = '__all__'
+        # Champs internes, comme pour les issues et commentaires : marqueur de
+        # suppression différée, version (exposée dans l'en-tête ETag) et
+        # séquence de modification (curseur servi par /changes/)
+        exclude = ('deleted_at', 'version', 'change_seq')
 
     def get_creator(self, instance):
         """Retourne le username du créateur du projet."""
         return instance.creator.username
 
     def get_contributors(self, instance):
-        """Retourne une liste des usernames des contributeurs associés au projet."""
-        contributors = Contributor.objects.filter(project=instance)
-        return [contributor.contributor.username for contributor in contributors]
+        """
+        Retourne une liste des usernames des contributeurs associés au projet.
+        Utilise `contributor_set` préchargé par les vues lorsqu'il l'est.
+        """
+        return [
+            contributor.contributor.username
+            for contributor in instance.contributor_set.all()
+        ]
 
     def get_created_time(self, obj):
         """Formate la date de création au format jour/mois/année heure:minute."""
         return obj.created_time.strftime('%d %B %Y, %H:%M')
 
 
-class IssueSerializer(serializers.ModelSerializer):
+class IssueSerializer(
+    SparseFieldsMixin, ConditionalUpdateMixin, CachedFieldsModelSerializer
+):
     """
     Serializer pour le modèle Issue, incluant des champs pour l'assignee et le créateur.
     Permet de spécifier l'assignee par son username.
@@ -55,7 +183,7 @@ class IssueSerializer(serializers.ModelSerializer):
         help_text="Date de création formatée"
     )
     project = serializers.ReadOnlyField(
-        source='project.id',
+        source='project_id',
         help_text="ID du projet associé"
     )
     assignee = serializers.CharField(
@@ -86,11 +214,31 @@ class IssueSerializer(serializers.ModelSerializer):
         help_text="Description détaillée de l'issue"
     )
 
+    sparse_fields = {
+        'id': ('id',),
+        'title': ('title',),
+        'description': ('description',),
+        'description_excerpt': ('description_excerpt',),
+        'project': ('project',),
+        'creator_name': ('creator__username',),
+        'priority': ('priority',),
+        'tag': ('tag',),
+        'status': ('status',),
+        'created_time': ('created_time',),
+        'assignee_username': ('assignee__username',),
+    }
+    # Texte complet réservé au détail ; les listes servent l'extrait
+    detail_only_fields = ('description',)
+
+    # À incrémenter quand la représentation change (cache de fragments)
+    fragment_version = 2
+
     class Meta:
         model = Issue
         fields = [
-            'id', 'title', 'description', 'project', 'creator_name',
-            'priority', 'tag', 'status', 'created_time', 'assignee', 'assignee_username'
+            'id', 'title', 'description', 'description_excerpt', 'project',
+            'creator_name', 'priority', 'tag', 'status', 'created_time', 'assignee',
+            'assignee_username'
         ]
 
     def get_creator(self, instance):
@@ -100,35 +248,28 @@ class IssueSerializer(serializers.ModelSerializer):
         """Formate la date de création au format jour/mois/année heure:minute."""
         return obj.created_time.strftime('%d %B %Y, %H:%M')
 
+    def get_project(self):
+        """Projet de l'issue : celui de l'instance ou celui fourni par la vue."""
+        if self.instance is not None and not isinstance(self.instance, list):
+            return self.instance.project
+        return self.context['project']
+
     def validate_assignee(self, value):
-        """Vérifie que l'assignee existe bien en base de données."""
-        try:
-            user = User.objects.get(username=value)  # Recherche par username
-            return user
-        except User.DoesNotExist:
-            raise serializers.ValidationError(
-                "Utilisateur avec ce username n'existe pas."
-            )
+        """
+        Résout l'assignee et vérifie qu'il est contributeur du projet, en une
+        requête mémorisée pour la durée de la requête HTTP.
+        """
+        return resolve_assignee(self.get_project(), value, self.context.get('request'))
 
     def create(self, validated_data):
-        """Crée une issue en assignant le créateur actuel et en validant l'assignee."""
-        assignee_username = validated_data.pop('assignee', None)
-        if assignee_username:
-            validated_data['assignee'] = self.validate_assignee(assignee_username)
-
+        """Crée une issue en assignant le créateur actuel."""
         validated_data['creator'] = self.context['request'].user
         return super().create(validated_data)
 
-    def update(self, instance, validated_data):
-        """Met à jour l'issue et assigne l'assignee si spécifié."""
-        assignee_username = validated_data.pop('assignee', None)
-        if assignee_username:
-            validated_data['assignee'] = self.validate_assignee(assignee_username)
-
-        return super().update(instance, validated_data)
-
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(
+    SparseFieldsMixin, ConditionalUpdateMixin, CachedFieldsModelSerializer
+):
     """
     Serializer pour le modèle Comment, incluant le créateur et la date de création
     formatée.
@@ -152,6 +293,17 @@ class CommentSerializer(serializers.ModelSerializer):
         help_text="Contenu du commentaire"
     )
 
+    sparse_fields = {
+        'id': ('id',),
+        'content': ('content',),
+        'issue': ('issue__id',),
+        'creator_name': ('creator__username',),
+        'created_time': ('created_time',),
+    }
+
+    # À incrémenter quand la représentation change (cache de fragments)
+    fragment_version = 1
+
     class Meta:
         model = Comment
         fields = ['id', 'content', 'issue', 'creator_name', 'created_time']
@@ -168,3 +320,63 @@ class CommentSerializer(serializers.ModelSerializer):
         request = self.context.get('request')
         validated_data['creator'] = request.user
         return super().create(validated_data)
+
+
+class IssueSelectionSerializer(serializers.Serializer):
+    """Filtre de sélection des issues d'une transition groupée."""
+    status = serializers.ListField(
+        child=serializers.ChoiceField(choices=Issue.STATUSES),
+        required=False,
+        allow_empty=False
+    )
+    priority = serializers.ListField(
+        child=serializers.ChoiceField(choices=Issue.PRIORITIES),
+        required=False,
+        allow_empty=False
+    )
+    tag = serializers.ListField(
+        child=serializers.ChoiceField(choices=Issue.TAGS),
+        required=False,
+        allow_empty=False
+    )
+
+
+class IssueTransitionSerializer(serializers.Serializer):
+    """
+    Transition groupée : les issues désignées par `ids` ou par `filter` reçoivent
+    les nouvelles valeurs de `status`, `priority`, `tag` et/ou `assignee`
+    (username, ou null pour désassigner).
+    """
+    MAX_IDS = 1000
+    CHANGES = ('status', 'priority', 'tag', 'assignee')
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        required=False,
+        allow_empty=False,
+        max_length=MAX_IDS
+    )
+    filter = IssueSelectionSerializer(required=False)
+    status = serializers.ChoiceField(choices=Issue.STATUSES, required=False)
+    priority = serializers.ChoiceField(choices=Issue.PRIORITIES, required=False)
+    tag = serializers.ChoiceField(choices=Issue.TAGS, required=False)
+    assignee = serializers.CharField(required=False, allow_null=True)
+
+    def validate_assignee(self, value):
+        if value is None:
+            return None
+        return resolve_assignee(
+            self.context['project'], value, self.context.get('request')
+        )
+
+    def validate(self, attrs):
+        if ('ids' in attrs) == ('filter' in attrs):
+            raise serializers.ValidationError(
+                "Indiquez soit `ids`, soit `filter`."
+            )
+        if not any(name in attrs for name in self.CHANGES):
+            raise serializers.ValidationError(
+                "Indiquez au moins une valeur à modifier "
+                "(status, priority, tag ou assignee)."
+            )
+        return attrs
@@ -0,0 +1,184 @@
+"""
+Regroupement des lectures concurrentes identiques (« single flight »).
+
+Quand plusieurs requêtes GET identiques (même chemin, mêmes paramètres, même
+portée de permission) arrivent en même temps, une seule — la meneuse — exécute
+la vue ; les autres attendent et reçoivent une copie de sa réponse. Cela évite
+qu'une entrée de cache expirée sur un projet populaire ne déclenche des dizaines
+de recalculs simultanés.
+
+- Dans un processus, l'attente passe par un `threading.Event`.
+- Entre workers (`CROSS_PROCESS`), un verrou court est posé dans le cache
+  (`cache.add`) ; la meneuse y dépose le résultat et l'identifiant de son
+  calcul avant de libérer le verrou. Les autres workers suivent cet
+  identifiant jusqu'à `WAIT_TIMEOUT` : ils ne recalculent que si la meneuse a
+  échoué (une nouvelle meneuse est alors élue) ou si le délai est dépassé.
+
+La portée de permission fait partie de la clé : une liste n'est regroupée
+qu'après la vérification d'appartenance au projet parent, que la vue réutilise
+ensuite ; le détail d'un projet n'est regroupé qu'entre requêtes du même
+utilisateur, sa permission étant vérifiée par la vue elle-même.
+"""
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.response import Response
+
+DEFAULTS = {
+    'ENABLED': True,
+    'CROSS_PROCESS': False,
+    'CACHE_ALIAS': 'default',
+    'LOCK_TIMEOUT': 5,
+    'WAIT_TIMEOUT': 5,
+    'POLL_INTERVAL': 0.02,
+}
+
+
+def get_setting(name):
+    """Retourne un paramètre du regroupement (surchargeable via SINGLE_FLIGHT)."""
+    return getattr(settings, 'SINGLE_FLIGHT', {}).get(name, DEFAULTS[name])
+
+
+class Call:
+    """Calcul en cours partagé par la meneuse et ses suiveuses."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """Groupe de calculs en cours, indexés par clé, pour un processus."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+
+    def do(self, key, function):
+        """
+        Exécute `function` pour `key`, ou attend le calcul déjà en cours pour la
+        même clé. Retourne (résultat, partagé).
+        """
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = Call()
+            else:
+                call.followers += 1
+
+        if not leader:
+            if not call.done.wait(get_setting('WAIT_TIMEOUT')):
+                return function(), False
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = function()
+        except Exception as exc:
+            call.error = exc
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call.done.set()
+        return call.result, False
+
+
+group = SingleFlight()
+
+
+def run_across_workers(key, function):
+    """
+    Variante inter-processus : la meneuse pose un verrou dans le cache et y
+    dépose son résultat ; les autres workers l'attendent au plus WAIT_TIMEOUT.
+    """
+    cache = caches[get_setting('CACHE_ALIAS')]
+    timeout = get_setting('LOCK_TIMEOUT')
+    lock_key = f'singleflight:lock:{key}'
+    # Dernier calcul terminé : un worker arrivé pendant le calcul de la meneuse
+    # le retrouve même si le verrou a déjà été libéré.
+    last_key = f'singleflight:last:{key}'
+    deadline = time.monotonic() + get_setting('WAIT_TIMEOUT')
+
+    while time.monotonic() < deadline:
+        token = uuid.uuid4().hex
+        if cache.add(lock_key, token, timeout):
+            try:
+                result = function()
+            except Exception:
+                cache.delete(lock_key)
+                raise
+            cache.set(f'singleflight:result:{token}', result, timeout)
+            cache.set(last_key, token, timeout)
+            cache.delete(lock_key)
+            return result
+
+        while time.monotonic() < deadline:
+            leader_token = cache.get(lock_key) or cache.get(last_key)
+            if leader_token is None:
+                break  # Meneuse en échec : nouvelle élection
+            result = cache.get(f'singleflight:result:{leader_token}')
+            if result is not None:
+                return result
+            time.sleep(get_setting('POLL_INTERVAL'))
+    return function()
+
+
+class SingleFlightMixin:
+    """
+    Mixin de vue regroupant les GET concurrents identiques des membres d'un
+    même projet. La réponse partagée est recopiée pour chaque requête : seuls
+    ses données, son code HTTP et ses en-têtes (ETag) circulent entre les
+    requêtes.
+    """
+
+    def get_singleflight_scope(self):
+        """
+        Portée de permission de la requête, calculée sans requête dédiée :
+
+        - vue de liste imbriquée : le parent résolu par `get_parent()`, qui
+          vérifie l'appartenance dans la requête qui le charge et reste en
+          cache pour la vue (un non-membre reçoit directement son 403) ;
+        - projet servi lui-même : le projet et l'utilisateur, la vue vérifiant
+          l'appartenance au chargement de l'objet.
+
+        None si la requête ne doit pas être regroupée.
+        """
+        if self.nested_level == 'project':
+            project_id = self.get_lookup('project')['project_id']
+            return f'project:{project_id}:user:{self.request.user.pk}'
+        parent = self.get_parent()
+        return f'{parent._meta.model_name}:{parent.pk}'
+
+    def get_singleflight_key(self):
+        scope = self.get_singleflight_scope()
+        if scope is None:
+            return None
+        query = sorted(self.request.query_params.lists())
+        return f'{self.request.path}|{query}|{scope}'
+
+    def get(self, request, *args, **kwargs):
+        key = get_setting('ENABLED') and self.get_singleflight_key()
+        if not key:
+            return super().get(request, *args, **kwargs)
+
+        def compute():
+            response = super(SingleFlightMixin, self).get(request, *args, **kwargs)
+            headers = dict(response.items())
+            headers.pop('Content-Type', None)
+            return response.data, response.status_code, headers
+
+        if get_setting('CROSS_PROCESS'):
+            data, status_code, headers = group.do(
+                key, lambda: run_across_workers(key, compute)
+            )[0]
+        else:
+            data, status_code, headers = group.do(key, compute)[0]
+        return Response(data, status=status_code, headers=headers)
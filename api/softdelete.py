@@ -0,0 +1,147 @@
+"""
+Suppression logique des projets et des issues.
+
+La requête de suppression ne fait que marquer l'objet (`deleted_at`), lui
+attribuer sa tombstone et planifier sa purge : elle répond immédiatement, quel
+que soit le volume d'issues et de commentaires dépendants. Les managers par
+défaut masquent les objets supprimés.
+
+Pendant `UNDO_WINDOW` secondes, le créateur peut restaurer l'objet. Passé ce
+délai, la tâche de purge supprime les lignes dépendantes par lots de
+`PURGE_CHUNK_SIZE`, un lot par transaction, en se replanifiant jusqu'à ce que
+l'objet lui-même puisse être supprimé : les autres écritures ne sont jamais
+bloquées longtemps.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .changes import TRACKED_MODELS, create_tombstone, next_change_seq
+from .jobs import enqueue, task
+from .models import Project, Issue, Comment, Tombstone
+from users.models import Contributor
+
+DEFAULTS = {
+    'UNDO_WINDOW': 3600,
+    'PURGE_CHUNK_SIZE': 500,
+}
+
+
+def get_setting(name):
+    """Retourne un paramètre de la suppression logique (via SOFT_DELETE)."""
+    return getattr(settings, 'SOFT_DELETE', {}).get(name, DEFAULTS[name])
+
+
+def restore_deadline(instance):
+    """Date limite de restauration d'un objet supprimé."""
+    return instance.deleted_at + timedelta(seconds=get_setting('UNDO_WINDOW'))
+
+
+def can_restore(instance):
+    return timezone.now() < restore_deadline(instance)
+
+
+@transaction.atomic
+def soft_delete(instance):
+    """Marque un projet ou une issue comme supprimé et planifie sa purge."""
+    instance.deleted_at = timezone.now()
+    instance.save(update_fields=['deleted_at', 'change_seq', 'version'])
+    create_tombstone(instance)
+    enqueue(
+        PURGE_TASKS[type(instance)],
+        args=[instance.pk],
+        delay=get_setting('UNDO_WINDOW')
+    )
+
+
+def dependents(instance):
+    """Objets suivis masqués avec un projet ou une issue supprimés."""
+    if isinstance(instance, Project):
+        return [
+            Issue.objects.filter(project=instance),
+            Comment.objects.filter(
+                issue__project=instance, issue__deleted_at__isnull=True
+            ),
+            Contributor.objects.filter(project=instance),
+        ]
+    return [Comment.objects.filter(issue=instance)]
+
+
+@transaction.atomic
+def restore(instance):
+    """
+    Annule la suppression d'un objet ; la purge planifiée devient sans effet.
+
+    Un client synchronisé entre la suppression et la restauration a reçu la
+    tombstone et oublié les objets dépendants : ceux-ci reçoivent une nouvelle
+    séquence (une requête par table) pour lui être renvoyés.
+    """
+    instance.deleted_at = None
+    instance.save(update_fields=['deleted_at', 'change_seq', 'version'])
+    Tombstone.objects.filter(
+        model=TRACKED_MODELS[type(instance)], object_id=str(instance.pk)
+    ).delete()
+    # Contenu inchangé : ni version ni updated_time, seulement la séquence
+    change_seq = next_change_seq()
+    for queryset in dependents(instance):
+        queryset.update(change_seq=change_seq)
+
+
+def delete_chunk(querysets):
+    """
+    Supprime un lot de lignes de la première table non vide. Retourne False
+    lorsque toutes les tables sont vides.
+    """
+    size = get_setting('PURGE_CHUNK_SIZE')
+    for queryset in querysets:
+        ids = list(queryset.values_list('pk', flat=True)[:size])
+        if ids:
+            # Ni signaux ni cascade : les lignes n'ont plus de dépendants et la
+            # tombstone de l'objet supprimé couvre déjà leur disparition.
+            chunk = queryset.model._base_manager.filter(pk__in=ids)
+            chunk._raw_delete(chunk.db)
+            return True
+    return False
+
+
+def purge(model, pk, purge_task, dependents):
+    """
+    Exécute une étape de purge de l'objet `pk` : attend la fin du délai
+    d'annulation, supprime un lot de dépendants, puis l'objet lui-même.
+    """
+    instance = model.all_objects.filter(pk=pk, deleted_at__isnull=False).first()
+    if instance is None:
+        return  # Restauré ou déjà purgé
+    remaining = (restore_deadline(instance) - timezone.now()).total_seconds()
+    if remaining > 0:
+        # Supprimé à nouveau après une restauration : nouvelle échéance
+        enqueue(purge_task, args=[pk], delay=remaining)
+    elif delete_chunk(dependents):
+        enqueue(purge_task, args=[pk])
+    else:
+        instance.delete()
+
+
+@task(priority=-10)
+def purge_project(project_id):
+    """Purge un projet supprimé, ses issues et leurs commentaires."""
+    purge(Project, project_id, purge_project, [
+        Comment.objects.filter(issue__project_id=project_id),
+        Issue.all_objects.filter(project_id=project_id),
+    ])
+
+
+@task(priority=-10)
+def purge_issue(issue_id):
+    """Purge une issue supprimée et ses commentaires."""
+    purge(Issue, issue_id, purge_issue, [
+        Comment.objects.filter(issue_id=issue_id),
+    ])
+
+
+PURGE_TASKS = {
+    Project: purge_project,
+    Issue: purge_issue,
+}
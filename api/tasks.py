@@ -0,0 +1,6 @@
+"""
+Tâches différées de l'application api (voir api.jobs).
+"""
+from .softdelete import purge_issue, purge_project
+
+__all__ = ['purge_issue', 'purge_project']
@@ -1,8 +1,37 @@
+import json
+import multiprocessing
+import tempfile
+import threading
+import time
+import uuid
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+from asgiref.sync import async_to_sync
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import IntegrityError, connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from rest_framework.test import APIClient
-from rest_framework import status
-from .models import Project, Issue, Comment
+from rest_framework import serializers, status
+from .models import (
+    Project, Issue, Comment, OutboxEvent, Webhook, Job, Tombstone, EXCERPT_LENGTH,
+    make_excerpt, ChangeSequence, DeadLetter
+)
+from users.models import Contributor
+from .changes import batched_tombstones
+from .outbox import dispatch_batch
+from .serializers import IssueSerializer
+from .ids import uuid7, uuid7_timestamp
+from . import fragments, jobs, outbox, singleflight
+from .admin_utils import EstimatedCountPaginator, estimate_count
+from .events import InMemoryBroker, stream_events
+from softdesk_api.profiling import make_profile_token
+from softdesk_api import metrics, profiling, slow_queries
 
 
 User = get_user_model()
@@ -51,6 +80,35 @@ class ProjectTests(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn("Test Project", str(response.data))
 
+    def test_project_list_uses_membership_index(self):
+        # Pas de OR ni de DISTINCT : la liste se lit dans l'index des membres
+        Project.objects.create(
+            title="Shared Project", description="Description", type="back-end",
+            creator=self.user2
+        ).contributor_set.create(contributor=self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/projects/")
+        self.assertEqual(response.data['data']['count'], 2)
+        sql = " ".join(query['sql'] for query in queries.captured_queries)
+        self.assertNotIn("DISTINCT", sql)
+        self.assertNotIn(" OR ", sql)
+
+    def test_project_list_contributors_are_prefetched(self):
+        # Le nombre de requêtes ne dépend pas du nombre de projets listés
+        for index in range(5):
+            project = Project.objects.create(
+                title=f"Project {index}", description="Description",
+                type="back-end", creator=self.user
+            )
+            project.contributor_set.create(contributor=self.user2)
+        with self.assertNumQueries(3):
+            response = self.client.get("/api/projects/")
+        project = response.data['data']['results'][0]
+        self.assertEqual(sorted(project['contributors']), ['user1', 'user2'])
+        self.assertEqual(
+            self.project.contributor_set.get().role, Contributor.ROLE_OWNER
+        )
+
     def test_project_detail_permissions(self):
         # Teste que seul le créateur ou un contributeur peut voir les détails
         self.client.force_authenticate(user=self.user2)
@@ -102,6 +160,42 @@ class IssueTests(TestCase):
             "Issue créée avec succès pour le projet."
         )
 
+    def test_assignee_is_validated_in_one_query(self):
+        member = User.objects.create_user(
+            username='member', email='member@example.com', age=25, password='pass123'
+        )
+        Contributor.objects.create(contributor=member, project=self.project)
+        User.objects.create_user(
+            username='outsider', email='outsider@example.com', age=25,
+            password='pass123'
+        )
+        data = {
+            "title": "New Issue", "description": "Issue description",
+            "priority": "HIGH", "tag": "BUG", "status": "To Do", "assignee": "member"
+        }
+        url = f"/api/projects/{self.project.id}/issues/create/"
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(url, data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['assignee_username'], 'member')
+        lookups = [q for q in queries if '"users_user"."username" IN' in q['sql']]
+        self.assertEqual(len(lookups), 1)
+
+        response = self.client.post(url, {**data, "assignee": "outsider"})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        response = self.client.post(url, {**data, "assignee": "ghost"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        detail = f"/api/projects/{self.project.id}/issues/{self.issue.id}/"
+        response = self.client.patch(detail, {"assignee": "outsider"})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        response = self.client.patch(detail, {"assignee": "ghost"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.patch(detail, {"assignee": "member"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.issue.refresh_from_db()
+        self.assertEqual(self.issue.assignee, member)
+
     def test_issue_list(self):
         # Teste la récupération des issues pour un projet
         response = self.client.get(f"/api/projects/{self.project.id}/issues/")
@@ -156,3 +250,1753 @@ class CommentTests(TestCase):
         )
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn("Test comment", str(response.data))
+
+
+class StubSender:
+    """Remplace `post_json` : enregistre les lots et simule les URL en panne."""
+
+    def __init__(self):
+        self.received = []
+        self.failing = set()
+        self.calls = 0
+
+    def __call__(self, url, body, timeout):
+        self.calls += 1
+        if url in self.failing:
+            raise ConnectionRefusedError("Connection refused")
+        self.received.append((url, body))
+        return 204
+
+    def events(self, url):
+        return [event for sent, body in self.received if sent == url
+                for event in body['events']]
+
+
+class OutboxTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='user1', email='user1@example.com', age=25, password='pass123'
+        )
+        self.project = Project.objects.create(
+            title="Test Project",
+            description="Description",
+            type="back-end",
+            creator=self.user
+        )
+        self.client.force_authenticate(user=self.user)
+        self.sender = StubSender()
+        # Les échecs simulés ne polluent pas la sortie des tests
+        silence = mock.patch.object(outbox.logger, 'disabled', True)
+        silence.start()
+        self.addCleanup(silence.stop)
+        self.webhook = Webhook.objects.create(
+            url="http://hooks.example.com/project", project=self.project
+        )
+
+    def dispatch(self):
+        return dispatch_batch(sender=self.sender)
+
+    def make_due(self):
+        # Simule l'écoulement du backoff
+        Webhook.objects.update(available_time=timezone.now())
+
+    def update_issue(self, issue, status_value):
+        self.client.patch(
+            f"/api/projects/{self.project.id}/issues/{issue.id}/",
+            {"status": status_value}
+        )
+
+    def test_writes_record_events(self):
+        # Création, mises à jour et suppression produisent chacune un événement
+        url = f"/api/projects/{self.project.id}/issues/"
+        response = self.client.post(
+            url + "create/", {"title": "Bug", "description": "Desc"}
+        )
+        issue_id = response.data['data']['id']
+        self.client.patch(f"{url}{issue_id}/", {"status": "In Progress"})
+        self.client.patch(f"{url}{issue_id}/", {"status": "Finished"})
+        self.client.delete(f"{url}{issue_id}/")
+        self.assertEqual(
+            list(OutboxEvent.objects.values_list('action', flat=True)),
+            ['created', 'updated', 'updated', 'deleted']
+        )
+
+    def test_dispatch_coalesces_updates(self):
+        # Les mises à jour successives d'une issue sont publiées en un seul événement
+        issue = Issue.objects.create(
+            title="Issue", description="Desc", project=self.project, creator=self.user
+        )
+        self.update_issue(issue, "In Progress")
+        self.update_issue(issue, "Finished")
+
+        self.assertEqual(self.dispatch(), 2)
+        self.assertEqual(len(self.sender.received), 1)
+        events = self.sender.events(self.webhook.url)
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0]['action'], 'updated')
+        self.assertEqual(events[0]['payload']['status'], 'Finished')
+        self.assertFalse(
+            OutboxEvent.objects.filter(dispatched_time__isnull=True).exists()
+        )
+        # Rien n'est renvoyé au passage suivant
+        self.assertEqual(self.dispatch(), 0)
+        self.assertEqual(len(self.sender.received), 1)
+
+    def test_failed_delivery_is_retried_later(self):
+        # Un webhook injoignable garde son lot en attente avec un backoff
+        self.sender.failing.add(self.webhook.url)
+        issue = Issue.objects.create(
+            title="Issue", description="Desc", project=self.project, creator=self.user
+        )
+        self.update_issue(issue, "Finished")
+        self.assertEqual(self.dispatch(), 0)
+        # Une seule tentative : la relance est planifiée, pas exécutée sur place
+        self.assertEqual(self.sender.calls, 1)
+        self.webhook.refresh_from_db()
+        self.assertEqual(self.webhook.attempts, 1)
+        self.assertGreater(self.webhook.available_time, timezone.now())
+        self.assertIn("Connection refused", self.webhook.last_error)
+        self.assertIsNone(OutboxEvent.objects.get().dispatched_time)
+
+        # Pendant le backoff, le webhook n'est pas repris
+        self.sender.failing.clear()
+        self.assertEqual(self.dispatch(), 0)
+        self.make_due()
+        self.assertEqual(self.dispatch(), 1)
+        self.webhook.refresh_from_db()
+        self.assertEqual(self.webhook.attempts, 0)
+        self.assertIsNotNone(OutboxEvent.objects.get().dispatched_time)
+
+    def test_failing_webhook_is_not_replayed_to_others(self):
+        other = Webhook.objects.create(url="http://hooks.example.com/all")
+        self.sender.failing.add(self.webhook.url)
+        issue = Issue.objects.create(
+            title="Issue", description="Desc", project=self.project, creator=self.user
+        )
+        self.update_issue(issue, "Finished")
+        self.assertEqual(self.dispatch(), 1)
+        self.assertEqual(len(self.sender.events(other.url)), 1)
+        self.assertIsNone(OutboxEvent.objects.get().dispatched_time)
+
+        self.sender.failing.clear()
+        self.make_due()
+        self.assertEqual(self.dispatch(), 1)
+        # Seul le webhook en échec reçoit le lot rejoué
+        self.assertEqual(len(self.sender.events(other.url)), 1)
+        self.assertEqual(len(self.sender.events(self.webhook.url)), 1)
+        self.assertIsNotNone(OutboxEvent.objects.get().dispatched_time)
+
+    def test_newer_events_wait_for_the_failed_batch(self):
+        # L'ordre des événements d'un même objet est préservé après un échec
+        issue = Issue.objects.create(
+            title="Issue", description="Desc", project=self.project, creator=self.user
+        )
+        self.sender.failing.add(self.webhook.url)
+        self.update_issue(issue, "In Progress")
+        with self.settings(OUTBOX_DISPATCHER={'BATCH_SIZE': 1}):
+            self.dispatch()
+            self.update_issue(issue, "Finished")
+            self.sender.failing.clear()
+            self.dispatch()
+            self.assertEqual(self.sender.received, [])
+
+            self.make_due()
+            self.dispatch()
+            self.dispatch()
+        statuses = [
+            event['payload']['status'] for event in self.sender.events(self.webhook.url)
+        ]
+        self.assertEqual(statuses, ["In Progress", "Finished"])
+
+    def test_batch_is_dead_lettered_after_max_attempts(self):
+        issue = Issue.objects.create(
+            title="Issue", description="Desc", project=self.project, creator=self.user
+        )
+        self.sender.failing.add(self.webhook.url)
+        self.update_issue(issue, "In Progress")
+        with self.settings(OUTBOX_DISPATCHER={'MAX_ATTEMPTS': 2}):
+            for _ in range(3):
+                self.make_due()
+                self.dispatch()
+
+        dead = DeadLetter.objects.get()
+        self.assertEqual(dead.webhook, self.webhook)
+        self.assertEqual(dead.attempts, 2)
+        self.assertEqual(dead.events[0]['payload']['status'], "In Progress")
+        self.webhook.refresh_from_db()
+        self.assertEqual(self.webhook.last_event_id, dead.last_event_id)
+        self.assertEqual(self.webhook.attempts, 0)
+
+        # Le webhook reprend avec les événements suivants
+        self.sender.failing.clear()
+        self.update_issue(issue, "Finished")
+        self.assertEqual(self.dispatch(), 1)
+        self.assertEqual(
+            self.sender.events(self.webhook.url)[0]['payload']['status'], "Finished"
+        )
+
+    def test_claimed_webhook_is_not_sent_twice(self):
+        # Un second dispatcher ne reprend pas un webhook déjà réservé
+        issue = Issue.objects.create(
+            title="Issue", description="Desc", project=self.project, creator=self.user
+        )
+        self.update_issue(issue, "Finished")
+        [(webhook, events)] = outbox.claim()
+        self.assertEqual(self.dispatch(), 0)
+        self.assertEqual(self.sender.received, [])
+
+        count = outbox.dispatch_webhook(webhook, events, sender=self.sender)
+        self.assertEqual(count, 1)
+        self.assertEqual(len(self.sender.received), 1)
+
+    def test_new_webhook_starts_after_existing_events(self):
+        issue = Issue.objects.create(
+            title="Issue", description="Desc", project=self.project, creator=self.user
+        )
+        self.update_issue(issue, "Finished")
+        late = Webhook.objects.create(url="http://hooks.example.com/late")
+        self.dispatch()
+        self.assertEqual(self.sender.events(late.url), [])
+        self.assertEqual(len(self.sender.events(self.webhook.url)), 1)
+
+
+class EventStreamTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='user1', email='user1@example.com', age=25, password='pass123'
+        )
+        self.project = Project.objects.create(
+            title="Test Project",
+            description="Description",
+            type="back-end",
+            creator=self.user
+        )
+        self.issue = Issue.objects.create(
+            title="Issue", description="Desc", project=self.project, creator=self.user
+        )
+
+    def test_stream_requires_authentication(self):
+        response = self.client.get(f"/api/projects/{self.project.id}/events/")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_stream_replays_then_relays_events(self):
+        # Reprise via Last-Event-ID puis relais des événements publiés
+        first = OutboxEvent.objects.create(
+            model='issue', object_id=str(self.issue.id),
+            project_id=self.project.id, action='created'
+        )
+        missed = OutboxEvent.objects.create(
+            model='issue', object_id=str(self.issue.id),
+            project_id=self.project.id, action='updated'
+        )
+        broker = InMemoryBroker()
+
+        async def read():
+            stream = stream_events(self.project.id, first.id, broker=broker)
+            chunks = [await stream.__anext__(), await stream.__anext__()]
+            broker.publish(self.project.id, {
+                'id': missed.id + 1, 'model': 'comment', 'object_id': 'abc',
+                'project_id': self.project.id, 'action': 'created', 'payload': {}
+            })
+            chunks.append(await stream.__anext__())
+            await stream.aclose()
+            return chunks
+
+        chunks = async_to_sync(read)()
+        self.assertIn(f"id: {missed.id}\nevent: issue.updated", chunks[1])
+        self.assertIn("event: comment.created", chunks[2])
+        self.assertEqual(dict(broker._subscribers), {})
+
+
+class DeltaSyncTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='user1', email='user1@example.com', age=25, password='pass123'
+        )
+        self.project = Project.objects.create(
+            title="Test Project",
+            description="Description",
+            type="back-end",
+            creator=self.user
+        )
+        self.issue = Issue.objects.create(
+            title="Test Issue", description="Desc",
+            project=self.project, creator=self.user
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = f"/api/projects/{self.project.id}/changes/"
+
+    def test_changes_since_cursor(self):
+        # Une première synchronisation renvoie tout, la suivante seulement le delta
+        data = self.client.get(self.url).data['data']
+        self.assertEqual([issue['id'] for issue in data['issues']], [self.issue.id])
+        self.assertIsNotNone(data['project'])
+        # Le curseur est global ; les objets ne portent pas leur séquence
+        self.assertNotIn('change_seq', data['project'])
+        cursor = data['cursor']
+
+        other = Issue.objects.create(
+            title="Other", description="Desc", project=self.project, creator=self.user
+        )
+        Comment.objects.create(content="Hello", issue=other, creator=self.user)
+        deleted_id = self.issue.id
+        self.issue.delete()
+
+        data = self.client.get(self.url, {"since": cursor}).data['data']
+        self.assertIsNone(data['project'])
+        self.assertEqual([issue['id'] for issue in data['issues']], [other.id])
+        self.assertEqual(len(data['comments']), 1)
+        self.assertEqual(
+            data['deleted'], [{"model": "issue", "id": str(deleted_id)}]
+        )
+        self.assertGreater(data['cursor'], cursor)
+
+        data = self.client.get(self.url, {"since": data['cursor']}).data['data']
+        self.assertEqual(data['issues'] + data['comments'] + data['deleted'], [])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {"since": "abc"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cascade_delete_writes_tombstones_in_one_batch(self):
+        for index in range(5):
+            Comment.objects.create(
+                content=f"Comment {index}", issue=self.issue, creator=self.user
+            )
+        project_id = self.project.id
+        with CaptureQueriesContext(connection) as queries:
+            self.project.delete()
+        statements = [query['sql'] for query in queries]
+        self.assertEqual(
+            len([sql for sql in statements if 'api_tombstone' in sql]), 1
+        )
+        self.assertEqual(
+            len([sql for sql in statements if 'api_changesequence' in sql
+                 and sql.startswith('UPDATE')]), 1
+        )
+        self.assertFalse(any(
+            sql.startswith('SELECT') and 'FROM "api_issue" WHERE' in sql
+            and '"api_issue"."id" =' in sql
+            for sql in statements
+        ))
+        tombstones = Tombstone.objects.all()
+        self.assertEqual(
+            sorted(tombstone.model for tombstone in tombstones),
+            ['comment'] * 5 + ['contributor', 'issue', 'project']
+        )
+        self.assertEqual({t.project_id for t in tombstones}, {project_id})
+        self.assertEqual(len({t.change_seq for t in tombstones}), 1)
+
+    def test_user_deletion_resolves_comment_projects_in_one_query(self):
+        author = User.objects.create_user(
+            username='user2', email='user2@example.com', age=25, password='pass123'
+        )
+        for index in range(3):
+            Comment.objects.create(content="Hi", issue=self.issue, creator=author)
+        with batched_tombstones():
+            author.delete()
+        self.assertEqual(
+            list(Tombstone.objects.values_list('model', 'project_id')),
+            [('comment', self.project.id)] * 3
+        )
+
+
+class ChangeSequenceTransactionTests(TransactionTestCase):
+    def test_sequence_is_reserved_in_the_row_transaction(self):
+        user = User.objects.create_user(
+            username='user1', email='user1@example.com', age=25, password='pass123'
+        )
+        project = Project.objects.create(
+            title="Test Project", description="Description", type="back-end",
+            creator=user
+        )
+        value = ChangeSequence.objects.get().value
+        # Hors transaction, un INSERT refusé annule aussi la séquence réservée
+        with self.assertRaises(IntegrityError):
+            Contributor.objects.create(project=project, contributor=user)
+        self.assertEqual(ChangeSequence.objects.get().value, value)
+
+
+class SparseFieldsetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='user1', email='user1@example.com', age=25, password='pass123'
+        )
+        self.project = Project.objects.create(
+            title="Test Project",
+            description="Description",
+            type="back-end",
+            creator=self.user
+        )
+        self.issue = Issue.objects.create(
+            title="Test Issue", description="Long description",
+            project=self.project, creator=self.user
+        )
+        for index in range(3):
+            Comment.objects.create(
+                content=f"Comment {index}", issue=self.issue, creator=self.user
+            )
+        self.client.force_authenticate(user=self.user)
+
+    def test_fields_restricts_output(self):
+        response = self.client.get(
+            f"/api/projects/{self.project.id}/issues/",
+            {"fields": "id,title,unknown"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data['data']['results'],
+            [{"id": self.issue.id, "title": "Test Issue"}]
+        )
+
+    def test_expand_embeds_capped_comments(self):
+        with self.settings(EXPAND_LIMIT=2):
+            response = self.client.get(
+                f"/api/projects/{self.project.id}/issues/",
+                {"fields": "id", "expand": "comments"}
+            )
+        issue = response.data['data']['results'][0]
+        self.assertEqual(
+            [comment['content'] for comment in issue['comments']],
+            ["Comment 2", "Comment 1"]
+        )
+
+    def test_latest_comments_preview_uses_one_windowed_query(self):
+        other = Issue.objects.create(
+            title="Other Issue", description="Description",
+            project=self.project, creator=self.user
+        )
+        Comment.objects.create(content="Other comment", issue=other, creator=self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                f"/api/projects/{self.project.id}/issues/", {"comments": 2}
+            )
+        results = {issue['title']: issue for issue in response.data['data']['results']}
+        self.assertEqual(
+            [comment['content'] for comment in results["Test Issue"]['comments']],
+            ["Comment 2", "Comment 1"]
+        )
+        self.assertEqual(
+            [comment['content'] for comment in results["Other Issue"]['comments']],
+            ["Other comment"]
+        )
+        comment_queries = [
+            query['sql'] for query in queries if 'FROM "api_comment"' in query['sql']
+        ]
+        self.assertEqual(len(comment_queries), 1)
+        self.assertIn("ROW_NUMBER() OVER (PARTITION BY", comment_queries[0])
+
+    def test_comments_are_not_loaded_without_preview(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f"/api/projects/{self.project.id}/issues/")
+        self.assertNotIn('comments', response.data['data']['results'][0])
+        self.assertFalse([q for q in queries if 'FROM "api_comment"' in q['sql']])
+        response = self.client.get(
+            f"/api/projects/{self.project.id}/issues/", {"comments": "x"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_expand_project_contributors(self):
+        response = self.client.get(
+            f"/api/projects/{self.project.id}/", {"expand": "contributors"}
+        )
+        self.assertEqual(
+            response.data['data']['contributors'][0]['contributor_added'], 'user1'
+        )
+
+
+class NestedResolverTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='user1', email='user1@example.com', age=25, password='pass123'
+        )
+        self.user2 = User.objects.create_user(
+            username='user2', email='user2@example.com', age=25, password='pass123'
+        )
+        self.project = Project.objects.create(
+            title="Test Project", description="Description", type="back-end",
+            creator=self.user
+        )
+        self.other_project = Project.objects.create(
+            title="Other Project", description="Description", type="back-end",
+            creator=self.user
+        )
+        self.issue = Issue.objects.create(
+            title="Test Issue", description="Desc",
+            project=self.project, creator=self.user
+        )
+        self.comment = Comment.objects.create(
+            content="Test comment", issue=self.issue, creator=self.user
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_comment_detail_in_single_query(self):
+        url = (
+            f"/api/projects/{self.project.id}/issues/{self.issue.id}"
+            f"/comments/{self.comment.id}/"
+        )
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_url_hierarchy_is_enforced(self):
+        # L'issue n'appartient pas au projet de l'URL
+        response = self.client.get(
+            f"/api/projects/{self.other_project.id}/issues/{self.issue.id}/"
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_non_member_cannot_list_issues(self):
+        self.client.force_authenticate(user=self.user2)
+        response = self.client.get(f"/api/projects/{self.project.id}/issues/")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        response = self.client.get("/api/projects/999/issues/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ProfilingTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='user1', email='user1@example.com', age=25, password='pass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+
+    def profiling(self, **options):
+        return self.settings(PROFILING={'DIRECTORY': self.directory, **options})
+
+    def test_signed_header_triggers_profile(self):
+        with self.profiling(SAMPLE_RATE=0.0):
+            self.client.get("/api/projects/")
+            self.client.get("/api/projects/", HTTP_X_PROFILE="forged")
+            self.assertEqual(list(self.directory.glob('*.prof')), [])
+            self.client.get("/api/projects/", HTTP_X_PROFILE=make_profile_token())
+        metadata = json.loads(next(self.directory.glob('*.json')).read_text())
+        self.assertEqual(metadata['view'], 'project-list')
+        self.assertGreater(metadata['queries'], 0)
+
+    def test_rotation_and_report(self):
+        with self.profiling(SAMPLE_RATE=1.0, MAX_FILES=2):
+            for _ in range(3):
+                self.client.get("/api/projects/")
+            self.assertEqual(len(list(self.directory.glob('*.prof'))), 2)
+            output = StringIO()
+            call_command('profile_report', filter='api/', stdout=output)
+        self.assertIn("project-list : 2 échantillon(s)", output.getvalue())
+        self.assertIn("get_queryset", output.getvalue())
+
+    def test_concurrent_sample_is_served_without_profiling(self):
+        # Un profil est déjà en cours dans un autre thread
+        with self.profiling(SAMPLE_RATE=1.0), profiling._lock:
+            response = self.client.get("/api/projects/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(self.directory.glob('*.prof')), [])
+
+    def test_sample_is_skipped_when_another_profiler_is_active(self):
+        active = mock.Mock()
+        active.enable.side_effect = ValueError("Another profiler is already active")
+        patch = mock.patch.object(profiling.cProfile, 'Profile', return_value=active)
+        with self.profiling(SAMPLE_RATE=1.0), patch:
+            response = self.client.get("/api/projects/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(self.directory.glob('*.prof')), [])
+        self.assertFalse(profiling._lock.locked())
+
+
+class SlowQueryLogTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='user1', email='user1@example.com', age=25, password='pass123'
+        )
+        self.staff = User.objects.create_user(
+            username='admin', email='admin@example.com', age=25, password='pass123',
+            is_staff=True
+        )
+        Project.objects.create(
+            title="Test Project", description="Description", type="back-end",
+            creator=self.user
+        )
+        slow_queries.clear()
+        self.addCleanup(slow_queries.clear)
+
+    def test_slow_queries_are_explained(self):
+        self.client.force_authenticate(user=self.user)
+        with self.settings(SLOW_QUERIES={'THRESHOLD_MS': 0}), \
+                self.assertLogs('softdesk_api.slow_queries', 'WARNING'):
+            self.client.get("/api/projects/")
+        entries = [
+            entry for entry in slow_queries.get_recent()
+            if entry['view'] == 'project-list'
+        ]
+        self.assertTrue(entries)
+        self.assertTrue(all(entry['plan'] for entry in entries
+                            if entry['sql'].startswith('SELECT')))
+        self.assertEqual(len(entries[0]['params_fingerprint']), 12)
+
+    def test_endpoint_is_staff_only(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get("/api/debug/slow-queries/")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.client.force_authenticate(user=self.staff)
+        response = self.client.get("/api/debug/slow-queries/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='user1', email='user1@example.com', age=25, password='pass123'
+        )
+        self.staff = User.objects.create_user(
+            username='admin', email='admin@example.com', age=25, password='pass123',
+            is_staff=True
+        )
+        Project.objects.create(
+            title="Test Project", description="Description", type="back-end",
+            creator=self.user
+        )
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        override = self.settings(METRICS={'DIRECTORY': self.directory})
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def scrape(self):
+        self.client.force_authenticate(user=self.staff)
+        response = self.client.get("/metrics")
+        self.client.force_authenticate(user=None)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(
+            response['Content-Type'].startswith('text/plain; version=0.0.4')
+        )
+        return response.content.decode()
+
+    def samples(self, text):
+        return dict(
+            line.rsplit(' ', 1) for line in text.splitlines()
+            if line and not line.startswith('#')
+        )
+
+    def test_endpoint_is_staff_only(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 401)
+        self.client.force_authenticate(user=self.user)
+        self.assertEqual(self.client.get("/metrics").status_code, 403)
+
+    def test_requests_latency_and_queries_are_recorded_per_view(self):
+        self.client.force_authenticate(user=self.user)
+        self.client.get("/api/projects/")
+        self.client.get("/api/projects/")
+        text = self.scrape()
+        samples = self.samples(text)
+        self.assertIn('# TYPE softdesk_http_request_duration_seconds histogram', text)
+        self.assertEqual(samples[
+            'softdesk_http_requests_total'
+            '{view="project-list",method="GET",status="200"}'
+        ], '2')
+        self.assertEqual(samples[
+            'softdesk_http_request_duration_seconds_bucket'
+            '{view="project-list",le="+Inf"}'
+        ], '2')
+        self.assertEqual(samples[
+            'softdesk_http_request_duration_seconds_count{view="project-list"}'
+        ], '2')
+        self.assertGreater(
+            int(samples['softdesk_db_queries_total{view="project-list"}']), 0
+        )
+        self.assertGreater(float(samples[
+            'softdesk_db_query_duration_seconds_total{view="project-list"}'
+        ]), 0)
+
+    def test_auth_failures_and_cache_lookups(self):
+        self.client.post("/api/token/", {'username': 'user1', 'password': 'wrong'})
+        self.client.get("/api/projects/", HTTP_AUTHORIZATION='Bearer forged')
+        fragments.count(3, 1)
+        samples = self.samples(self.scrape())
+        self.assertEqual(
+            samples['softdesk_auth_failures_total{reason="invalid_credentials"}'], '1'
+        )
+        self.assertEqual(
+            samples['softdesk_auth_failures_total{reason="token_not_valid"}'], '1'
+        )
+        self.assertEqual(
+            samples['softdesk_fragment_cache_lookups_total{result="hit"}'], '3'
+        )
+        self.assertEqual(
+            samples['softdesk_fragment_cache_lookups_total{result="miss"}'], '1'
+        )
+
+    def test_workers_are_aggregated(self):
+        def worker():
+            metrics.AUTH_FAILURES.inc(2, reason='worker')
+
+        metrics.AUTH_FAILURES.inc(reason='worker')
+        process = multiprocessing.get_context('fork').Process(target=worker)
+        process.start()
+        process.join()
+        self.assertEqual(len(list(self.directory.glob('*.db'))), 2)
+        samples = self.samples(self.scrape())
+        self.assertEqual(samples['softdesk_auth_failures_total{reason="worker"}'], '3')
+
+    def test_mapped_file_grows_and_is_reopened(self):
+        path = self.directory / 'worker.db'
+        store = metrics.MappedFile(path)
+        for index in range(5000):
+            store.inc(f'key-{index}', index)
+        store.inc('key-1', 0.5)
+        store.close()
+        self.assertGreater(path.stat().st_size, metrics.INITIAL_SIZE)
+        values = dict(metrics.read_file(path))
+        self.assertEqual((len(values), values['key-1'], values['key-4999']),
+                         (5000, 1.5, 4999))
+        store = metrics.MappedFile(path)
+        store.inc('key-2', 1)
+        store.close()
+        self.assertEqual(dict(metrics.read_file(path))['key-2'], 3)
+
+
+class MetricsDirectoryTests(TestCase):
+    def test_test_run_keeps_metrics_out_of_the_repository(self):
+        # Le lanceur de tests redirige les fichiers vers un répertoire temporaire
+        self.client.get("/api/projects/")
+        directory = metrics.get_directory()
+        self.assertFalse(directory.is_relative_to(settings.BASE_DIR))
+        self.assertTrue(directory.is_dir())
+
+
+class SeedCommandTests(TestCase):
+    def seed(self, **options):
+        options = dict(users=20, projects=10, issues=50, comments=100, batch_size=16,
+                       **options)
+        call_command('seed', stdout=StringIO(), **options)
+
+    def test_seed_creates_consistent_data(self):
+        self.seed()
+        self.assertEqual(User.objects.count(), 20)
+        self.assertEqual(Issue.objects.count(), 50)
+        self.assertEqual(Comment.objects.count(), 100)
+        self.assertEqual(len({user.password for user in User.objects.all()}), 1)
+        # Chaque créateur de projet est propriétaire, chaque issue et commentaire
+        # est écrit par un membre du projet.
+        for project in Project.objects.all():
+            self.assertTrue(Contributor.objects.filter(
+                project=project, contributor_id=project.creator_id,
+                role=Contributor.ROLE_OWNER
+            ).exists())
+        members = set(Contributor.objects.values_list('project_id', 'contributor_id'))
+        for issue in Issue.objects.all():
+            self.assertIn((issue.project_id, issue.creator_id), members)
+        for comment in Comment.objects.select_related('issue'):
+            self.assertIn((comment.issue.project_id, comment.creator_id), members)
+        self.assertFalse(Issue.objects.filter(change_seq=0).exists())
+
+    def test_seed_is_reproducible(self):
+        self.seed(seed=7)
+        first = list(Issue.objects.order_by('pk').values_list(
+            'title', 'project_id', 'creator_id'
+        ))
+        Comment.objects.all().delete()
+        Issue.objects.all().delete()
+        Project.objects.all().delete()
+        User.objects.all().delete()
+        self.seed(seed=7)
+        second = list(Issue.objects.order_by('pk').values_list(
+            'title', 'project_id', 'creator_id'
+        ))
+        self.assertEqual(second, first)
+
+    def test_seed_can_run_twice(self):
+        self.seed()
+        self.seed()
+        self.assertEqual(User.objects.count(), 40)
+        self.assertEqual(Issue.objects.count(), 100)
+        self.assertEqual(Comment.objects.count(), 200)
+        # Les identifiants suivent les données générées
+        self.assertGreater(Issue.objects.create(
+            title="Issue", description="Description",
+            project=Project.objects.first(), creator=User.objects.first()
+        ).pk, 100)
+
+
+class AdminScalingTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', age=30, password='pass123'
+        )
+        self.client.force_login(self.admin)
+        self.project = Project.objects.create(
+            title="Alpha", description="Description", type="back-end",
+            creator=self.admin
+        )
+        other = Project.objects.create(
+            title="Beta", description="Description", type="back-end",
+            creator=self.admin
+        )
+        for project in (self.project, other):
+            Issue.objects.create(
+                title=f"Issue {project.title}", description="Description",
+                project=project, creator=self.admin, assignee=self.admin,
+                priority="LOW", tag="BUG", status="To Do"
+            )
+
+    def test_issue_changelist_uses_autocomplete_filter(self):
+        response = self.client.get(
+            "/admin/api/issue/", {'project__id__exact': self.project.id}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'class="autocomplete-filter"')
+        self.assertContains(response, "Issue Alpha")
+        self.assertNotContains(response, "Issue Beta")
+        # Le filtre ne charge que le projet sélectionné
+        self.assertContains(
+            response, f'<option value="{self.project.id}" selected>Alpha</option>'
+        )
+        self.assertNotContains(response, '>Beta</option>')
+
+    def test_issue_changelist_queries_do_not_grow_with_rows(self):
+        with CaptureQueriesContext(connection) as small:
+            self.client.get("/admin/api/issue/")
+        for index in range(5):
+            Issue.objects.create(
+                title=f"Issue {index}", description="Description",
+                project=self.project, creator=self.admin, assignee=self.admin,
+                priority="LOW", tag="BUG", status="To Do"
+            )
+        with CaptureQueriesContext(connection) as large:
+            self.client.get("/admin/api/issue/")
+        self.assertEqual(len(large), len(small))
+
+    def test_search_is_an_indexed_prefix_range(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/admin/api/project/", {'q': 'Alp'})
+        self.assertContains(response, "Alpha")
+        self.assertNotContains(response, "Beta")
+        sql = " ".join(query['sql'] for query in queries)
+        self.assertNotIn("LIKE", sql)
+
+    def test_estimated_count_for_unfiltered_lists(self):
+        self.assertIsNone(estimate_count(Issue))
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+            cursor.execute(
+                "UPDATE sqlite_stat1 SET stat = '50000 1' WHERE tbl = %s",
+                [Issue._meta.db_table]
+            )
+        self.assertEqual(estimate_count(Issue), 50000)
+        paginator = EstimatedCountPaginator(Issue.objects.order_by('pk'), 20)
+        self.assertEqual(paginator.count, 50000)
+        filtered = Issue.objects.filter(project=self.project).order_by('pk')
+        self.assertEqual(EstimatedCountPaginator(filtered, 20).count, 1)
+
+
+class CachedFieldSchemaTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='user1', email='user1@example.com', age=25, password='pass123'
+        )
+        self.project = Project.objects.create(
+            title="Test Project", description="Description", type="back-end",
+            creator=self.user
+        )
+        self.issue = Issue.objects.create(
+            title="Issue", description="Description", project=self.project,
+            creator=self.user, assignee=self.user,
+            priority="LOW", tag="BUG", status="To Do"
+        )
+
+    def test_schema_is_built_once_per_class(self):
+        IssueSerializer._field_schemas.pop(IssueSerializer, None)
+        with mock.patch(
+            'rest_framework.serializers.ModelSerializer.get_fields',
+            autospec=True,
+            side_effect=lambda serializer: {
+                'id': serializers.IntegerField(read_only=True)
+            }
+        ) as get_fields:
+            first = IssueSerializer(self.issue)
+            second = IssueSerializer(self.issue)
+            self.assertEqual(first.data, second.data)
+        self.assertEqual(get_fields.call_count, 1)
+        self.assertIsNot(first.fields['id'], second.fields['id'])
+        IssueSerializer._field_schemas.pop(IssueSerializer, None)
+
+    def test_context_dependent_fields_are_not_cached(self):
+        full = IssueSerializer(self.issue).data
+        sparse = IssueSerializer(self.issue, context={'fields': ['id', 'title']}).data
+        self.assertEqual(set(sparse), {'id', 'title'})
+        self.assertEqual(IssueSerializer(self.issue).data, full)
+        self.assertEqual(full['assignee_username'], 'user1')
+
+
+class BatchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='user1', email='user1@example.com', age=25, password='pass123'
+        )
+        self.other = User.objects.create_user(
+            username='user2', email='user2@example.com', age=25, password='pass123'
+        )
+        self.project = Project.objects.create(
+            title="Test Project", description="Description", type="back-end",
+            creator=self.user
+        )
+        self.private = Project.objects.create(
+            title="Private", description="Description", type="back-end",
+            creator=self.other
+        )
+        token = self.client.post(
+            "/api/token/", {'username': 'user1', 'password': 'pass123'}
+        ).data['access']
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def batch(self, requests, **extra):
+        return self.client.post(
+            "/api/batch/", {'requests': requests, **extra}, format='json'
+        )
+
+    def test_batch_dispatches_subrequests_with_per_item_status(self):
+        response = self.batch([
+            {'id': 'project', 'path': f'/api/projects/{self.project.id}/'},
+            {'id': 'create', 'method': 'POST',
+             'path': f'/api/projects/{self.project.id}/issues/create/',
+             'body': {'title': "Issue", 'description': "Description",
+                      'priority': "LOW", 'tag': "BUG", 'status': "To Do"}},
+            {'id': 'issues', 'path': f'/api/projects/{self.project.id}/issues/?page=1'},
+            {'id': 'private', 'path': f'/api/projects/{self.private.id}/'},
+            {'id': 'missing', 'path': '/api/nowhere/'},
+            {'id': 'me', 'path': '/api/auth/me/'},
+        ])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = {item['id']: item for item in response.data['data']}
+        self.assertEqual(results['project']['status'], 200)
+        self.assertEqual(results['project']['body']['data']['title'], "Test Project")
+        self.assertEqual(results['create']['status'], 200)
+        self.assertEqual(results['create']['body']['data']['title'], "Issue")
+        self.assertEqual(results['issues']['status'], 200)
+        self.assertEqual(results['issues']['body']['data']['count'], 1)
+        self.assertEqual(results['private']['status'], 403)
+        self.assertEqual(results['missing']['status'], 404)
+        self.assertEqual(results['me']['status'], 200)
+
+    def test_batch_rejects_paths_outside_the_api(self):
+        response = self.batch([
+            {'id': 'admin', 'path': '/admin/'},
+            {'id': 'metrics', 'path': '/metrics'},
+            {'id': 'events', 'path': f'/api/projects/{self.project.id}/events/'},
+            {'id': 'project', 'path': f'/api/projects/{self.project.id}/'},
+        ])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = {item['id']: item['status'] for item in response.data['data']}
+        self.assertEqual(
+            results, {'admin': 400, 'metrics': 400, 'events': 400, 'project': 200}
+        )
+
+    def test_batch_authenticates_once(self):
+        with mock.patch(
+            'rest_framework_simplejwt.authentication.JWTAuthentication.authenticate',
+            autospec=True,
+            side_effect=lambda authenticator, request: (self.user, None)
+        ) as authenticate:
+            response = self.batch([
+                {'path': f'/api/projects/{self.project.id}/'},
+                {'path': f'/api/projects/{self.project.id}/issues/'},
+            ])
+        self.assertEqual([item['status'] for item in response.data['data']], [200, 200])
+        self.assertEqual(authenticate.call_count, 1)
+
+    def test_batch_size_is_capped(self):
+        with self.settings(BATCH_API={'MAX_REQUESTS': 2}):
+            response = self.batch([{'path': '/api/projects/'}] * 3)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_batch_requires_authentication(self):
+        self.client.credentials()
+        response = self.batch([{'path': '/api/projects/'}])
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class ConcurrentBatchTests(TransactionTestCase):
+    def test_concurrent_reads_keep_order_around_writes(self):
+        user = User.objects.create_user(
+            username='user1', email='user1@example.com', age=25, password='pass123'
+        )
+        project = Project.objects.create(
+            title="Test Project", description="Description", type="back-end",
+            creator=user
+        )
+        client = APIClient()
+        client.force_authenticate(user=user)
+        issues = f'/api/projects/{project.id}/issues/'
+        response = client.post("/api/batch/", {'concurrent': True, 'requests': [
+            {'path': issues},
+            {'path': f'/api/projects/{project.id}/'},
+            {'method': 'POST', 'path': issues + 'create/',
+             'body': {'title': "Issue", 'description': "Description",
+                      'priority': "LOW", 'tag': "BUG", 'status': "To Do"}},
+            {'path': issues},
+        ]}, format='json')
+        data = response.data['data']
+        self.assertEqual([item['status'] for item in data], [200, 200, 200, 200])
+        self.assertEqual(data[0]['body']['data']['count'], 0)
+        self.assertEqual(data[3]['body']['data']['count'], 1)
+
+
+class CommentIdTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='user1', email='user1@example.com', age=25, password='pass123'
+        )
+        self.project = Project.objects.create(
+            title="Test Project", description="Description", type="back-end",
+            creator=self.user
+        )
+        self.issue = Issue.objects.create(
+            title="Issue", description="Description", project=self.project,
+            creator=self.user, priority="LOW", tag="BUG", status="To Do"
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_uuid7_is_time_ordered(self):
+        ids = [uuid7() for _ in range(5000)]
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(len(set(ids)), len(ids))
+        self.assertTrue(all(value.version == 7 for value in ids))
+        self.assertLessEqual(abs(uuid7_timestamp(ids[0]) - time.time() * 1000), 1000)
+        self.assertIsNone(uuid7_timestamp(uuid.uuid4()))
+
+    def test_comments_get_uuid7_and_legacy_ids_stay_valid(self):
+        legacy = Comment.objects.create(
+            id=uuid.uuid4(), content="Ancien", issue=self.issue, creator=self.user
+        )
+        first, second = [
+            Comment.objects.create(content=content, issue=self.issue, creator=self.user)
+            for content in ("Un", "Deux")
+        ]
+        self.assertEqual(first.id.version, 7)
+        self.assertLess(first.id, second.id)
+        self.assertEqual(
+            list(Comment.objects.filter(pk__in=[first.pk, second.pk]).order_by('pk')),
+            [first, second]
+        )
+        base = f"/api/projects/{self.project.id}/issues/{self.issue.id}/comments/"
+        for comment in (legacy, first):
+            response = self.client.get(f"{base}{comment.id}/")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class FragmentCacheTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='user1', email='user1@example.com', age=25, password='pass123'
+        )
+        self.staff = User.objects.create_user(
+            username='admin', email='admin@example.com', age=25, password='pass123',
+            is_staff=True
+        )
+        self.project = Project.objects.create(
+            title="Test Project", description="Description", type="back-end",
+            creator=self.user
+        )
+        self.issues = [
+            Issue.objects.create(
+                title=f"Issue {index}", description="Description",
+                project=self.project, creator=self.user
+            )
+            for index in range(3)
+        ]
+        self.client.force_authenticate(user=self.user)
+        self.url = f"/api/projects/{self.project.id}/issues/"
+        cache.clear()
+        fragments.reset_stats()
+        self.addCleanup(cache.clear)
+
+    def test_unchanged_issues_are_served_from_cache(self):
+        first = self.client.get(self.url)
+        self.assertEqual(fragments.get_stats()['misses'], 3)
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get(self.url)
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(fragments.get_stats()['hits'], 3)
+        # Aucune lecture complète des issues : seuls pk et updated_time
+        issue_queries = [
+            query['sql'] for query in queries
+            if 'FROM "api_issue"' in query['sql'] and 'COUNT' not in query['sql']
+        ]
+        self.assertEqual(len(issue_queries), 1)
+        self.assertNotIn('"api_issue"."description"', issue_queries[0])
+
+    def test_updated_issue_is_rendered_again(self):
+        self.client.get(self.url)
+        issue = self.issues[1]
+        issue.title = "Renamed"
+        issue.save()
+        response = self.client.get(self.url)
+        results = response.data['data']['results']
+        self.assertIn("Renamed", [item['title'] for item in results])
+        self.assertEqual(
+            fragments.get_stats(), {'hits': 2, 'misses': 4, 'hit_rate': 0.3333}
+        )
+        self.assertEqual(len(results), 3)
+
+    def test_sparse_requests_bypass_the_cache(self):
+        response = self.client.get(self.url, {'fields': 'id'})
+        self.assertEqual(set(response.data['data']['results'][0]), {'id'})
+        self.assertEqual(fragments.get_stats()['misses'], 0)
+
+    def test_comment_list_and_stats_endpoint(self):
+        Comment.objects.create(
+            content="Comment", issue=self.issues[0], creator=self.user
+        )
+        url = f"{self.url}{self.issues[0].id}/comments/"
+        self.client.get(url)
+        response = self.client.get(url)
+        self.assertEqual(response.data['data']['results'][0]['content'], "Comment")
+        self.client.force_authenticate(user=self.staff)
+        response = self.client.get("/api/debug/fragment-cache/")
+        self.assertEqual(response.data['data']['hits'], 1)
+        self.assertEqual(response.data['data']['misses'], 1)
+
+
+class SingleFlightTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='user1', email='user1@example.com', age=25, password='pass123'
+        )
+        self.outsider = User.objects.create_user(
+            username='user2', email='user2@example.com', age=25, password='pass123'
+        )
+        self.project = Project.objects.create(
+            title="Test Project", description="Description", type="back-end",
+            creator=self.user
+        )
+        self.url = f"/api/projects/{self.project.id}/"
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_concurrent_identical_calls_share_one_computation(self):
+        group = singleflight.SingleFlight()
+        started, release = threading.Event(), threading.Event()
+        calls, results = [], []
+
+        def compute():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return {'value': 42}
+
+        def follower():
+            results.append(group.do('key', compute))
+
+        leader = threading.Thread(target=follower)
+        leader.start()
+        started.wait(5)
+        followers = [threading.Thread(target=follower) for _ in range(3)]
+        for thread in followers:
+            thread.start()
+        while group.calls['key'].followers < 3:
+            time.sleep(0.001)
+        release.set()
+        for thread in [leader, *followers]:
+            thread.join(5)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(sorted(shared for _, shared in results), [False] + [True] * 3)
+        self.assertTrue(all(result == {'value': 42} for result, _ in results))
+        self.assertEqual(group.calls, {})
+
+    def test_leader_error_clears_the_call(self):
+        group = singleflight.SingleFlight()
+        with self.assertRaises(ValueError):
+            group.do('key', mock.Mock(side_effect=ValueError))
+        self.assertEqual(group.calls, {})
+
+    def test_non_member_is_not_coalesced(self):
+        self.client.force_authenticate(user=self.outsider)
+        with mock.patch.object(singleflight.group, 'do') as do:
+            response = self.client.get(f"{self.url}issues/")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        do.assert_not_called()
+
+    def test_issue_list_checks_membership_once(self):
+        # La portée réutilise le parent résolu par la vue : aucune requête en plus
+        self.client.force_authenticate(user=self.user)
+        url = f"{self.url}issues/"
+        with self.settings(SINGLE_FLIGHT={'ENABLED': False}), \
+                CaptureQueriesContext(connection) as direct:
+            self.client.get(url)
+        with mock.patch.object(
+            singleflight.group, 'do', wraps=singleflight.group.do
+        ) as do, CaptureQueriesContext(connection) as coalesced:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(do.call_args.args[0].endswith(f"project:{self.project.id}"))
+        self.assertEqual(len(coalesced), len(direct))
+
+    def test_key_includes_query_and_scope(self):
+        self.client.force_authenticate(user=self.user)
+        with mock.patch.object(
+            singleflight.group, 'do', wraps=singleflight.group.do
+        ) as do:
+            response = self.client.get(self.url, {'fields': 'id,title'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data['data']), {'id', 'title'})
+        self.assertEqual(response['ETag'], '"1"')
+        key = do.call_args.args[0]
+        self.assertIn("('fields', ['id,title'])", key)
+        self.assertTrue(
+            key.endswith(f"project:{self.project.id}:user:{self.user.pk}")
+        )
+
+    def test_cross_process_callers_share_one_computation(self):
+        calls, results = [], []
+        barrier = threading.Barrier(4)
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            return ({'shared': True}, 200)
+
+        def caller():
+            barrier.wait(5)
+            results.append(singleflight.run_across_workers('key', compute))
+
+        threads = [threading.Thread(target=caller) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [({'shared': True}, 200)] * 4)
+
+    def test_cross_process_leader_failure_elects_a_new_leader(self):
+        compute = mock.Mock(side_effect=[ValueError, ({'value': 1}, 200)])
+        with self.assertRaises(ValueError):
+            singleflight.run_across_workers('key', compute)
+        self.assertEqual(
+            singleflight.run_across_workers('key', compute), ({'value': 1}, 200)
+        )
+
+    def test_cross_process_leader_releases_its_lock(self):
+        self.client.force_authenticate(user=self.user)
+        with self.settings(SINGLE_FLIGHT={'CROSS_PROCESS': True}):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data['data']['title'], "Test Project")
+        self.assertEqual(
+            [key for key in cache._cache if 'singleflight:lock' in key], []
+        )
+
+
+@jobs.task(name='tests.record')
+def record_task(value):
+    Webhook.objects.create(url=f"https://example.com/{value}")
+
+
+@jobs.task(name='tests.fail', max_attempts=2)
+def failing_task():
+    raise RuntimeError("boom")
+
+
+class TaskQueueTests(TestCase):
+    def test_enqueue_waits_for_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            jobs.enqueue(record_task, args=['a'])
+            self.assertFalse(Job.objects.exists())
+        for callback in callbacks:
+            callback()
+        job = Job.objects.get()
+        self.assertEqual(
+            (job.name, job.args, job.status), ('tests.record', ['a'], 'queued')
+        )
+
+    def test_unregistered_function_is_rejected(self):
+        with self.assertRaises(ValueError):
+            jobs.enqueue(print)
+
+    def test_jobs_run_by_priority(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            jobs.enqueue(record_task, args=['low'])
+            jobs.enqueue(record_task, args=['high'], priority=5)
+        self.assertEqual(
+            [job.args for job in jobs.claim()], [['high'], ['low']]
+        )
+
+    def test_delayed_job_is_not_claimed_early(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            jobs.enqueue(record_task, args=['later'], delay=60)
+        self.assertEqual(jobs.run_pending(), 0)
+
+    def test_failing_job_is_retried_then_marked_failed(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            jobs.enqueue(failing_task)
+        self.assertEqual(jobs.run_pending(), 1)
+        job = Job.objects.get()
+        self.assertEqual((job.status, job.attempts), ('queued', 1))
+        self.assertGreater(job.available_time, job.created_time)
+        self.assertEqual(job.last_error, "RuntimeError: boom")
+
+        Job.objects.update(available_time=job.created_time)
+        jobs.run_pending()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('failed', 2))
+        self.assertIsNotNone(job.finished_time)
+
+    def test_expired_job_is_reclaimed_and_stale_worker_is_fenced(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            jobs.enqueue(record_task, args=['x'])
+        stale = jobs.claim()[0]
+        self.assertEqual(jobs.claim(), [])  # Invisible pendant le délai
+
+        Job.objects.update(available_time=stale.created_time)
+        fresh = jobs.claim()[0]
+        self.assertEqual(fresh.attempts, 2)
+        jobs.run_job(stale)
+        self.assertEqual(Job.objects.get().status, 'running')
+        self.assertEqual(jobs.run_job(fresh), 'done')
+
+    def test_unknown_task_fails_without_retry(self):
+        Job.objects.create(name='tests.missing')
+        jobs.run_pending()
+        job = Job.objects.get()
+        self.assertEqual(job.status, 'failed')
+        self.assertIn("Tâche inconnue", job.last_error)
+
+
+class TaskWorkerCommandTests(TransactionTestCase):
+    def test_worker_runs_pending_jobs_in_its_pool(self):
+        # Hors transaction, enqueue crée les tâches immédiatement
+        for value in ('a', 'b', 'c'):
+            jobs.enqueue(record_task, args=[value])
+        out = StringIO()
+        call_command('run_tasks', '--once', '--workers', '2', stdout=out)
+        self.assertIn("2 tâche(s) exécutée(s).", out.getvalue())
+        self.assertEqual(
+            set(Job.objects.values_list('status', flat=True)), {'done'}
+        )
+        self.assertEqual(Webhook.objects.count(), 3)
+
+
+class SoftDeleteTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='user1', email='user1@example.com', age=25, password='pass123'
+        )
+        self.project = Project.objects.create(
+            title="Test Project", description="Description", type="back-end",
+            creator=self.user
+        )
+        self.issues = [
+            Issue.objects.create(
+                title=f"Issue {index}", description="Description",
+                project=self.project, creator=self.user
+            )
+            for index in range(3)
+        ]
+        for issue in self.issues:
+            for index in range(2):
+                Comment.objects.create(
+                    content=f"Comment {index}", issue=issue, creator=self.user
+                )
+        self.client.force_authenticate(user=self.user)
+        self.url = f"/api/projects/{self.project.id}/"
+
+    def run_tasks(self):
+        """Exécute les tâches jusqu'à épuisement ; retourne le nombre d'étapes."""
+        steps = 0
+        while True:
+            with self.captureOnCommitCallbacks(execute=True):
+                if not jobs.run_pending():
+                    return steps
+            steps += 1
+
+    def test_live_project_does_not_expose_deletion_marker(self):
+        self.assertNotIn('deleted_at', self.client.get(self.url).data['data'])
+        listed = self.client.get("/api/projects/").data['data']['results'][0]
+        self.assertNotIn('deleted_at', listed)
+
+    def test_deleted_project_is_hidden_immediately(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("restore_before", response.data['data'])
+
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+        self.assertEqual(self.client.get("/api/projects/").data['data']['count'], 0)
+        issue_url = f"{self.url}issues/{self.issues[0].id}/"
+        self.assertEqual(self.client.get(issue_url).status_code, 404)
+        self.assertEqual(self.client.get(f"{issue_url}comments/").status_code, 404)
+        # Rien n'est encore supprimé physiquement, la purge est planifiée
+        self.assertEqual(Comment.objects.count(), 6)
+        self.assertTrue(Tombstone.objects.filter(model='project').exists())
+        job = Job.objects.get()
+        self.assertEqual(job.name, 'api.softdelete.purge_project')
+        self.assertGreater(job.available_time, Project.all_objects.get().deleted_at)
+
+    def test_restore_within_undo_window(self):
+        self.client.delete(self.url)
+        response = self.client.post(f"{self.url}restore/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['title'], "Test Project")
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        self.assertFalse(Tombstone.objects.exists())
+
+    def test_restore_after_undo_window_is_gone(self):
+        self.client.delete(self.url)
+        with self.settings(SOFT_DELETE={'UNDO_WINDOW': 0}):
+            response = self.client.post(f"{self.url}restore/")
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+
+    def test_purge_deletes_dependents_in_chunks(self):
+        with self.settings(SOFT_DELETE={'UNDO_WINDOW': 0, 'PURGE_CHUNK_SIZE': 2}):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.delete(self.url)
+            tombstones = Tombstone.objects.count()
+            # 3 lots de commentaires, 2 lots d'issues, puis le projet
+            self.assertEqual(self.run_tasks(), 6)
+        self.assertFalse(Project.all_objects.exists())
+        self.assertFalse(Issue.all_objects.exists())
+        self.assertFalse(Comment.objects.exists())
+        # Seule la tombstone du contributeur s'ajoute à celle du projet
+        self.assertEqual(Tombstone.objects.count(), tombstones + 1)
+
+    def test_restored_project_is_not_purged(self):
+        with self.settings(SOFT_DELETE={'UNDO_WINDOW': 0}):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.delete(self.url)
+            Project.all_objects.update(deleted_at=None)
+            self.run_tasks()
+        self.assertEqual(Comment.objects.count(), 6)
+
+    def test_issue_soft_delete_and_restore(self):
+        issue = self.issues[0]
+        issue_url = f"{self.url}issues/{issue.id}/"
+        cursor = self.client.get(f"{self.url}changes/").data['data']['cursor']
+        self.client.delete(issue_url)
+
+        results = self.client.get(f"{self.url}issues/").data['data']['results']
+        self.assertNotIn(issue.id, [item['id'] for item in results])
+        data = self.client.get(f"{self.url}changes/", {"since": cursor}).data['data']
+        self.assertEqual(data['issues'] + data['comments'], [])
+        self.assertEqual(data['deleted'], [{"model": "issue", "id": str(issue.id)}])
+
+        response = self.client.post(f"{issue_url}restore/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get(issue_url).status_code, 200)
+        self.assertEqual(
+            list(OutboxEvent.objects.values_list('action', flat=True)),
+            ['deleted', 'created']
+        )
+
+    def test_restore_resends_dependents_to_synced_clients(self):
+        issue = self.issues[0]
+        issue_url = f"{self.url}issues/{issue.id}/"
+        self.client.delete(issue_url)
+        # Le client a reçu la tombstone de l'issue et oublié ses commentaires
+        cursor = self.client.get(f"{self.url}changes/").data['data']['cursor']
+
+        self.client.post(f"{issue_url}restore/")
+        data = self.client.get(f"{self.url}changes/", {"since": cursor}).data['data']
+        self.assertEqual([item['id'] for item in data['issues']], [issue.id])
+        self.assertEqual(len(data['comments']), 2)
+
+    def test_project_restore_resends_issues_comments_and_members(self):
+        self.client.delete(self.url)
+        # Curseur d'un client synchronisé juste après la suppression
+        cursor = Tombstone.objects.get(model='project').change_seq
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(f"{self.url}restore/")
+        self.assertEqual(len([
+            query for query in queries
+            if query['sql'].startswith('UPDATE "api_comment"')
+        ]), 1)
+        data = self.client.get(f"{self.url}changes/", {"since": cursor}).data['data']
+        self.assertEqual(len(data['issues']), 3)
+        self.assertEqual(len(data['comments']), 6)
+        self.assertEqual(len(data['contributors']), 1)
+
+    def test_list_uses_partial_index(self):
+        queryset = Issue.objects.filter(project=self.project).order_by('-created_time')
+        plan = queryset.explain()
+        self.assertIn('issue_live_project_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+
+class OptimisticConcurrencyTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='user1', email='user1@example.com', age=25, password='pass123'
+        )
+        self.project = Project.objects.create(
+            title="Test Project", description="Description", type="back-end",
+            creator=self.user
+        )
+        self.issue = Issue.objects.create(
+            title="Issue", description="Description",
+            project=self.project, creator=self.user
+        )
+        self.comment = Comment.objects.create(
+            content="Comment", issue=self.issue, creator=self.user
+        )
+        self.client.force_authenticate(user=self.user)
+        self.project_url = f"/api/projects/{self.project.id}/"
+        self.issue_url = f"{self.project_url}issues/{self.issue.id}/"
+        self.comment_url = f"{self.issue_url}comments/{self.comment.id}/"
+
+    def test_detail_responses_carry_etag(self):
+        for url in (self.project_url, self.issue_url, self.comment_url):
+            response = self.client.get(url)
+            self.assertEqual(response['ETag'], '"1"')
+            # La version n'est exposée que dans l'en-tête
+            self.assertNotIn('version', response.data['data'])
+        response = self.client.get(self.issue_url, {'fields': 'title'})
+        self.assertEqual(response['ETag'], '"1"')
+
+    def test_matching_if_match_updates_in_one_conditional_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(
+                self.issue_url, {'title': "Renamed"}, HTTP_IF_MATCH='"1"'
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['ETag'], '"2"')
+        self.assertEqual(response.data['data']['title'], "Renamed")
+        updates = [
+            query['sql'] for query in queries
+            if query['sql'].startswith('UPDATE "api_issue"')
+        ]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"api_issue"."version" IN (1)', updates[0])
+
+        issue = Issue.objects.get()
+        self.assertEqual((issue.title, issue.version), ("Renamed", 2))
+        self.assertGreater(issue.change_seq, self.issue.change_seq)
+        self.assertGreater(issue.updated_time, self.issue.updated_time)
+
+    def test_stale_if_match_is_rejected(self):
+        self.client.patch(self.issue_url, {'title': "First"}, HTTP_IF_MATCH='"1"')
+        response = self.client.patch(
+            self.issue_url, {'title': "Second"}, HTTP_IF_MATCH='"1"'
+        )
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertEqual(Issue.objects.get().title, "First")
+        self.assertEqual(OutboxEvent.objects.count(), 1)
+
+    def test_weak_or_invalid_etags_never_match(self):
+        for header in ('W/"1"', 'abc', '"x"'):
+            response = self.client.patch(
+                self.comment_url, {'content': "Edited"}, HTTP_IF_MATCH=header
+            )
+            self.assertEqual(response.status_code, 412)
+
+    def test_if_match_lists_and_wildcard(self):
+        response = self.client.put(
+            self.project_url,
+            {'title': "New", 'description': "Desc", 'type': "front-end"},
+            HTTP_IF_MATCH='"7", "1"'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['ETag'], '"2"')
+        response = self.client.patch(
+            self.project_url, {'title': "Again"}, HTTP_IF_MATCH='*'
+        )
+        self.assertEqual(response['ETag'], '"3"')
+
+    def test_unconditional_writes_still_bump_the_version(self):
+        stale = Issue.objects.get()
+        self.client.patch(self.issue_url, {'title': "API"})
+        # Une copie périmée n'écrase pas la version incrémentée entre-temps
+        stale.status = Issue.STATUS_FINISHED
+        stale.save()
+        self.assertEqual(stale.version, 3)
+        self.assertEqual(self.client.get(self.issue_url)['ETag'], '"3"')
+
+
+class BulkTransitionTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='user1', email='user1@example.com', age=25, password='pass123'
+        )
+        self.other = User.objects.create_user(
+            username='user2', email='user2@example.com', age=25, password='pass123'
+        )
+        self.project = Project.objects.create(
+            title="Test Project", description="Description", type="back-end",
+            creator=self.user
+        )
+        Contributor.objects.create(contributor=self.other, project=self.project)
+        self.issues = [
+            Issue.objects.create(
+                title=f"Issue {index}", description="Description",
+                project=self.project, creator=self.user
+            )
+            for index in range(3)
+        ]
+        self.foreign = Issue.objects.create(
+            title="Other", description="Description",
+            project=self.project, creator=self.other
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = f"/api/projects/{self.project.id}/issues/bulk/"
+        self.ids = [issue.id for issue in self.issues]
+
+    def test_ids_are_transitioned_in_one_update(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, {
+                'ids': self.ids, 'status': "In Progress", 'assignee': 'user2'
+            }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data'], {'matched': 3, 'updated': 3})
+        updates = [
+            query for query in queries
+            if query['sql'].startswith('UPDATE "api_issue"')
+        ]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(
+            set(Issue.objects.filter(pk__in=self.ids).values_list(
+                'status', 'assignee', 'version'
+            )),
+            {("In Progress", self.other.id, 2)}
+        )
+        events = OutboxEvent.objects.filter(action='updated')
+        self.assertEqual(events.count(), 3)
+        self.assertEqual(events.first().payload['assignee_username'], 'user2')
+
+    def test_issues_already_in_state_are_not_rewritten(self):
+        Issue.objects.filter(pk__in=self.ids[:2]).update(priority="HIGH")
+        response = self.client.post(
+            self.url, {'ids': self.ids, 'priority': "HIGH"}, format='json'
+        )
+        self.assertEqual(response.data['data'], {'matched': 3, 'updated': 1})
+        self.assertEqual(Issue.objects.get(pk=self.ids[0]).version, 1)
+
+    def test_filter_selects_only_own_issues(self):
+        Issue.objects.filter(pk=self.ids[0]).update(status="Finished")
+        response = self.client.post(self.url, {
+            'filter': {'status': ["To Do"]}, 'status': "In Progress"
+        }, format='json')
+        self.assertEqual(response.data['data'], {'matched': 2, 'updated': 2})
+        self.foreign.refresh_from_db()
+        self.assertEqual(self.foreign.status, "To Do")
+
+    def test_unassign_with_null(self):
+        Issue.objects.filter(pk__in=self.ids).update(assignee=self.other)
+        response = self.client.post(
+            self.url, {'ids': self.ids, 'assignee': None}, format='json'
+        )
+        self.assertEqual(response.data['data']['updated'], 3)
+        self.assertFalse(Issue.objects.filter(assignee__isnull=False).exists())
+
+    def test_invalid_requests(self):
+        cases = [
+            ({'ids': [self.foreign.id], 'status': "Finished"}, 403),
+            ({'ids': [self.ids[0], 999999], 'status': "Finished"}, 404),
+            ({'ids': self.ids, 'filter': {}, 'status': "Finished"}, 400),
+            ({'ids': self.ids}, 400),
+            ({'ids': self.ids, 'status': "Unknown"}, 400),
+            ({'ids': self.ids, 'assignee': 'nobody'}, 400),
+        ]
+        for body, expected in cases:
+            response = self.client.post(self.url, body, format='json')
+            self.assertEqual(response.status_code, expected, body)
+        self.assertEqual(Issue.objects.filter(status="Finished").count(), 0)
+
+    def test_non_member_assignee_and_outsider(self):
+        outsider = User.objects.create_user(
+            username='user3', email='user3@example.com', age=25, password='pass123'
+        )
+        response = self.client.post(
+            self.url, {'ids': self.ids, 'assignee': 'user3'}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.client.force_authenticate(user=outsider)
+        response = self.client.post(
+            self.url, {'ids': self.ids, 'status': "Finished"}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class DescriptionExcerptTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='user1', email='user1@example.com', age=25, password='pass123'
+        )
+        self.long_text = "Lorem   ipsum\n" + "dolor sit amet " * 100
+        self.project = Project.objects.create(
+            title="Test Project", description=self.long_text, type="back-end",
+            creator=self.user
+        )
+        self.issue = Issue.objects.create(
+            title="Issue", description=self.long_text,
+            project=self.project, creator=self.user
+        )
+        self.client.force_authenticate(user=self.user)
+        self.project_url = f"/api/projects/{self.project.id}/"
+        self.issue_url = f"{self.project_url}issues/{self.issue.id}/"
+
+    def test_excerpt_is_computed_on_save(self):
+        self.assertEqual(self.issue.description_excerpt, make_excerpt(self.long_text))
+        self.assertTrue(self.issue.description_excerpt.startswith("Lorem ipsum dolor"))
+        self.assertEqual(len(self.issue.description_excerpt), EXCERPT_LENGTH)
+        self.assertTrue(self.issue.description_excerpt.endswith("…"))
+
+        self.issue.description = "Short"
+        self.issue.save(update_fields=['description'])
+        self.assertEqual(Issue.objects.get().description_excerpt, "Short")
+
+    def test_lists_serve_the_excerpt_without_reading_descriptions(self):
+        for url in ("/api/projects/", f"{self.project_url}issues/"):
+            cache.clear()
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            item = response.data['data']['results'][0]
+            self.assertNotIn('description', item)
+            self.assertEqual(item['description_excerpt'], make_excerpt(self.long_text))
+            # Ni les descriptions listées ni celle du projet parent
+            self.assertFalse(any(
+                f'"{table}"."description"{end}' in query['sql']
+                for query in queries
+                for table in ('api_project', 'api_issue')
+                for end in (',', ' ')
+            ))
+
+    def test_full_description_is_only_in_detail(self):
+        for url in (self.project_url, self.issue_url):
+            data = self.client.get(url).data['data']
+            self.assertEqual(data['description'], self.long_text)
+            self.assertIn('description_excerpt', data)
+        response = self.client.get(
+            f"{self.project_url}issues/", {'fields': 'title,description'}
+        )
+        self.assertEqual(
+            list(response.data['data']['results'][0]), ['title']
+        )
+
+    def test_conditional_update_refreshes_the_excerpt(self):
+        response = self.client.patch(
+            self.issue_url, {'description': "Nouvelle description"},
+            HTTP_IF_MATCH='"1"'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data['data']['description_excerpt'], "Nouvelle description"
+        )
+        self.assertEqual(
+            Issue.objects.get().description_excerpt, "Nouvelle description"
+        )
@@ -0,0 +1,28 @@
+"""
+Comportement commun des modèles suivis par la synchronisation incrémentale
+(voir api.changes). Ce module n'importe aucun modèle : users.models peut
+l'utiliser sans import circulaire.
+"""
+from django.db import router, transaction
+
+
+class ChangeTrackedMixin:
+    """
+    Mixin des modèles suivis.
+
+    - La sauvegarde s'exécute dans une transaction : la séquence réservée par
+      `stamp_change` reste verrouillée jusqu'à la validation de la ligne qui la
+      porte, si bien que les séquences sont validées dans l'ordre.
+    - La suppression regroupe les tombstones de toute la cascade : une seule
+      séquence et un seul INSERT groupé.
+    """
+
+    def save(self, *args, **kwargs):
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        from .changes import batched_tombstones  # api.changes importe les modèles
+        with batched_tombstones():
+            return super().delete(*args, **kwargs)
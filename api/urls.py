@@ -1,15 +1,27 @@
 from django.urls import path
 from .views import (
-    ProjectCreateView, ProjectListView, ProjectDetailView,
-    IssueCreateView, IssueListView, IssueDetailView,
-    CommentCreateView, CommentListView, CommentDetailView
+    ProjectCreateView, ProjectListView, ProjectDetailView, ProjectRestoreView,
+    IssueCreateView, IssueListView, IssueDetailView, IssueRestoreView,
+    IssueBulkUpdateView,
+    CommentCreateView, CommentListView, CommentDetailView,
+    ProjectChangesView
 )
+from .events import project_events
 
 urlpatterns = [
     # Gestion des projets
     path('create/', ProjectCreateView.as_view(), name='project-create'),
     path('', ProjectListView.as_view(), name='project-list'),
     path('<int:pk>/', ProjectDetailView.as_view(), name='project-detail'),
+    path(
+        '<int:pk>/restore/', ProjectRestoreView.as_view(), name='project-restore'
+    ),
+    path('<int:project_id>/events/', project_events, name='project-events'),
+    path(
+        '<int:project_id>/changes/',
+        ProjectChangesView.as_view(),
+        name='project-changes'
+    ),
 
     # Gestion des issues
     path(
@@ -18,11 +30,21 @@ urlpatterns = [
         name='issue-create'
     ),
     path('<int:project_id>/issues/', IssueListView.as_view(), name='issue-list'),
+    path(
+        '<int:project_id>/issues/bulk/',
+        IssueBulkUpdateView.as_view(),
+        name='issue-bulk-update'
+    ),
     path(
         '<int:project_id>/issues/<int:pk>/',
         IssueDetailView.as_view(),
         name='issue-detail'
     ),
+    path(
+        '<int:project_id>/issues/<int:pk>/restore/',
+        IssueRestoreView.as_view(),
+        name='issue-restore'
+    ),
 
     # Gestion des commentaires
     path(
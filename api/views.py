@@ -1,11 +1,130 @@
 from rest_framework import generics, permissions, status
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
 from rest_framework.response import Response
-from django.db.models import Q
-from .models import Project, Issue, Comment
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Prefetch
+from django.utils import timezone
+from .models import Project, Issue, Comment, OutboxEvent
 from users.models import Contributor
-from .serializers import ProjectSerializer, IssueSerializer, CommentSerializer
+from users.serializers import ContributorSerializer
+from .serializers import (
+    ProjectSerializer, IssueSerializer, CommentSerializer, IssueTransitionSerializer,
+    Expansion, expanded_attr
+)
 from .permissions import IsContributor, IsCreator
+from .outbox import record_event, record_issue_events
+from .changes import get_changes, next_change_seq
+from .nested import NestedResourceMixin
+from .fragments import FragmentCacheMixin
+from .singleflight import SingleFlightMixin
+from .concurrency import VersionedResourceMixin
+from .softdelete import soft_delete, restore, can_restore, restore_deadline
+
+
+class SparseFieldsetMixin:
+    """
+    Mixin de vue pour les représentations partielles, limité aux lectures :
+    `?fields=a,b` restreint les champs rendus et les colonnes lues (`.only()`),
+    `?expand=x` intègre les relations déclarées dans `expansions` grâce à un
+    préchargement groupé plafonné à `EXPAND_LIMIT` éléments par objet.
+    """
+    expansions = {}
+    # Colonnes toujours lues, même quand `?fields=` ne les demande pas
+    required_columns = ()
+    # Représentation résumée (listes) : les champs `detail_only_fields` du
+    # serializer ne sont ni rendus ni lus
+    summary = False
+
+    def get_query_list(self, param):
+        if self.request.method not in permissions.SAFE_METHODS:
+            return []
+        value = self.request.query_params.get(param, '')
+        return [name.strip() for name in value.split(',') if name.strip()]
+
+    def get_requested_fields(self):
+        serializer_class = self.get_serializer_class()
+        allowed = set(serializer_class.sparse_fields)
+        if self.summary:
+            allowed -= set(serializer_class.detail_only_fields)
+        return [name for name in self.get_query_list('fields') if name in allowed]
+
+    def get_requested_expansions(self):
+        return {
+            name: self.expansions[name]
+            for name in self.get_query_list('expand') if name in self.expansions
+        }
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fields'] = self.get_requested_fields()
+        context['expand'] = self.get_requested_expansions()
+        context['summary'] = self.summary
+        return context
+
+    def get_expansion_limit(self, name):
+        """Nombre maximal d'objets intégrés par objet pour la relation `name`."""
+        return getattr(settings, 'EXPAND_LIMIT', 20)
+
+    def narrow_queryset(self, queryset):
+        fields = self.get_requested_fields()
+        if fields:
+            sparse_fields = self.get_serializer_class().sparse_fields
+            columns = {queryset.model._meta.pk.name, *self.required_columns}
+            relations = set()
+            for name in fields:
+                for column in sparse_fields[name]:
+                    columns.add(column)
+                    if '__' in column:
+                        relations.add(column.rsplit('__', 1)[0])
+            queryset = queryset.select_related(None)\
+                .select_related(*relations)\
+                .only(*columns)
+        elif self.summary:
+            serializer_class = self.get_serializer_class()
+            queryset = queryset.defer(*[
+                column
+                for name in serializer_class.detail_only_fields
+                for column in serializer_class.sparse_fields[name]
+            ])
+
+        expansions = self.get_requested_expansions()
+        if expansions:
+            # Les préchargements par défaut sont remplacés par ceux demandés. Le
+            # découpage est traduit par Django en ROW_NUMBER() OVER (PARTITION BY
+            # …) : une requête, au plus `limit` lignes par objet de la page.
+            queryset = queryset.prefetch_related(None).prefetch_related(*[
+                Prefetch(
+                    expansion.relation,
+                    queryset=expansion.queryset()[:self.get_expansion_limit(name)],
+                    to_attr=expanded_attr(name)
+                )
+                for name, expansion in expansions.items()
+            ])
+        return queryset
+
+
+# Membres d'un projet, avec leur utilisateur, en une requête pour toute la page
+CONTRIBUTORS_PREFETCH = Prefetch(
+    'contributor_set', queryset=Contributor.objects.select_related('contributor')
+)
+
+PROJECT_EXPANSIONS = {
+    'contributors': Expansion(
+        'contributor_set',
+        ContributorSerializer,
+        lambda: Contributor.objects.select_related('contributor').order_by('id')
+    ),
+}
+
+ISSUE_EXPANSIONS = {
+    'comments': Expansion(
+        'comments',
+        CommentSerializer,
+        lambda: Comment.objects.select_related('creator')
+        .order_by('-created_time', '-id')
+    ),
+}
 
 
 class ProjectCreateView(generics.CreateAPIView):
@@ -17,10 +136,9 @@ class ProjectCreateView(generics.CreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def perform_create(self, serializer):
-        # Sauvegarde le projet avec l'utilisateur actuel comme créateur
-        project = serializer.save(creator=self.request.user)
-        # Ajoute l'utilisateur actuel en tant que contributeur du projet
-        Contributor.objects.create(contributor=self.request.user, project=project)
+        # Sauvegarde le projet avec l'utilisateur actuel comme créateur ;
+        # Project.save l'ajoute en tant que contributeur du projet
+        serializer.save(creator=self.request.user)
 
     def create(self, request, *args, **kwargs):
         response = super().create(request, *args, **kwargs)
@@ -31,22 +149,26 @@ class ProjectCreateView(generics.CreateAPIView):
         })
 
 
-class ProjectListView(generics.ListAPIView):
+class ProjectListView(SparseFieldsetMixin, generics.ListAPIView):
     """
     Vue pour lister tous les projets auxquels l'utilisateur est associé, soit en tant
-    que créateur soit en tant que contributeur.
+    que créateur soit en tant que contributeur. La description complète est
+    réservée au détail : la liste renvoie son extrait.
     """
     serializer_class = ProjectSerializer
     permission_classes = [permissions.IsAuthenticated]
+    summary = True
+    expansions = PROJECT_EXPANSIONS
 
     def get_queryset(self):
-        return Project.objects.filter(
-            Q(creator=self.request.user)
-            | Q(contributor_set__contributor=self.request.user)
-        ).select_related('creator')\
-         .prefetch_related('contributors')\
-         .distinct()\
-         .order_by('-created_time')
+        # Semi-jointure sur l'index unique (contributeur, projet) : le créateur
+        # étant toujours contributeur, ni OR ni DISTINCT ne sont nécessaires.
+        memberships = Contributor.objects.filter(contributor=self.request.user)\
+            .values('project_id')
+        return self.narrow_queryset(Project.objects.filter(pk__in=memberships)
+                                    .select_related('creator')
+                                    .prefetch_related(CONTRIBUTORS_PREFETCH)
+                                    .order_by('-created_time'))
 
     def list(self, request, *args, **kwargs):
         response = super().list(request, *args, **kwargs)
@@ -63,15 +185,22 @@ class ProjectListView(generics.ListAPIView):
         })
 
 
-class ProjectDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ProjectDetailView(
+    SingleFlightMixin, VersionedResourceMixin, NestedResourceMixin,
+    SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView
+):
     """
     Vue pour récupérer, mettre à jour ou supprimer un projet.
     La suppression et la mise à jour sont réservées aux créateurs du projet.
     """
     queryset = Project.objects.all().select_related('creator')\
-        .prefetch_related('contributors')
+        .prefetch_related(CONTRIBUTORS_PREFETCH)
     serializer_class = ProjectSerializer
     permission_classes = [permissions.IsAuthenticated, IsContributor]
+    expansions = PROJECT_EXPANSIONS
+
+    def get_queryset(self):
+        return self.narrow_queryset(super().get_queryset())
 
     def get_permissions(self):
         # Différencie les permissions pour les méthodes sécurisées et non sécurisées
@@ -93,50 +222,75 @@ class ProjectDetailView(generics.RetrieveUpdateDestroyAPIView):
             "data": response.data
         })
 
+    def perform_destroy(self, instance):
+        # Suppression logique : les issues et commentaires sont purgés plus tard
+        soft_delete(instance)
+
     def destroy(self, request, *args, **kwargs):
-        super().destroy(request, *args, **kwargs)
-        return Response(
-            {"message": "Le projet a été supprimé avec succès."},
-            status=status.HTTP_200_OK
-        )
+        project = self.get_object()
+        self.perform_destroy(project)
+        return Response({
+            "message": "Le projet a été supprimé avec succès.",
+            "data": {"restore_before": restore_deadline(project)}
+        }, status=status.HTTP_200_OK)
+
+
+class RestoreMixin:
+    """
+    Mixin de vue restaurant un objet supprimé tant que le délai d'annulation
+    n'est pas écoulé (410 ensuite). Réservé au créateur de l'objet.
+    """
+    permission_classes = [permissions.IsAuthenticated, IsCreator]
+    restored_message = None
+
+    def perform_restore(self, instance):
+        restore(instance)
+
+    def post(self, request, *args, **kwargs):
+        instance = self.get_object()
+        if not can_restore(instance):
+            return Response(
+                {"detail": "Le délai d'annulation de la suppression est dépassé."},
+                status=status.HTTP_410_GONE
+            )
+        self.perform_restore(instance)
+        return Response({
+            "message": self.restored_message,
+            "data": self.get_serializer(instance).data
+        })
 
 
-class IssueCreateView(generics.CreateAPIView):
+class ProjectRestoreView(RestoreMixin, NestedResourceMixin, generics.GenericAPIView):
+    """
+    Vue pour restaurer un projet supprimé.
+    """
+    queryset = Project.all_objects.filter(deleted_at__isnull=False)\
+        .select_related('creator').prefetch_related(CONTRIBUTORS_PREFETCH)
+    serializer_class = ProjectSerializer
+    restored_message = "Projet restauré avec succès."
+
+
+class IssueCreateView(NestedResourceMixin, generics.CreateAPIView):
     """
     Vue pour créer une issue dans un projet spécifique.
     Seuls les contributeurs peuvent créer des issues.
     """
     serializer_class = IssueSerializer
     permission_classes = [permissions.IsAuthenticated, IsContributor]
+    nested_level = 'issue'
 
-    def get_project(self):
-        # Récupère le projet pour l'ID spécifié
-        project = Project.objects.get(pk=self.kwargs['project_id'])
-        # Vérifie si l'utilisateur est un contributeur du projet ou le créateur
-        is_contributor = Contributor.objects.filter(
-            project=project, contributor=self.request.user
-        ).exists()
-        if not is_contributor and project.creator != self.request.user:
-            raise PermissionDenied("Vous n'êtes pas contributeur de ce projet.")
-        return project
+    def get_serializer_context(self):
+        # Le projet est chargé avec la vérification d'appartenance, avant la
+        # validation de l'assignee qui en a besoin
+        context = super().get_serializer_context()
+        context['project'] = self.get_parent()
+        return context
 
+    @transaction.atomic
     def perform_create(self, serializer):
-        project = self.get_project()
-        assignee_username = serializer.validated_data.get('assignee', None)
-
-        # Vérification de l'assignee
-        if assignee_username:
-            is_contributor = Contributor.objects.filter(
-                project=project,
-                contributor__username=assignee_username
-            ).exists()
-            if not is_contributor:
-                raise PermissionDenied(
-                    "L'utilisateur assigné doit être contributeur du projet."
-                )
-
         # Sauvegarde de l'issue avec le projet et le créateur
-        serializer.save(project=project, creator=self.request.user)
+        issue = serializer.save(project=self.get_parent(), creator=self.request.user)
+        record_event(issue, OutboxEvent.ACTION_CREATED, serializer.data)
 
     def create(self, request, *args, **kwargs):
         response = super().create(request, *args, **kwargs)
@@ -146,21 +300,58 @@ class IssueCreateView(generics.CreateAPIView):
         })
 
 
-class IssueListView(generics.ListAPIView):
+class IssueListView(
+    NestedResourceMixin, SparseFieldsetMixin, SingleFlightMixin, FragmentCacheMixin,
+    generics.ListAPIView
+):
     """
-    Vue pour lister toutes les issues d'un projet spécifique.
+    Vue pour lister toutes les issues d'un projet spécifique, avec l'extrait de
+    leur description (texte complet dans le détail).
     """
-    queryset = Issue.objects.select_related('creator', 'project')
+    queryset = Issue.objects.select_related('creator', 'assignee')
     serializer_class = IssueSerializer
     permission_classes = [permissions.IsAuthenticated, IsContributor]
+    expansions = ISSUE_EXPANSIONS
+    nested_level = 'issue'
+    summary = True
+
+    def get_comments_preview(self):
+        """
+        Nombre de derniers commentaires à intégrer par issue (`?comments=N`),
+        plafonné à EXPAND_LIMIT ; 0 sans le paramètre.
+        """
+        value = self.request.query_params.get('comments')
+        if not value:
+            return 0
+        try:
+            count = int(value)
+        except ValueError:
+            count = -1
+        if count < 0:
+            raise ValidationError(
+                {"comments": "Le nombre de commentaires doit être un entier positif."}
+            )
+        return min(count, getattr(settings, 'EXPAND_LIMIT', 20))
+
+    def get_requested_expansions(self):
+        expansions = super().get_requested_expansions()
+        if self.get_comments_preview():
+            expansions['comments'] = self.expansions['comments']
+        return expansions
+
+    def get_expansion_limit(self, name):
+        if name == 'comments' and self.get_comments_preview():
+            return self.get_comments_preview()
+        return super().get_expansion_limit(name)
 
     def get_queryset(self):
-        # Filtre les issues par projet et les trie par date de création
-        project = Project.objects.get(pk=self.kwargs['project_id'])
-        return Issue.objects.filter(project=project)\
-            .select_related('creator')\
-            .prefetch_related('comments')\
-            .order_by('-created_time')
+        # Filtre les issues par projet et les trie par date de création ; les
+        # commentaires ne sont chargés que sur demande (?comments=N, ?expand=).
+        # Le projet n'est pas joint : seul `project_id` est rendu.
+        project = self.get_parent()
+        return self.narrow_queryset(Issue.objects.filter(project=project)
+                                    .select_related('creator', 'assignee')
+                                    .order_by('-created_time'))
 
     def list(self, request, *args, **kwargs):
         response = super().list(request, *args, **kwargs)
@@ -170,7 +361,10 @@ class IssueListView(generics.ListAPIView):
         })
 
 
-class IssueDetailView(generics.RetrieveUpdateDestroyAPIView):
+class IssueDetailView(
+    VersionedResourceMixin, NestedResourceMixin, SparseFieldsetMixin,
+    generics.RetrieveUpdateDestroyAPIView
+):
     """
     Vue pour récupérer, mettre à jour ou supprimer une issue spécifique.
     Seul le créateur peut modifier ou supprimer.
@@ -178,6 +372,11 @@ class IssueDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = Issue.objects.select_related('creator', 'project')
     serializer_class = IssueSerializer
     permission_classes = [permissions.IsAuthenticated, IsContributor]
+    expansions = ISSUE_EXPANSIONS
+    nested_level = 'issue'
+
+    def get_queryset(self):
+        return self.narrow_queryset(super().get_queryset())
 
     def get_permissions(self):
         if self.request.method in permissions.SAFE_METHODS:
@@ -192,39 +391,131 @@ class IssueDetailView(generics.RetrieveUpdateDestroyAPIView):
         })
 
     def update(self, request, *args, **kwargs):
-        issue = self.get_object()
-        assignee_username = request.data.get('assignee', None)
-
-        if assignee_username:
-            is_contributor = Contributor.objects.filter(
-                project=issue.project,
-                contributor__username=assignee_username
-            ).exists()
-            if not is_contributor:
-                return Response(
-                    {
-                        "message": (
-                            "L'utilisateur assigné doit être contributeur du projet."
-                        )
-                    },
-                    status=status.HTTP_403_FORBIDDEN
-                )
-
+        # L'assignee est vérifié par IssueSerializer.validate_assignee
         response = super().update(request, *args, **kwargs)
         return Response({
             "message": "Issue mise à jour avec succès.",
             "data": response.data
         })
 
+    @transaction.atomic
+    def perform_update(self, serializer):
+        issue = serializer.save()
+        record_event(issue, OutboxEvent.ACTION_UPDATED, serializer.data)
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        record_event(instance, OutboxEvent.ACTION_DELETED)
+        soft_delete(instance)
+
     def destroy(self, request, *args, **kwargs):
-        super().destroy(request, *args, **kwargs)
-        return Response(
-            {"message": "L'issue a été supprimée avec succès."},
-            status=status.HTTP_200_OK
+        issue = self.get_object()
+        self.perform_destroy(issue)
+        return Response({
+            "message": "L'issue a été supprimée avec succès.",
+            "data": {"restore_before": restore_deadline(issue)}
+        }, status=status.HTTP_200_OK)
+
+
+class IssueRestoreView(RestoreMixin, NestedResourceMixin, generics.GenericAPIView):
+    """
+    Vue pour restaurer une issue supprimée d'un projet.
+    """
+    queryset = Issue.all_objects.filter(deleted_at__isnull=False)\
+        .select_related('creator', 'project')
+    serializer_class = IssueSerializer
+    nested_level = 'issue'
+    restored_message = "Issue restaurée avec succès."
+
+    @transaction.atomic
+    def perform_restore(self, instance):
+        restore(instance)
+        record_event(
+            instance, OutboxEvent.ACTION_CREATED, self.get_serializer(instance).data
         )
 
 
-class CommentCreateView(generics.CreateAPIView):
+class IssueBulkUpdateView(NestedResourceMixin, generics.GenericAPIView):
+    """
+    Vue de transition groupée des issues d'un projet : un seul UPDATE applique
+    les nouvelles valeurs (status, priority, tag, assignee) aux issues
+    désignées par `ids` ou par `filter`. Comme pour la modification unitaire,
+    seules les issues créées par l'utilisateur peuvent être modifiées.
+    """
+    serializer_class = IssueTransitionSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    nested_level = 'issue'
+
+    def get_serializer_context(self):
+        # Appartenance au projet vérifiée une fois, avant celle de l'assignee
+        context = super().get_serializer_context()
+        context['project'] = self.get_parent()
+        return context
+
+    def get_selection(self, data):
+        """
+        Retourne les issues sélectionnées et leur nombre. Un filtre ne retient
+        que les issues de l'utilisateur ; des identifiants absents du projet
+        donnent un 404, ceux d'issues d'autres créateurs un 403.
+        """
+        issues = Issue.objects.filter(project=self.get_parent())
+        if 'filter' in data:
+            lookups = {
+                f'{name}__in': values for name, values in data['filter'].items()
+            }
+            selection = issues.filter(creator=self.request.user, **lookups)
+            return selection, selection.count()
+
+        ids = set(data['ids'])
+        creators = dict(issues.filter(pk__in=ids).values_list('pk', 'creator_id'))
+        missing = sorted(ids - creators.keys())
+        if missing:
+            raise NotFound(
+                f"Issue(s) introuvable(s) dans ce projet : "
+                f"{', '.join(map(str, missing))}."
+            )
+        if any(creator != self.request.user.pk for creator in creators.values()):
+            raise PermissionDenied("Seul le créateur d'une issue peut la modifier.")
+        return issues.filter(pk__in=ids), len(ids)
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        changes = {
+            name: data[name]
+            for name in IssueTransitionSerializer.CHANGES if name in data
+        }
+        selection, matched = self.get_selection(data)
+
+        with transaction.atomic():
+            # Les issues déjà dans l'état demandé ne sont pas réécrites. La
+            # mise à jour ensembliste affecte elle-même séquence, date et version.
+            change_seq = next_change_seq()
+            updated = selection.exclude(**changes).update(
+                **changes,
+                change_seq=change_seq,
+                updated_time=timezone.now(),
+                version=F('version') + 1,
+            )
+            if updated:
+                issues = list(
+                    Issue.objects.filter(
+                        project=self.get_parent(), change_seq=change_seq
+                    ).select_related('creator', 'project', 'assignee')
+                )
+                record_issue_events(
+                    issues, OutboxEvent.ACTION_UPDATED,
+                    IssueSerializer(issues, many=True).data
+                )
+
+        return Response({
+            "message": "Transition appliquée avec succès.",
+            "data": {"matched": matched, "updated": updated}
+        })
+
+
+class CommentCreateView(NestedResourceMixin, generics.CreateAPIView):
     """
     Vue pour créer un commentaire dans une issue spécifique. Seuls les contributeurs du
     projet parent peuvent ajouter des commentaires.
@@ -232,25 +523,14 @@ class CommentCreateView(generics.CreateAPIView):
     queryset = Comment.objects.all()
     serializer_class = CommentSerializer
     permission_classes = [permissions.IsAuthenticated, IsContributor]
+    nested_level = 'comment'
 
-    def get_issue(self):
-        issue = Issue.objects.get(pk=self.kwargs['issue_id'])
-        project = issue.project
-        # Vérifie si l'utilisateur est contributeur ou créateur du projet
-        if (
-            not Contributor.objects.filter(
-                project=project, contributor=self.request.user
-            ).exists()
-            and project.creator != self.request.user
-        ):
-            raise PermissionDenied("Vous n'êtes pas contributeur de ce projet.")
-        return issue
-
+    @transaction.atomic
     def perform_create(self, serializer):
-        issue = Issue.objects.get(pk=self.kwargs['issue_id'])
-        # Forcer l'évaluation de la permission
-        self.check_object_permissions(self.request, issue)
-        serializer.save(creator=self.request.user, issue=issue)
+        # L'issue est chargée avec la vérification d'appartenance au projet
+        issue = self.get_parent()
+        comment = serializer.save(creator=self.request.user, issue=issue)
+        record_event(comment, OutboxEvent.ACTION_CREATED, serializer.data)
 
     def create(self, request, *args, **kwargs):
         response = super().create(request, *args, **kwargs)
@@ -260,18 +540,21 @@ class CommentCreateView(generics.CreateAPIView):
         })
 
 
-class CommentListView(generics.ListAPIView):
+class CommentListView(
+    NestedResourceMixin, SparseFieldsetMixin, FragmentCacheMixin, generics.ListAPIView
+):
     """
     Vue pour lister tous les commentaires d'une issue spécifique.
     """
     serializer_class = CommentSerializer
     permission_classes = [permissions.IsAuthenticated, IsContributor]
+    nested_level = 'comment'
 
     def get_queryset(self):
-        issue = Issue.objects.get(pk=self.kwargs['issue_id'])
-        return Comment.objects.filter(issue=issue)\
-            .select_related('creator')\
-            .order_by('-created_time')
+        issue = self.get_parent()
+        return self.narrow_queryset(Comment.objects.filter(issue=issue)
+                                    .select_related('creator')
+                                    .order_by('-created_time'))
 
     def list(self, request, *args, **kwargs):
         response = super().list(request, *args, **kwargs)
@@ -281,7 +564,10 @@ class CommentListView(generics.ListAPIView):
         })
 
 
-class CommentDetailView(generics.RetrieveUpdateDestroyAPIView):
+class CommentDetailView(
+    VersionedResourceMixin, NestedResourceMixin, SparseFieldsetMixin,
+    generics.RetrieveUpdateDestroyAPIView
+):
     """
     Vue pour récupérer, mettre à jour ou supprimer un commentaire spécifique.
     Seul le créateur peut modifier ou supprimer un commentaire.
@@ -289,6 +575,10 @@ class CommentDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = Comment.objects.select_related('creator', 'issue')
     serializer_class = CommentSerializer
     permission_classes = [permissions.IsAuthenticated, IsContributor]
+    nested_level = 'comment'
+
+    def get_queryset(self):
+        return self.narrow_queryset(super().get_queryset())
 
     def get_permissions(self):
         if self.request.method in permissions.SAFE_METHODS:
@@ -309,8 +599,63 @@ class CommentDetailView(generics.RetrieveUpdateDestroyAPIView):
             "data": response.data
         })
 
+    @transaction.atomic
+    def perform_update(self, serializer):
+        comment = serializer.save()
+        record_event(comment, OutboxEvent.ACTION_UPDATED, serializer.data)
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        record_event(instance, OutboxEvent.ACTION_DELETED)
+        instance.delete()
+
     def destroy(self, request, *args, **kwargs):
         super().destroy(request, *args, **kwargs)
         return Response({
             "message": "Le commentaire a été supprimée avec succès."
         }, status=status.HTTP_200_OK)
+
+
+class ProjectChangesView(NestedResourceMixin, generics.GenericAPIView):
+    """
+    Vue de synchronisation incrémentale : retourne le projet, les issues, les
+    commentaires et les contributeurs modifiés depuis le curseur `since`, ainsi
+    que les suppressions sous forme de tombstones et le nouveau curseur.
+    """
+    queryset = Project.objects.select_related('creator')
+    permission_classes = [permissions.IsAuthenticated, IsContributor]
+
+    def get(self, request, *args, **kwargs):
+        try:
+            since = int(request.query_params.get('since', 0))
+        except ValueError:
+            raise ValidationError({"since": "Le curseur doit être un entier."})
+        if since < 0:
+            raise ValidationError({"since": "Le curseur doit être positif."})
+
+        project = self.get_object()
+        changes = get_changes(project, since)
+        context = self.get_serializer_context()
+        return Response({
+            "message": "Modifications récupérées avec succès.",
+            "data": {
+                "cursor": changes['cursor'],
+                "has_more": changes['has_more'],
+                "project": ProjectSerializer(
+                    changes['project'], context=context
+                ).data if changes['project'] else None,
+                "issues": IssueSerializer(
+                    changes['issues'], many=True, context=context
+                ).data,
+                "comments": CommentSerializer(
+                    changes['comments'], many=True, context=context
+                ).data,
+                "contributors": ContributorSerializer(
+                    changes['contributors'], many=True, context=context
+                ).data,
+                "deleted": [
+                    {"model": tombstone.model, "id": tombstone.object_id}
+                    for tombstone in changes['deleted']
+                ],
+            }
+        })
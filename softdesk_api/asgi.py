@@ -3,6 +3,10 @@ ASGI config for softdesk_api project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Le flux Server-Sent Events des projets (/api/projects/<id>/events/) est une vue
+asynchrone : servi par ce point d'entrée (uvicorn, daphne...), chaque connexion
+inactive ne mobilise aucun thread.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
 """
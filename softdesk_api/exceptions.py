@@ -1,6 +1,8 @@
 from rest_framework.views import exception_handler
 from rest_framework import status
 
+from . import metrics
+
 
 def custom_exception_handler(exc, context):
     response = exception_handler(exc, context)
@@ -17,6 +19,11 @@ def custom_exception_handler(exc, context):
         }
     # Personnalisation du message pour un 401 Unauthorized
     elif response is not None and response.status_code == status.HTTP_401_UNAUTHORIZED:
+        # Motif précis (ex. token_not_valid) lorsque le détail en porte un seul
+        codes = exc.get_codes()
+        metrics.AUTH_FAILURES.inc(
+            reason=codes if isinstance(codes, str) else exc.default_code
+        )
         response.data = {
             "message": (
                 "Authentification requise : veuillez fournir vos "
@@ -0,0 +1,431 @@
+"""
+Métriques de l'API au format d'exposition texte de Prometheus.
+
+Chaque processus écrit ses valeurs dans son propre fichier projeté en mémoire
+(`mmap`) sous `METRICS['DIRECTORY']` : enregistrer une mesure ne coûte qu'une
+recherche dans un dictionnaire et une écriture de 8 octets, sans appel système.
+L'endpoint `/metrics` (staff uniquement) additionne les fichiers de tous les
+workers : quel que soit le worker qui répond, les totaux sont ceux du
+déploiement. Les fichiers des workers arrêtés continuent de compter, comme
+l'attend un compteur Prometheus ; le répertoire est à vider au redémarrage
+complet du déploiement.
+
+Sont mesurés : les requêtes HTTP et leur durée par vue (`MetricsMiddleware`),
+le nombre et la durée des requêtes SQL par vue (wrapper d'exécution branché par
+`install()`), les consultations du cache de fragments et les échecs
+d'authentification (connexions refusées et réponses 401).
+"""
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db.backends.signals import connection_created
+from rest_framework import permissions
+from rest_framework.renderers import BaseRenderer
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .slow_queries import current_view
+
+DEFAULTS = {
+    'ENABLED': True,
+    'DIRECTORY': 'metrics',
+}
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Les autres méthodes sont regroupées sous "other" (cardinalité bornée)
+HTTP_METHODS = {'GET', 'HEAD', 'OPTIONS', 'POST', 'PUT', 'PATCH', 'DELETE'}
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+HEADER = struct.Struct('q')
+LENGTH = struct.Struct('i')
+VALUE = struct.Struct('d')
+INITIAL_SIZE = 64 * 1024
+
+REGISTRY = []
+
+_lock = threading.Lock()
+_store = None
+
+
+def get_setting(name):
+    """Retourne un paramètre des métriques (surchargeable via METRICS)."""
+    return getattr(settings, 'METRICS', {}).get(name, DEFAULTS[name])
+
+
+def get_directory():
+    """Répertoire des fichiers de valeurs (relatif à BASE_DIR s'il n'est pas absolu)."""
+    return Path(settings.BASE_DIR) / get_setting('DIRECTORY')
+
+
+def iter_entries(buffer, used):
+    """Parcourt les entrées (clé, valeur, position de la valeur) d'un fichier."""
+    position = HEADER.size
+    while position + LENGTH.size <= used:
+        length = LENGTH.unpack_from(buffer, position)[0]
+        start = position + LENGTH.size
+        padded = LENGTH.size + length
+        padded += -padded % 8
+        value_position = position + padded
+        if value_position + VALUE.size > used:
+            return
+        key = bytes(buffer[start:start + length]).decode('utf-8')
+        yield key, VALUE.unpack_from(buffer, value_position)[0], value_position
+        position = value_position + VALUE.size
+
+
+def read_file(path):
+    """Lit les valeurs d'un fichier, éventuellement en cours d'écriture."""
+    data = path.read_bytes()
+    if len(data) < HEADER.size:
+        return
+    used = min(HEADER.unpack_from(data, 0)[0], len(data))
+    for key, value, _ in iter_entries(data, used):
+        yield key, value
+
+
+class MappedFile:
+    """
+    Fichier de valeurs d'un processus. Après un en-tête de 8 octets (taille
+    utilisée), chaque entrée contient la longueur de sa clé (4 octets), la clé
+    en UTF-8 complétée pour aligner la valeur sur 8 octets, puis la valeur
+    (double). Seul le processus propriétaire écrit ; l'en-tête n'est mis à
+    jour qu'une fois l'entrée complète, les lecteurs ne voient donc jamais
+    d'entrée partielle.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.pid = os.getpid()
+        self.file = open(path, 'a+b')
+        size = os.fstat(self.file.fileno()).st_size
+        if size < INITIAL_SIZE:
+            self.file.truncate(INITIAL_SIZE)
+            size = INITIAL_SIZE
+        self.map = mmap.mmap(self.file.fileno(), size)
+        # Un fichier existant (pid réutilisé) est repris là où il s'est arrêté
+        self.used = HEADER.unpack_from(self.map, 0)[0] or HEADER.size
+        self.positions = {
+            key: position
+            for key, _, position in iter_entries(self.map, self.used)
+        }
+
+    def inc(self, key, amount):
+        position = self.positions.get(key)
+        if position is None:
+            position = self.add(key)
+        value = VALUE.unpack_from(self.map, position)[0]
+        VALUE.pack_into(self.map, position, value + amount)
+
+    def add(self, key):
+        encoded = key.encode('utf-8')
+        padded = LENGTH.size + len(encoded)
+        padded += -padded % 8
+        size = padded + VALUE.size
+        if self.used + size > len(self.map):
+            self.grow(self.used + size)
+        start = self.used + LENGTH.size
+        LENGTH.pack_into(self.map, self.used, len(encoded))
+        self.map[start:start + len(encoded)] = encoded
+        position = self.used + padded
+        VALUE.pack_into(self.map, position, 0.0)
+        self.used += size
+        HEADER.pack_into(self.map, 0, self.used)
+        self.positions[key] = position
+        return position
+
+    def grow(self, needed):
+        capacity = len(self.map)
+        while capacity < needed:
+            capacity *= 2
+        self.map.close()
+        self.file.truncate(capacity)
+        self.map = mmap.mmap(self.file.fileno(), capacity)
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+
+def get_store():
+    """Fichier du processus courant, rouvert après un fork."""
+    global _store
+    if _store is None or _store.pid != os.getpid():
+        directory = get_directory()
+        directory.mkdir(parents=True, exist_ok=True)
+        _store = MappedFile(directory / f'{os.getpid()}.db')
+    return _store
+
+
+def reset():
+    """Ferme le fichier du processus ; le prochain enregistrement le rouvre."""
+    global _store
+    with _lock:
+        if _store is not None and _store.pid == os.getpid():
+            _store.close()
+        _store = None
+
+
+def reset_on_setting_change(setting, **kwargs):
+    if setting in ('METRICS', 'BASE_DIR'):
+        reset()
+
+
+setting_changed.connect(reset_on_setting_change)
+
+
+def increment(*pairs):
+    """Ajoute chaque montant à sa clé, sous un seul verrou."""
+    if not get_setting('ENABLED'):
+        return
+    with _lock:
+        store = get_store()
+        for key, amount in pairs:
+            store.inc(key, amount)
+
+
+def sample_key(name, labels):
+    return json.dumps([name, list(labels)])
+
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    pairs = ','.join(
+        '{}="{}"'.format(
+            name,
+            value.replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"')
+        )
+        for name, value in labels
+    )
+    return '{' + pairs + '}'
+
+
+def format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+class Metric:
+    """
+    Métrique enregistrée. Les clés de fichier sont calculées une fois par
+    combinaison d'étiquettes puis mises en cache.
+    """
+    type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.keys = {}
+        REGISTRY.append(self)
+
+    def label_values(self, labels):
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+
+class Counter(Metric):
+    """Compteur monotone, éventuellement ventilé par étiquettes."""
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        values = self.label_values(labels)
+        key = self.keys.get(values)
+        if key is None:
+            key = self.keys[values] = sample_key(
+                self.name, zip(self.labelnames, values)
+            )
+        increment((key, amount))
+
+    def render(self, samples):
+        return [
+            f'{self.name}{format_labels(labels)} {format_value(value)}'
+            for labels, value in sorted(samples.get(self.name, {}).items())
+        ]
+
+
+class Histogram(Metric):
+    """
+    Histogramme : chaque observation incrémente un seul compartiment, la somme
+    et le compte ; les compartiments cumulés sont calculés à l'exposition.
+    """
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        self.bounds = [format_value(bound) for bound in self.buckets] + ['+Inf']
+
+    def observe(self, value, **labels):
+        values = self.label_values(labels)
+        keys = self.keys.get(values)
+        if keys is None:
+            labels = list(zip(self.labelnames, values))
+            keys = self.keys[values] = (
+                [
+                    sample_key(f'{self.name}_bucket', labels + [('le', bound)])
+                    for bound in self.bounds
+                ],
+                sample_key(f'{self.name}_sum', labels),
+                sample_key(f'{self.name}_count', labels),
+            )
+        buckets, total, count = keys
+        increment(
+            (buckets[bisect_left(self.buckets, value)], 1),
+            (total, value),
+            (count, 1),
+        )
+
+    def render(self, samples):
+        lines = []
+        buckets = samples.get(f'{self.name}_bucket', {})
+        sums = samples.get(f'{self.name}_sum', {})
+        for labels, count in sorted(samples.get(f'{self.name}_count', {}).items()):
+            cumulative = 0
+            for bound in self.bounds:
+                cumulative += buckets.get(labels + (('le', bound),), 0)
+                lines.append(
+                    f'{self.name}_bucket{format_labels(labels + (("le", bound),))} '
+                    f'{format_value(cumulative)}'
+                )
+            lines.append(
+                f'{self.name}_sum{format_labels(labels)} '
+                f'{format_value(sums.get(labels, 0))}'
+            )
+            lines.append(
+                f'{self.name}_count{format_labels(labels)} {format_value(count)}'
+            )
+        return lines
+
+
+HTTP_REQUESTS = Counter(
+    'softdesk_http_requests_total',
+    "Requêtes HTTP traitées, par vue, méthode et code de statut.",
+    ('view', 'method', 'status'),
+)
+HTTP_DURATION = Histogram(
+    'softdesk_http_request_duration_seconds',
+    "Durée de traitement des requêtes HTTP, par vue.",
+    ('view',),
+)
+DB_QUERIES = Counter(
+    'softdesk_db_queries_total',
+    "Requêtes SQL exécutées, par vue.",
+    ('view',),
+)
+DB_DURATION = Counter(
+    'softdesk_db_query_duration_seconds_total',
+    "Temps passé dans les requêtes SQL, par vue.",
+    ('view',),
+)
+FRAGMENT_CACHE = Counter(
+    'softdesk_fragment_cache_lookups_total',
+    "Consultations du cache de fragments, par résultat (hit ou miss).",
+    ('result',),
+)
+AUTH_FAILURES = Counter(
+    'softdesk_auth_failures_total',
+    "Échecs d'authentification (identifiants refusés, réponses 401), par motif.",
+    ('reason',),
+)
+
+
+def collect():
+    """Additionne les valeurs des fichiers de tous les processus."""
+    samples = {}
+    for path in sorted(get_directory().glob('*.db')):
+        for key, value in read_file(path):
+            name, labels = json.loads(key)
+            series = samples.setdefault(name, {})
+            labels = tuple(tuple(pair) for pair in labels)
+            series[labels] = series.get(labels, 0) + value
+    return samples
+
+
+def render():
+    """Expose toutes les métriques enregistrées au format texte de Prometheus."""
+    samples = collect()
+    lines = []
+    for metric in REGISTRY:
+        lines.append(f'# HELP {metric.name} {metric.documentation}')
+        lines.append(f'# TYPE {metric.name} {metric.type}')
+        lines += metric.render(samples)
+    return '\n'.join(lines) + '\n'
+
+
+def query_wrapper(execute, sql, params, many, context):
+    """Wrapper d'exécution comptant et chronométrant les requêtes SQL."""
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        view = current_view.get() or 'none'
+        DB_QUERIES.inc(view=view)
+        DB_DURATION.inc(time.perf_counter() - start, view=view)
+
+
+def install_wrapper(sender, connection, **kwargs):
+    if query_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(query_wrapper)
+
+
+def install():
+    """Branche la mesure des requêtes SQL sur les connexions ouvertes ensuite."""
+    if get_setting('ENABLED'):
+        connection_created.connect(install_wrapper, dispatch_uid='metrics_wrapper')
+
+
+class MetricsMiddleware:
+    """
+    Compte les requêtes et mesure leur durée par vue. À placer en tête de
+    MIDDLEWARE pour inclure le temps passé dans les autres middlewares.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        match = request.resolver_match
+        view = (match.view_name or match._func_path) if match else 'unresolved'
+        method = request.method if request.method in HTTP_METHODS else 'other'
+        HTTP_REQUESTS.inc(view=view, method=method, status=response.status_code)
+        HTTP_DURATION.observe(duration, view=view)
+        return response
+
+
+class PrometheusRenderer(BaseRenderer):
+    """Rend le texte d'exposition tel quel (et les erreurs en JSON)."""
+    media_type = 'text/plain'
+    format = 'txt'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, str):
+            return data.encode(self.charset)
+        return json.dumps(data, ensure_ascii=False).encode(self.charset)
+
+
+class MetricsView(APIView):
+    """
+    Vue réservée au staff : métriques agrégées de tous les workers, au format
+    d'exposition texte de Prometheus.
+    """
+    permission_classes = [permissions.IsAdminUser]
+    renderer_classes = [PrometheusRenderer]
+
+    def get(self, request, *args, **kwargs):
+        return Response(render(), content_type=CONTENT_TYPE)
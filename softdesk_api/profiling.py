@@ -0,0 +1,142 @@
+"""
+Profilage échantillonné des requêtes avec cProfile.
+
+Le middleware profile une fraction `SAMPLE_RATE` des requêtes, ainsi que toute
+requête portant un en-tête `X-Profile` signé (voir `make_profile_token`). Chaque
+échantillon produit un fichier `.prof` et ses métadonnées `.json` (vue, nombre de
+requêtes SQL, durée) dans un répertoire dont seuls les `MAX_FILES` échantillons
+les plus récents sont conservés. `python manage.py profile_report` agrège
+ensuite les fonctions les plus coûteuses par vue.
+"""
+import cProfile
+import json
+import random
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from django.core import signing
+from django.db import connection
+
+DEFAULTS = {
+    'SAMPLE_RATE': 0.0,
+    'DIRECTORY': 'profiles',
+    'MAX_FILES': 500,
+    'TOKEN_MAX_AGE': 3600,
+}
+
+TOKEN_SALT = 'softdesk_api.profiling'
+
+_lock = threading.Lock()
+
+
+def get_setting(name):
+    """Retourne un paramètre du profilage (surchargeable via PROFILING)."""
+    return getattr(settings, 'PROFILING', {}).get(name, DEFAULTS[name])
+
+
+def get_directory():
+    """Répertoire des échantillons, relatif à BASE_DIR s'il n'est pas absolu."""
+    return Path(settings.BASE_DIR) / get_setting('DIRECTORY')
+
+
+def make_profile_token():
+    """Génère une valeur signée et horodatée pour l'en-tête X-Profile."""
+    return signing.TimestampSigner(salt=TOKEN_SALT).sign('profile')
+
+
+def has_valid_token(request):
+    """Vrai si la requête porte un en-tête X-Profile valide et non expiré."""
+    token = request.headers.get('X-Profile')
+    if not token:
+        return False
+    try:
+        signing.TimestampSigner(salt=TOKEN_SALT).unsign(
+            token, max_age=get_setting('TOKEN_MAX_AGE')
+        )
+    except signing.BadSignature:
+        return False
+    return True
+
+
+def rotate(directory, max_files):
+    """Supprime les échantillons les plus anciens au-delà de `max_files`."""
+    samples = sorted(directory.glob('*.prof'), key=lambda path: path.stat().st_mtime)
+    for path in samples[:max(len(samples) - max_files, 0)]:
+        path.unlink(missing_ok=True)
+        path.with_suffix('.json').unlink(missing_ok=True)
+
+
+class QueryCounter:
+    """Wrapper d'exécution SQL comptant les requêtes d'un échantillon."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class SampledProfilerMiddleware:
+    """
+    Middleware de profilage échantillonné. Les requêtes non retenues ne coûtent
+    qu'un tirage aléatoire et la lecture d'un en-tête. Les requêtes retenues
+    pendant qu'un autre profil est en cours sont servies sans profilage.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def should_profile(self, request):
+        rate = get_setting('SAMPLE_RATE')
+        return (rate > 0 and random.random() < rate) or has_valid_token(request)
+
+    def __call__(self, request):
+        if not self.should_profile(request):
+            return self.get_response(request)
+
+        # Un seul profil actif à la fois : depuis Python 3.12, activer un second
+        # profileur lève ValueError. Une requête concurrente n'est pas profilée.
+        if not _lock.acquire(blocking=False):
+            return self.get_response(request)
+        try:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Profileur activé hors du middleware
+                return self.get_response(request)
+            counter = QueryCounter()
+            start = time.perf_counter()
+            try:
+                with connection.execute_wrapper(counter):
+                    response = self.get_response(request)
+            finally:
+                profiler.disable()
+            duration = time.perf_counter() - start
+        finally:
+            _lock.release()
+
+        match = request.resolver_match
+        view_name = (match.view_name or match._func_path) if match else 'unresolved'
+        self.save(profiler, {
+            'view': view_name,
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'queries': counter.count,
+            'duration_ms': round(duration * 1000, 3),
+            'timestamp': time.time(),
+        })
+        return response
+
+    def save(self, profiler, metadata):
+        directory = get_directory()
+        directory.mkdir(parents=True, exist_ok=True)
+        name = f"{int(metadata['timestamp'] * 1000)}-{uuid.uuid4().hex[:8]}"
+        profiler.dump_stats(directory / f'{name}.prof')
+        (directory / f'{name}.json').write_text(json.dumps(metadata))
+        rotate(directory, get_setting('MAX_FILES'))
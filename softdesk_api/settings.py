@@ -52,6 +52,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'softdesk_api.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -59,6 +60,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'softdesk_api.profiling.SampledProfilerMiddleware',
+    'softdesk_api.slow_queries.CurrentViewMiddleware',
 ]
 
 REST_FRAMEWORK = {
@@ -83,6 +86,94 @@ SIMPLE_JWT = {
     'SIGNING_KEY': SECRET_KEY,
 }
 
+# Cache des représentations d'issues et de commentaires (listes). Les
+# compteurs sont consultables par le staff sur /api/debug/fragment-cache/.
+FRAGMENT_CACHE = {
+    'ENABLED': True,
+    'ALIAS': 'default',
+    'TIMEOUT': 3600,
+}
+
+# Regroupement des GET concurrents identiques (ProjectDetailView, IssueListView).
+# CROSS_PROCESS étend le regroupement aux autres workers via un verrou en cache.
+SINGLE_FLIGHT = {
+    'ENABLED': True,
+    'CROSS_PROCESS': False,
+    'LOCK_TIMEOUT': 5,
+    'WAIT_TIMEOUT': 5,
+}
+
+# Exécution groupée (POST /api/batch/) : nombre maximal de sous-requêtes par lot
+# et de lectures exécutées en parallèle avec "concurrent": true.
+BATCH_API = {
+    'MAX_REQUESTS': 20,
+    'MAX_WORKERS': 4,
+}
+
+# Profilage échantillonné (python manage.py profile_report). Une requête est aussi
+# profilée si elle porte un en-tête X-Profile signé (make_profile_token()).
+PROFILING = {
+    'SAMPLE_RATE': 0.0,
+    'DIRECTORY': 'profiles',
+    'MAX_FILES': 500,
+}
+
+# Journal des requêtes SQL lentes, avec leur plan d'exécution
+# (consultable par le staff sur /api/debug/slow-queries/)
+SLOW_QUERIES = {
+    'THRESHOLD_MS': 100,
+    'BUFFER_SIZE': 200,
+    'EXPLAIN': True,
+}
+
+# Métriques au format Prometheus (staff uniquement sur /metrics). Chaque worker
+# écrit dans un fichier projeté en mémoire de DIRECTORY, à vider au redémarrage.
+METRICS = {
+    'ENABLED': True,
+    'DIRECTORY': 'metrics',
+}
+
+# Lanceur de tests : métriques écrites dans un répertoire temporaire
+TEST_RUNNER = 'softdesk_api.test_runner.TestRunner'
+
+# Nombre maximal d'éléments intégrés par objet via ?expand=
+EXPAND_LIMIT = 20
+
+# Dispatcher des webhooks (python manage.py dispatch_outbox)
+OUTBOX_DISPATCHER = {
+    'BATCH_SIZE': 500,
+    'MAX_ATTEMPTS': 10,
+    'BACKOFF': 0.5,
+    'TIMEOUT': 5,
+    'VISIBILITY_TIMEOUT': 300,
+}
+
+# File de tâches différées (python manage.py run_tasks)
+TASK_QUEUE = {
+    'BATCH_SIZE': 10,
+    'VISIBILITY_TIMEOUT': 300,
+    'MAX_ATTEMPTS': 3,
+    'BACKOFF': 5,
+}
+
+# Suppression logique des projets et issues : délai de restauration (secondes)
+# puis purge par lots via la file de tâches
+SOFT_DELETE = {
+    'UNDO_WINDOW': 3600,
+    'PURGE_CHUNK_SIZE': 500,
+}
+
+# Les e-mails (onboarding des contributeurs) sont affichés dans la console
+EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+DEFAULT_FROM_EMAIL = 'softdesk@example.com'
+
+# Flux SSE de l'activité des projets. Le broker en mémoire ne relie que les
+# connexions d'un même processus : à remplacer en déploiement multi-workers.
+EVENT_STREAM = {
+    'BROKER': 'api.events.InMemoryBroker',
+    'HEARTBEAT': 15,
+}
+
 
 ROOT_URLCONF = 'softdesk_api.urls'
 
@@ -0,0 +1,183 @@
+"""
+Journal des requêtes SQL lentes.
+
+`install()` (appelé au démarrage par ApiConfig.ready) branche un wrapper
+d'exécution sur chaque nouvelle connexion. Toute requête plus lente que
+`SLOW_QUERIES['THRESHOLD_MS']` est journalisée avec une empreinte de ses
+paramètres (jamais leurs valeurs), la vue appelante, sa durée et son plan
+d'exécution (`EXPLAIN QUERY PLAN` sous SQLite), ce qui fait ressortir les
+parcours complets de table. Les derniers enregistrements sont conservés dans un
+tampon circulaire consultable par le staff sur /api/debug/slow-queries/.
+"""
+import hashlib
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'ENABLED': True,
+    'THRESHOLD_MS': 100,
+    'BUFFER_SIZE': 200,
+    'EXPLAIN': True,
+}
+
+current_view = ContextVar('current_view', default=None)
+_buffer = deque(maxlen=DEFAULTS['BUFFER_SIZE'])
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def get_setting(name):
+    """Retourne un paramètre du journal (surchargeable via SLOW_QUERIES)."""
+    return getattr(settings, 'SLOW_QUERIES', {}).get(name, DEFAULTS[name])
+
+
+def fingerprint(params):
+    """Empreinte courte des paramètres, pour regrouper sans exposer les valeurs."""
+    return hashlib.sha1(repr(params).encode('utf-8')).hexdigest()[:12]
+
+
+def explain(connection, sql, params):
+    """Retourne le plan d'exécution d'une requête SELECT, ou None."""
+    if not sql.lstrip().upper().startswith('SELECT'):
+        return None
+    prefix = 'EXPLAIN QUERY PLAN ' if connection.vendor == 'sqlite' else 'EXPLAIN '
+    _local.explaining = True
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(prefix + sql, params)
+            return [" ".join(str(value) for value in row) for row in cursor.fetchall()]
+    except Exception as exc:  # Le plan est informatif : ne jamais casser la requête
+        return [f"EXPLAIN impossible : {exc}"]
+    finally:
+        _local.explaining = False
+
+
+def record(entry):
+    """Ajoute un enregistrement au tampon circulaire."""
+    global _buffer
+    with _lock:
+        size = get_setting('BUFFER_SIZE')
+        if _buffer.maxlen != size:
+            _buffer = deque(_buffer, maxlen=size)
+        _buffer.append(entry)
+
+
+def get_recent(limit=None):
+    """Retourne les requêtes lentes les plus récentes, de la plus récente à l'aînée."""
+    with _lock:
+        entries = list(reversed(_buffer))
+    return entries[:limit] if limit else entries
+
+
+def clear():
+    with _lock:
+        _buffer.clear()
+
+
+def slow_query_wrapper(execute, sql, params, many, context):
+    """Wrapper d'exécution chronométrant chaque requête."""
+    if getattr(_local, 'explaining', False):
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    result = execute(sql, params, many, context)
+    duration_ms = (time.perf_counter() - start) * 1000
+    if duration_ms >= get_setting('THRESHOLD_MS'):
+        plan = None
+        if get_setting('EXPLAIN') and not many:
+            plan = explain(context['connection'], sql, params)
+        entry = {
+            'sql': sql,
+            'params_fingerprint': fingerprint(params),
+            'view': current_view.get(),
+            'duration_ms': round(duration_ms, 3),
+            'plan': plan,
+            'timestamp': time.time(),
+        }
+        record(entry)
+        logger.warning(
+            f"Requête lente ({entry['duration_ms']} ms, vue {entry['view']}) : "
+            f"{sql} | plan : {plan}"
+        )
+    return result
+
+
+def install_wrapper(sender, connection, **kwargs):
+    if slow_query_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(slow_query_wrapper)
+
+
+def install():
+    """Branche le journal sur toutes les connexions ouvertes par la suite."""
+    if get_setting('ENABLED'):
+        connection_created.connect(install_wrapper, dispatch_uid='slow_query_wrapper')
+
+
+@contextmanager
+def suspended():
+    """
+    Débranche temporairement le journal, y compris des connexions déjà ouvertes
+    (utile aux chargements massifs, dont chaque INSERT dépasserait le seuil).
+    """
+    connected = connection_created.disconnect(dispatch_uid='slow_query_wrapper')
+    wrapped = [
+        connection for connection in connections.all(initialized_only=True)
+        if slow_query_wrapper in connection.execute_wrappers
+    ]
+    for connection in wrapped:
+        connection.execute_wrappers.remove(slow_query_wrapper)
+    try:
+        yield
+    finally:
+        for connection in wrapped:
+            connection.execute_wrappers.append(slow_query_wrapper)
+        if connected:
+            install()
+
+
+class CurrentViewMiddleware:
+    """Mémorise la vue en cours pour l'attribuer aux requêtes lentes."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = current_view.set(None)
+        try:
+            return self.get_response(request)
+        finally:
+            current_view.reset(token)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        match = request.resolver_match
+        current_view.set(match.view_name or match._func_path)
+
+
+class SlowQueryListView(APIView):
+    """
+    Vue réservée au staff : liste les requêtes lentes récemment enregistrées.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        try:
+            limit = int(request.query_params.get('limit', 0)) or None
+        except ValueError:
+            limit = None
+        return Response({
+            "message": "Requêtes lentes récupérées avec succès.",
+            "data": get_recent(limit)
+        })
@@ -0,0 +1,29 @@
+"""
+Lanceur de tests du projet (TEST_RUNNER).
+
+Le middleware de métriques enregistre chaque requête dans un fichier par
+processus ; pendant les tests, ces fichiers sont écrits dans un répertoire
+temporaire supprimé en fin d'exécution plutôt que dans le dépôt.
+"""
+import tempfile
+
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+    def setup_test_environment(self, **kwargs):
+        self.metrics_directory = tempfile.TemporaryDirectory(prefix='softdesk-metrics-')
+        self.metrics_settings = override_settings(METRICS={
+            **getattr(settings, 'METRICS', {}),
+            'DIRECTORY': self.metrics_directory.name,
+        })
+        self.metrics_settings.enable()
+        super().setup_test_environment(**kwargs)
+
+    def teardown_test_environment(self, **kwargs):
+        super().teardown_test_environment(**kwargs)
+        # Ferme les fichiers (signal setting_changed) avant de les supprimer
+        self.metrics_settings.disable()
+        self.metrics_directory.cleanup()
@@ -18,6 +18,10 @@ from django.contrib import admin
 from django.urls import path, include
 from rest_framework_simplejwt.views import TokenRefreshView, TokenVerifyView
 from users.views import CustomTokenObtainPairView
+from softdesk_api.slow_queries import SlowQueryListView
+from softdesk_api.metrics import MetricsView
+from api.batch import BatchView
+from api.fragments import FragmentCacheStatsView
 
 
 urlpatterns = [
@@ -34,4 +38,20 @@ urlpatterns = [
 
     # Module des projets (API principale)
     path('api/projects/', include('api.urls')),
+
+    # Exécution groupée de sous-requêtes
+    path('api/batch/', BatchView.as_view(), name='batch'),
+
+    # Diagnostic (staff uniquement)
+    path(
+        'api/debug/slow-queries/',
+        SlowQueryListView.as_view(),
+        name='slow-queries'
+    ),
+    path(
+        'api/debug/fragment-cache/',
+        FragmentCacheStatsView.as_view(),
+        name='fragment-cache'
+    ),
+    path('metrics', MetricsView.as_view(), name='metrics'),
 ]
@@ -1,9 +1,10 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from api.admin_utils import AutocompleteFilter, LargeTableAdminMixin
 from .models import User, Contributor
 
 
-class UserAdmin(BaseUserAdmin):
+class UserAdmin(LargeTableAdminMixin, BaseUserAdmin):
     """
     Configuration de l'interface d'administration pour le modèle User personnalisé.
     """
@@ -34,13 +35,15 @@ class UserAdmin(BaseUserAdmin):
 admin.site.register(User, UserAdmin)
 
 
-class ContributorAdmin(admin.ModelAdmin):
+class ContributorAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     """
     Configuration de l'interface d'administration pour le modèle Contributor.
     """
-    list_display = ('contributor', 'project')
-    list_filter = ('project',)
+    list_display = ('contributor', 'project', 'role')
+    list_select_related = ('contributor', 'project')
+    list_filter = ('role', ('project', AutocompleteFilter))
     search_fields = ('contributor__username', 'project__title')
+    autocomplete_fields = ('contributor', 'project')
     ordering = ('project',)
 
 
@@ -0,0 +1,66 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Exists, F, Min, OuterRef
+
+from api.changes import batched_tombstones, next_change_seq
+from api.models import Project
+from users.models import Contributor
+
+
+class Command(BaseCommand):
+    """
+    Met les données existantes en conformité avec l'index des membres :
+    supprime les doublons (utilisateur, projet), ajoute le créateur comme
+    propriétaire de chaque projet où il manque et rétablit le rôle de
+    propriétaire des créateurs déjà membres. Idempotente, elle est à lancer
+    avant d'ajouter la contrainte d'unicité sur une base existante.
+    """
+    help = "Dédoublonne les contributeurs et ajoute les créateurs manquants."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help="Nombre de lignes insérées par lot."
+        )
+
+    @transaction.atomic
+    def handle(self, *args, **options):
+        duplicates = Contributor.objects.values('contributor', 'project')\
+            .annotate(count=Count('id'), keep=Min('id'))\
+            .filter(count__gt=1)
+        removed = 0
+        with batched_tombstones():
+            for duplicate in duplicates:
+                removed += Contributor.objects.filter(
+                    contributor=duplicate['contributor'],
+                    project=duplicate['project'],
+                ).exclude(id=duplicate['keep']).delete()[0]
+
+        missing = Project.objects.filter(
+            ~Exists(Contributor.objects.filter(
+                project=OuterRef('pk'), contributor=OuterRef('creator')
+            ))
+        ).values_list('pk', 'creator_id')
+        change_seq = next_change_seq()
+        created = len(Contributor.objects.bulk_create(
+            [
+                Contributor(
+                    project_id=project_id,
+                    contributor_id=creator_id,
+                    role=Contributor.ROLE_OWNER,
+                    change_seq=change_seq,
+                )
+                for project_id, creator_id in missing.iterator()
+            ],
+            batch_size=options['batch_size'],
+        ))
+        promoted = Contributor.objects.filter(
+            contributor=F('project__creator')
+        ).exclude(role=Contributor.ROLE_OWNER).update(
+            role=Contributor.ROLE_OWNER, change_seq=change_seq
+        )
+
+        self.stdout.write(
+            f"{removed} doublon(s) supprimé(s), {created} créateur(s) ajouté(s), "
+            f"{promoted} rôle(s) de propriétaire rétabli(s)."
+        )
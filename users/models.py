@@ -5,6 +5,8 @@ from django.contrib.auth.models import (
 )
 from django.db import models
 
+from api.tracking import ChangeTrackedMixin
+
 
 class UserManager(BaseUserManager):
     """
@@ -82,11 +84,20 @@ class User(AbstractBaseUser, PermissionsMixin):
         return self.username
 
 
-class Contributor(models.Model):
+class Contributor(ChangeTrackedMixin, models.Model):
     """
     Modèle représentant un contributeur à un projet.
-    Chaque enregistrement relie un utilisateur à un projet spécifique.
+    Chaque enregistrement relie un utilisateur à un projet spécifique ; c'est
+    l'unique source des membres d'un projet, dont le créateur fait toujours partie.
     """
+    ROLE_OWNER = 'owner'
+    ROLE_CONTRIBUTOR = 'contributor'
+
+    ROLES = [
+        (ROLE_OWNER, 'Owner'),
+        (ROLE_CONTRIBUTOR, 'Contributor'),
+    ]
+
     contributor = models.ForeignKey(
         User, related_name="contributions", on_delete=models.CASCADE
     )
@@ -95,6 +106,27 @@ class Contributor(models.Model):
         related_name="contributor_set",
         on_delete=models.CASCADE
     )
+    role = models.CharField(
+        max_length=11,
+        choices=ROLES,
+        default=ROLE_CONTRIBUTOR,
+        help_text="Rôle du membre dans le projet"
+    )
+    change_seq = models.BigIntegerField(
+        default=0,
+        editable=False,
+        db_index=True,
+        help_text="Numéro de séquence de la dernière modification"
+    )
+
+    class Meta:
+        constraints = [
+            # Index (utilisateur, projet) : sert à la fois à l'unicité et à la
+            # liste des projets d'un utilisateur sans lire la table des projets.
+            models.UniqueConstraint(
+                fields=['contributor', 'project'], name='unique_project_membership'
+            ),
+        ]
 
     def __str__(self):
         """Retourne le nom d'utilisateur du contributeur."""
@@ -3,6 +3,7 @@ from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from django.contrib.auth import authenticate
 from .models import User
 from users.models import Contributor
+from softdesk_api import metrics
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -118,6 +119,7 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         user = authenticate(username=username, password=password)
 
         if user is None:
+            metrics.AUTH_FAILURES.inc(reason='invalid_credentials')
             raise serializers.ValidationError(
                 "Aucun compte actif trouvé avec ces identifiants."
             )
@@ -131,7 +133,8 @@ class ContributorSerializer(serializers.ModelSerializer):
     """
     Serializer pour ajouter un utilisateur en tant que contributeur à un projet.
     Prend le `username` en entrée et lie le contributeur au projet spécifié
-    dans le contexte.
+    dans le contexte. Le rôle est en lecture seule : un membre ajouté est
+    toujours contributeur, le rôle de propriétaire revient au seul créateur.
     """
     contributor_username = serializers.CharField(
         write_only=True,
@@ -146,8 +149,11 @@ class ContributorSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Contributor
-        fields = ['id', 'contributor_username', 'contributor_added', 'project']
-        extra_kwargs = {'project': {'required': False}}
+        fields = ['id', 'contributor_username', 'contributor_added', 'project', 'role']
+        extra_kwargs = {
+            'project': {'required': False},
+            'role': {'read_only': True},
+        }
 
     def create(self, validated_data):
         """
@@ -161,4 +167,15 @@ class ContributorSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(
                 {"contributor_username": "Utilisateur non trouvé."}
             )
-        return Contributor.objects.create(project=project, contributor=contributor)
+        is_member = Contributor.objects.filter(
+            project=project, contributor=contributor
+        ).exists()
+        if is_member:
+            raise serializers.ValidationError(
+                {"contributor_username": "Cet utilisateur est déjà contributeur."}
+            )
+        return Contributor.objects.create(
+            project=project,
+            contributor=contributor,
+            role=Contributor.ROLE_CONTRIBUTOR
+        )
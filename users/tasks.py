@@ -0,0 +1,51 @@
+"""
+Tâches différées de l'application users (voir api.jobs).
+"""
+import logging
+
+from django.conf import settings
+from django.core.mail import send_mail
+
+from api.changes import batched_tombstones
+from api.jobs import task
+from api.models import Project, Issue, Comment
+from .models import User, Contributor
+
+logger = logging.getLogger(__name__)
+
+
+@task(priority=10)
+def onboard_contributor(contributor_id):
+    """Prévient un utilisateur qu'il a été ajouté à un projet."""
+    membership = Contributor.objects.select_related('contributor', 'project') \
+        .filter(pk=contributor_id).first()
+    if membership is None:
+        return  # Retiré du projet avant l'exécution de la tâche
+    user, project = membership.contributor, membership.project
+    send_mail(
+        f"Vous avez été ajouté au projet {project.title}",
+        f"Bonjour {user.username}, vous êtes désormais contributeur du projet "
+        f"« {project.title} ».",
+        settings.DEFAULT_FROM_EMAIL,
+        [user.email],
+    )
+    logger.info(f"Contributeur {user.username} accueilli sur le projet {project.pk}.")
+
+
+@task()
+def delete_account(user_id):
+    """Supprime un compte désactivé et toutes ses ressources associées."""
+    user = User.objects.filter(pk=user_id, is_active=False).first()
+    if user is None:
+        return  # Déjà supprimé ou réactivé entre-temps
+    logger.info(
+        f"Suppression de l'utilisateur {user.username} "
+        f"et de toutes les ressources associées."
+    )
+    with batched_tombstones():
+        Project.objects.filter(creator=user).delete()
+        Contributor.objects.filter(contributor=user).delete()
+        Issue.objects.filter(creator=user).delete()
+        Comment.objects.filter(creator=user).delete()
+        user.delete()
+    logger.info(f"Utilisateur {user.username} supprimé avec succès.")
@@ -1,9 +1,17 @@
+from io import StringIO
+from unittest import mock
+from django.core import mail
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
 from rest_framework import status
 from .models import Contributor
-from api.models import Project
+from .views import MyIssuesPagination
+from api.jobs import run_pending
+from api.models import Project, Issue
 
 User = get_user_model()
 
@@ -54,10 +62,14 @@ class UserTests(TestCase):
         """
         user_id = self.user.id
 
-        # Supprime l'utilisateur
-        response = self.client.delete("/api/auth/profile/delete/")
+        # Supprime l'utilisateur : le compte est désactivé immédiatement
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete("/api/auth/profile/delete/")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(User.objects.get(id=user_id).is_active)
 
+        # La suppression en cascade est exécutée par la file de tâches
+        self.assertEqual(run_pending(), 1)
         # Vérifie que l'utilisateur et les projets associés sont bien supprimés
         self.assertFalse(User.objects.filter(id=user_id).exists())
         self.assertFalse(Project.objects.filter(creator_id=user_id).exists())
@@ -65,9 +77,10 @@ class UserTests(TestCase):
     def test_add_contributor(self):
         """Test de l'ajout d'un contributeur par le créateur du projet."""
         data = {"contributor_username": "user2"}
-        response = self.client.post(
-            f"/api/auth/projects/{self.project.id}/add_contributor/", data
-        )
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                f"/api/auth/projects/{self.project.id}/add_contributor/", data
+            )
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(response.data["message"], "Contributeur ajouté avec succès.")
         self.assertTrue(
@@ -75,6 +88,10 @@ class UserTests(TestCase):
                 contributor=self.user2, project=self.project
             ).exists()
         )
+        # Le message d'accueil part en différé
+        self.assertEqual(mail.outbox, [])
+        run_pending()
+        self.assertEqual(mail.outbox[0].to, ["user2@example.com"])
 
     def test_non_creator_cannot_add_contributor(self):
         """
@@ -87,3 +104,124 @@ class UserTests(TestCase):
         )
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
         self.assertIn("detail", response.data)
+
+    def test_creator_is_always_contributor(self):
+        """Le créateur d'un projet figure dans la table des contributeurs."""
+        self.assertTrue(
+            Contributor.objects.filter(
+                contributor=self.user, project=self.project
+            ).exists()
+        )
+        data = {"contributor_username": "user1"}
+        response = self.client.post(
+            f"/api/auth/projects/{self.project.id}/add_contributor/", data
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_backfill_memberships(self):
+        """La commande de backfill rétablit le créateur comme contributeur."""
+        Contributor.objects.all().delete()
+        call_command('backfill_memberships', stdout=StringIO())
+        self.assertEqual(
+            list(Contributor.objects.values_list('contributor', 'project', 'role')),
+            [(self.user.id, self.project.id, Contributor.ROLE_OWNER)]
+        )
+        # Un créateur déjà membre comme simple contributeur redevient propriétaire
+        Contributor.objects.update(role=Contributor.ROLE_CONTRIBUTOR)
+        call_command('backfill_memberships', stdout=StringIO())
+        self.assertEqual(Contributor.objects.get().role, Contributor.ROLE_OWNER)
+
+    def test_added_contributor_cannot_be_granted_owner(self):
+        response = self.client.post(
+            f"/api/auth/projects/{self.project.id}/add_contributor/",
+            {"contributor_username": "user2", "role": Contributor.ROLE_OWNER}
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            Contributor.objects.get(contributor=self.user2).role,
+            Contributor.ROLE_CONTRIBUTOR
+        )
+
+
+class MyIssuesTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='user1', email='user1@example.com', age=25, password='password123'
+        )
+        self.other = User.objects.create_user(
+            username='user2', email='user2@example.com', age=30, password='password123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.issues = {}
+        for index in range(3):
+            project = Project.objects.create(
+                title=f"Project {index}", description="Description",
+                type="back-end", creator=self.other
+            )
+            Contributor.objects.create(contributor=self.user, project=project)
+            self.issues[f'assigned{index}'] = Issue.objects.create(
+                title=f"Assigned {index}", description="Description",
+                project=project, creator=self.other, assignee=self.user,
+                priority="HIGH" if index else "LOW", tag="BUG",
+                status="In Progress" if index == 2 else "To Do"
+            )
+            self.issues[f'created{index}'] = Issue.objects.create(
+                title=f"Created {index}", description="Description",
+                project=project, creator=self.user, assignee=self.other,
+                priority="LOW", tag="TASK", status="To Do"
+            )
+            Issue.objects.create(
+                title=f"Other {index}", description="Description",
+                project=project, creator=self.other, priority="LOW", tag="BUG",
+                status="To Do"
+            )
+
+    def titles(self, response):
+        return [issue['title'] for issue in response.data['data']['results']]
+
+    def test_inbox_lists_assigned_and_created_issues_across_projects(self):
+        response = self.client.get("/api/auth/me/issues/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(self.titles(response)), 6)
+        self.assertNotIn("Other 0", self.titles(response))
+
+    def test_inbox_filters(self):
+        response = self.client.get(
+            "/api/auth/me/issues/", {'role': 'assigned', 'status': 'To Do'}
+        )
+        self.assertEqual(sorted(self.titles(response)), ["Assigned 0", "Assigned 1"])
+        response = self.client.get("/api/auth/me/issues/", {'priority': 'HIGH'})
+        self.assertEqual(sorted(self.titles(response)), ["Assigned 1", "Assigned 2"])
+        response = self.client.get("/api/auth/me/issues/", {'status': 'Unknown'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_inbox_is_cursor_paginated_in_one_query_per_page(self):
+        titles = []
+        url = "/api/auth/me/issues/"
+        with mock.patch.object(MyIssuesPagination, 'page_size', 4):
+            while url:
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.get(url)
+                self.assertEqual(len(queries), 1)
+                titles += self.titles(response)
+                url = response.data['data']['next']
+        self.assertEqual(len(titles), 6)
+        self.assertEqual(len(set(titles)), 6)
+
+    def test_inbox_serves_description_excerpts(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/auth/me/issues/")
+        issue = response.data['data']['results'][0]
+        self.assertNotIn('description', issue)
+        self.assertEqual(issue['description_excerpt'], "Description")
+        self.assertNotIn('"api_issue"."description",', queries[0]['sql'])
+        self.assertNotIn('"api_project"."description",', queries[0]['sql'])
+
+    def test_inbox_hides_projects_the_user_left(self):
+        Contributor.objects.filter(
+            contributor=self.user, project=self.issues['assigned0'].project
+        ).delete()
+        response = self.client.get("/api/auth/me/issues/")
+        self.assertNotIn("Assigned 0", self.titles(response))
+        self.assertNotIn("Created 0", self.titles(response))
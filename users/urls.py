@@ -3,6 +3,7 @@ from .views import (
     register_user,
     protected_view,
     UserDetailView,
+    MyIssuesView,
     UserProfileUpdateView,
     UserDeleteView,
     AddContributorView
@@ -17,6 +18,7 @@ urlpatterns = [
 
     # Gestion du profil utilisateur
     path('me/', UserDetailView.as_view(), name='user-detail'),
+    path('me/issues/', MyIssuesView.as_view(), name='my-issues'),
     path('profile/update/', UserProfileUpdateView.as_view(), name='profile-update'),
     path('profile/delete/', UserDeleteView.as_view(), name='profile-delete'),
 
@@ -6,9 +6,15 @@ from .serializers import (
     UserSerializer,
     ContributorSerializer
 )
-from .models import User
+from .models import User, Contributor
+from .tasks import delete_account, onboard_contributor
+from api.jobs import enqueue
 from api.permissions import IsCreator
-from api.models import Project, Contributor, Issue, Comment
+from api.models import Project, Issue, Comment
+from api.serializers import IssueSerializer
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
@@ -65,10 +71,89 @@ class UserDetailView(generics.RetrieveAPIView):
         return self.request.user
 
 
+class MyIssuesPagination(CursorPagination):
+    """
+    Pagination par curseur de la boîte de réception : pas de COUNT et une page
+    lue directement dans l'ordre des index (assignee/creator, created_time).
+    """
+    ordering = ('-created_time', '-id')
+
+
+class MyIssuesView(generics.ListAPIView):
+    """
+    Vue listant, tous projets confondus, les issues assignées à l'utilisateur
+    connecté ou créées par lui.
+
+    Paramètres : `role` (`assigned`, `created` ; les deux par défaut), `status`
+    et `priority` (valeurs séparées par des virgules). Seuls les projets dont
+    l'utilisateur est encore membre sont pris en compte. Chaque page est servie
+    par une seule requête, appuyée sur les index `issue_assignee_status_idx` et
+    `issue_creator_created_idx`.
+    """
+    serializer_class = IssueSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = MyIssuesPagination
+
+    def get_choices(self, name, choices):
+        value = self.request.query_params.get(name)
+        if not value:
+            return None
+        values = [item.strip() for item in value.split(',') if item.strip()]
+        allowed = {choice for choice, _ in choices}
+        invalid = [item for item in values if item not in allowed]
+        if invalid:
+            raise ValidationError(
+                {name: f"Valeur(s) invalide(s) : {', '.join(invalid)}."}
+            )
+        return values
+
+    def get_queryset(self):
+        user = self.request.user
+        role = self.request.query_params.get('role')
+        if role == 'assigned':
+            queryset = Issue.objects.filter(assignee=user)
+        elif role == 'created':
+            queryset = Issue.objects.filter(creator=user)
+        elif role:
+            raise ValidationError(
+                {"role": "Le rôle doit être « assigned » ou « created »."}
+            )
+        else:
+            queryset = Issue.objects.filter(Q(assignee=user) | Q(creator=user))
+
+        statuses = self.get_choices('status', Issue.STATUSES)
+        if statuses:
+            queryset = queryset.filter(status__in=statuses)
+        priorities = self.get_choices('priority', Issue.PRIORITIES)
+        if priorities:
+            queryset = queryset.filter(priority__in=priorities)
+
+        memberships = Contributor.objects.filter(
+            contributor=user, project__deleted_at__isnull=True
+        ).values('project_id')
+        return queryset.filter(project_id__in=memberships) \
+            .select_related('creator', 'assignee') \
+            .defer('description')
+
+    def get_serializer_context(self):
+        # Liste résumée : extrait de la description, texte complet dans le détail
+        context = super().get_serializer_context()
+        context['summary'] = True
+        return context
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        return Response({
+            "message": "Vos issues ont été récupérées avec succès.",
+            "data": response.data
+        })
+
+
 class UserDeleteView(APIView):
     """
     Vue pour supprimer un utilisateur et toutes ses ressources associées
-    (projets, contributeurs, issues, commentaires).
+    (projets, contributeurs, issues, commentaires). Le compte est désactivé
+    dans la requête, la suppression est exécutée par la file de tâches.
     """
     permission_classes = [permissions.IsAuthenticated]
 
@@ -76,20 +161,12 @@ class UserDeleteView(APIView):
         user = request.user
 
         if user.is_authenticated:
-            # Journalisation avant suppression
-            logger.info(
-                f"Suppression de l'utilisateur {user.username} "
-                f"et de toutes les ressources associées."
-            )
-
-            # Suppression en cascade de toutes les ressources associées
-            Project.objects.filter(creator=user).delete()
-            Contributor.objects.filter(contributor=user).delete()
-            Issue.objects.filter(creator=user).delete()
-            Comment.objects.filter(creator=user).delete()
-            user.delete()
-
-            logger.info(f"Utilisateur {user.username} supprimé avec succès.")
+            # Le compte est désactivé immédiatement (ses jetons sont refusés) ;
+            # la suppression en cascade des ressources est différée
+            user.is_active = False
+            user.save(update_fields=['is_active'])
+            enqueue(delete_account, args=[user.pk])
+            logger.info(f"Suppression de l'utilisateur {user.username} planifiée.")
             return Response(
                 {"message": "L'utilisateur a été supprimé avec succès."},
                 status=status.HTTP_200_OK
@@ -121,7 +198,8 @@ class AddContributorView(generics.CreateAPIView):
 
     def perform_create(self, serializer):
         project = self.get_project()
-        serializer.save(project=project)
+        contributor = serializer.save(project=project)
+        enqueue(onboard_contributor, args=[contributor.pk])
 
     def post(self, request, *args, **kwargs):
         project = self.get_project()